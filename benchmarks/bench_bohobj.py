@@ -0,0 +1,32 @@
+#-*-coding:utf-8-*-
+"""``BohObj``构造的基准测试。
+
+    测量自动分类与指定类型两种情况下，每个对象的构造耗时与内存占用。
+"""
+import time
+import random
+import tracemalloc
+
+from bohdata import BohObj, BohObjType
+from benchmarks.synth import gen_object
+
+def main() -> None:
+    rng = random.Random(0)
+    origins = [gen_object(index, rng) for index in range(50000)]
+    for objtype in [BohObjType.UNKNOWN, BohObjType.META]:
+        start = time.perf_counter()
+        objs = [BohObj(origin, objtype) for origin in origins]
+        elapsed = time.perf_counter() - start
+        del objs
+
+        tracemalloc.start()
+        objs = [BohObj(origin, objtype) for origin in origins]
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del objs
+
+        print(f'{objtype.name:<8} {elapsed / len(origins) * 1e6:6.2f} 微秒/对象 {size / len(origins):7.1f} 字节/对象')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+#-*-coding:utf-8-*-
+"""``ParseCache``的基准测试。
+
+    对比不使用缓存、首次读取、修改一个文件后读取与完全命中缓存时读取目录的耗时。
+    修改一个文件后的读取应介于完全命中与不使用缓存之间。
+"""
+import os
+import time
+import tempfile
+
+import bohdata
+from benchmarks.synth import gen_tree
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as dir:
+        core = os.path.join(dir, 'core')
+        cachedir = os.path.join(dir, 'cache')
+        gen_tree(core, 4000)
+        path = next(os.path.join(root, fname) for root, _, files in os.walk(core) for fname in files)
+
+        def touch() -> None:
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+        results = [('不使用缓存', timed(lambda: bohdata.read(core)))]
+        results.append(('首次读取', timed(lambda: bohdata.read(core, cache=cachedir))))
+        results.append(('文件均未修改', timed(lambda: bohdata.read(core, cache=cachedir))))
+        results.append(('完全命中', timed(lambda: bohdata.read(core, cache=cachedir))))
+        touch()
+        results.append(('修改一个文件', timed(lambda: bohdata.read(core, cache=cachedir))))
+        for name, elapsed in results:
+            print(f'{name:<8} {elapsed:8.3f} 秒')
+
+
+if __name__ == '__main__':
+    main()
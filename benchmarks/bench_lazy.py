@@ -0,0 +1,37 @@
+#-*-coding:utf-8-*-
+"""``readlazy``的基准测试。
+
+    对比``read``与``readlazy``在只读取名称的工作负载（类似``get_labels_table.py``）下的耗时与峰值内存。
+"""
+import time
+import tempfile
+import tracemalloc
+
+import bohdata
+from benchmarks.synth import gen_tree
+
+def labels_eager(dir: str) -> int:
+    data = bohdata.read(dir)
+    return sum(len(obj.label) for obj in data.map.values())
+
+
+def labels_lazy(dir: str) -> int:
+    data = bohdata.readlazy(dir)
+    return sum(len(entry.label) for entry in data.entries.values())
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as dir:
+        gen_tree(dir, 2000, 20)
+        for name, func in [('read', labels_eager), ('readlazy', labels_lazy)]:
+            tracemalloc.start()
+            start = time.perf_counter()
+            func(dir)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f'{name:<9} {elapsed:8.3f} 秒 峰值 {peak / 2 ** 20:8.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
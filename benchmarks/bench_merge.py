@@ -0,0 +1,26 @@
+#-*-coding:utf-8-*-
+"""``BohData.merge``的基准测试。
+
+    合并 ID 大量重复的数据集时，每个对象的开销应为常数。
+"""
+import time
+import tempfile
+
+import bohdata
+from benchmarks.synth import gen_tree
+
+def main() -> None:
+    for files in [500, 1000, 2000, 4000]:
+        with tempfile.TemporaryDirectory() as dir:
+            gen_tree(dir, files)
+            left = bohdata.read(dir)
+            right = bohdata.read(dir)   # ID 与内容均与 left 相同
+
+        start = time.perf_counter()
+        left.merge(right)
+        elapsed = time.perf_counter() - start
+        print(f'{len(right.map):>7} 个重复对象 {elapsed:8.3f} 秒')
+
+
+if __name__ == '__main__':
+    main()
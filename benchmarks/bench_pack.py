@@ -0,0 +1,89 @@
+#-*-coding:utf-8-*-
+"""``pack``的基准测试。
+
+    与对每个翻译文件重新读取游戏原文件的旧做法对比打包的耗时，并比较逐个文件处理与使用进程池解析``core``、处理翻译文件的耗时。
+    进程池的收益取决于可用的处理器核心数，单核机器上反而更慢。
+"""
+import os
+import io
+import json
+import time
+import tempfile
+import contextlib
+
+import bohdata
+from bohdata.bohobj import getid, BohObj
+from bohdata.bohdata import BohData
+from benchmarks.bench_paratranz import legacy as legacy_buildtree
+from benchmarks.synth import gen_dataset
+
+def legacy(dir: str, output: str) -> None:
+    """旧版``pack``的做法，输出路径改为参数。"""
+    def addid(attr: str, obj: dict) -> None:
+        for index, item in enumerate(obj[attr]):
+            item['id'] = alldata.map[getid(obj)][attr][index]['id']
+
+    alldata = bohdata.read(os.path.join(dir, 'core/'))
+    for root, _, files in os.walk(os.path.join(dir, 'raw/')):
+        for fname in files:
+            path = os.path.join(root, fname)
+            with open(path, 'r', encoding='utf-8') as file:
+                entries = json.load(file)
+            translations = legacy_buildtree(entries)
+
+            for id, obj in translations.items():
+                obj['id'] = id
+                if alldata.map.get(id) is None:
+                    continue
+                for attr in ['slots', 'preslots']:
+                    if obj.get(attr) is not None:
+                        addid(attr, obj)
+
+            for id in [id for id in translations.keys() if id.lower() != id]:
+                translations[id.lower()] = translations[id]
+                del translations[id]
+
+            relpath = os.path.relpath(path, os.path.join(dir, 'raw/')).replace('.csv', '')
+            source_objs = list(bohdata.read(os.path.join(dir, 'core/', relpath)).items())[0][1]
+
+            outputdata = BohData({})
+            outputdata.file = fname.replace('.csv', '')
+            for obj in source_objs:
+                id = getid(obj)
+                if translations.get(id) is None or alldata.map.get(id) is None:
+                    continue
+                adding_obj = BohObj(translations[id])
+                adding_obj.root = alldata.map[id].root
+                outputdata.append(adding_obj)
+
+            for id, obj in translations.items():
+                if alldata.map.get(id) is None:
+                    if alldata.repeats.get(id) is not None:
+                        print(f'于"{path}"的对象"{id}"存在 ID 重复的对象。')
+                    else:
+                        print(f'于"{path}"的对象"{id}"不存在。')
+
+            outputpath = os.path.join(output, relpath)
+            os.makedirs(os.path.dirname(outputpath), exist_ok=True)
+            with open(outputpath, 'w', encoding='utf-8') as file:
+                file.write(json.dumps(outputdata, ensure_ascii=False))
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as dir:
+        gen_dataset(dir, 1000)
+        workers = max(2, os.cpu_count() or 1)
+        cases = [('legacy', lambda output: legacy(dir, output)),
+                 ('pack', lambda output: bohdata.pack(dir, output)),
+                 (f'pack.workers={workers}', lambda output: bohdata.pack(dir, output, workers=workers))]
+        for name, func in cases:
+            output = tempfile.mkdtemp(dir=dir)
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                func(output)
+                elapsed = time.perf_counter() - start
+            print(f'{name:<16} {elapsed:8.3f} 秒')
+
+
+if __name__ == '__main__':
+    main()
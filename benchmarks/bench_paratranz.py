@@ -0,0 +1,76 @@
+#-*-coding:utf-8-*-
+"""``buildtree``的基准测试。
+
+    与逐层递归拆分键、再整体转化列表的旧做法对比还原翻译条目的耗时，并检查两者结果一致。
+"""
+import gc
+import time
+import random
+
+from bohdata.paratranz import buildtree
+
+def legacy(entries: list[dict]) -> dict:
+    """旧版``pack``中的做法。"""
+    def islist(obj: dict) -> bool:
+        if not all(key.isdigit() for key in obj.keys()):
+            return False
+        keys = sorted(obj, key=int)
+        return all(str(i) == keys[i] for i in range(len(keys)))
+
+    def tolist(obj: dict) -> list|dict:
+        for key, value in obj.items():
+            if isinstance(value, dict):
+                obj[key] = tolist(value)
+        if not islist(obj):
+            return obj
+        res = []
+        key = '0'
+        while obj.get(key) is not None:
+            res.append(obj[key])
+            key = str(int(key) + 1)
+        return res
+
+    def prase(output: dict, key: str, translation: str) -> None:
+        if '||' not in key:
+            output[key] = translation
+            return
+        current_key = key.split('||')[0]
+        if output.get(current_key) is None:
+            output[current_key] = {}
+        prase(output[current_key], key.split('||', 1)[1], translation)
+
+    translations = {}
+    for entry in entries:
+        prase(translations, entry['key'], entry['translation'])
+    return {id: tolist(obj) if isinstance(obj, dict) else obj for id, obj in translations.items()}
+
+
+def gen_entries(count: int, seed: int=0) -> list[dict]:
+    """生成类似``paratranz.cn``导出的翻译条目。"""
+    rng = random.Random(seed)
+    entries = []
+    for index in range(count // 4):
+        id = f'synth.obj.{index}'
+        entries.append({'key': f'{id}||label', 'translation': f'名称{index}'})
+        entries.append({'key': f'{id}||desc', 'translation': f'描述{index}'})
+        for slot in range(rng.randrange(3)):
+            entries.append({'key': f'{id}||slots||{slot}||label', 'translation': f'槽{slot}'})
+        entries.append({'key': f'{id}||xexts||{rng.choice(["a", "0", "2"])}', 'translation': '文本'})
+    return entries
+
+
+def main() -> None:
+    entries = gen_entries(400000)
+    for name, func in [('legacy', legacy), ('buildtree', buildtree)]:
+        gc.collect()
+        start = time.perf_counter()
+        func(entries)
+        print(f'{name:<10} {len(entries)} 个条目 {time.perf_counter() - start:8.3f} 秒')
+    assert legacy(entries) == buildtree(entries)
+
+    deep = [{'key': '||'.join(['x'] + ['0'] * 5000), 'translation': '深'}]
+    print(f'5000 层的键：{type(buildtree(deep)["x"]).__name__}')
+
+
+if __name__ == '__main__':
+    main()
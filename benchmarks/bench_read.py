@@ -0,0 +1,23 @@
+#-*-coding:utf-8-*-
+"""``bohdata.read``目录加载的基准测试。
+
+    文件数翻倍时，耗时应大致翻倍（线性）。
+"""
+import time
+import tempfile
+
+import bohdata
+from benchmarks.synth import gen_tree
+
+def main() -> None:
+    for files in [500, 1000, 2000, 4000]:
+        with tempfile.TemporaryDirectory() as dir:
+            gen_tree(dir, files)
+            start = time.perf_counter()
+            data = bohdata.read(dir)
+            elapsed = time.perf_counter() - start
+        print(f'{files:>6} 个文件 {len(data.map):>7} 个对象 {elapsed:8.3f} 秒')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+#-*-coding:utf-8-*-
+"""``iterobjs``流式解析的基准测试。
+
+    对比整个文件一次性解析与流式逐个解析大文件时的峰值内存。
+"""
+import os
+import json
+import time
+import random
+import tempfile
+import tracemalloc
+
+from bohdata.file import iterobjs, _readtext
+from benchmarks.synth import gen_object
+
+def whole(path: str) -> int:
+    return len(list(json.loads(_readtext(path)).values())[0])
+
+
+def streamed(path: str) -> int:
+    return sum(1 for _ in iterobjs(path))
+
+
+def main() -> None:
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as dir:
+        path = os.path.join(dir, 'huge.json')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(json.dumps({'elements': [gen_object(index, rng) for index in range(100000)]}, indent='\t'))
+
+        for name, func in [('json.loads', whole), ('iterobjs', streamed)]:
+            tracemalloc.start()
+            start = time.perf_counter()
+            count = func(path)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f'{name:<10} {count} 个对象 {elapsed:8.3f} 秒 峰值 {peak / 2 ** 20:8.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+#-*-coding:utf-8-*-
+"""``BohData.translateall``的基准测试。
+
+    对比``translateall``与逐个对象调用``translatewith``的耗时，并统计其中为翻译文件列表建立 ID 索引的耗时。
+"""
+import os
+import time
+import tempfile
+
+import bohdata
+from bohdata.bohobj import getid
+from benchmarks.synth import gen_dataset
+
+def loop(core: bohdata.BohData, loc: bohdata.BohData) -> None:
+    """旧版``get_labels_table.py``中的做法。"""
+    for id, obj in core.map.items():
+        if loc.map.get(id):
+            obj.translatewith(loc.map[id], strict=False)
+
+
+def lists(loc: bohdata.BohData) -> list[list]:
+    """翻译文件对象中的所有列表。"""
+    res = []
+    stack = list(loc.map.values())
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            res.append(value)
+            stack.extend(value)
+    return res
+
+
+def indexes(values: list[list]) -> None:
+    """为每个列表建立一次 ID 索引，即``_merge``中建立索引的部分。"""
+    for value in values:
+        {getid(item): item for item in value if isinstance(item, dict) and (item.get('id') or item.get('ID'))}
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as dir:
+        gen_dataset(dir, 2000)
+        core_dir, loc_dir = os.path.join(dir, 'core'), os.path.join(dir, 'loc_zh-hans')
+        loc = bohdata.read(loc_dir)
+        values = lists(loc)
+        for name, func in [('loop', lambda core: loop(core, loc)), ('translateall', lambda core: core.translateall(loc)),
+                           ('indexes', lambda core: indexes(values))]:
+            times = []
+            for _ in range(5):
+                core = bohdata.read(core_dir)
+                start = time.perf_counter()
+                func(core)
+                times.append(time.perf_counter() - start)
+            print(f'{name:<13} {len(core.map)} 个对象 {min(times):8.3f} 秒')
+
+
+if __name__ == '__main__':
+    main()
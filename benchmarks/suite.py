@@ -0,0 +1,289 @@
+#-*-coding:utf-8-*-
+"""公开接口的基准测试套件。
+
+    在合成数据上依次测量各公开接口的耗时与峰值内存，结果写入``.json``文件，可离线比较两次运行的结果：
+
+        python -m benchmarks.suite run --objs 500 --output before.json
+        python -m benchmarks.suite run --objs 500 --output after.json
+        python -m benchmarks.suite compare before.json after.json
+
+    耗时取多次运行的最小值与中位数；峰值内存由``tracemalloc``在额外的一次运行中测得，只计入被测调用本身的分配。
+"""
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import contextlib
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, NamedTuple
+
+import bohdata
+from benchmarks.synth import gen_dataset
+
+FORMAT = 1
+"""结果文件的格式版本。"""
+
+class Dataset(NamedTuple):
+    """合成数据所在的目录。"""
+    dir: str
+    core: str
+    loc: str
+    scratch: str
+
+
+def _scratch(dataset: Dataset) -> str:
+    """返回一个空的临时输出目录。"""
+    shutil.rmtree(dataset.scratch, ignore_errors=True)
+    os.makedirs(dataset.scratch)
+    return dataset.scratch
+
+
+def _iterobjs(dataset: Dataset) -> Callable[[], Any]:
+    paths = [os.path.join(root, fname) for root, _, files in os.walk(dataset.core) for fname in files]
+    return lambda: sum(1 for path in paths for _ in bohdata.iterobjs(path))
+
+
+def _translatewith(dataset: Dataset) -> Callable[[], Any]:
+    core = bohdata.read(dataset.core)
+    loc = bohdata.read(dataset.loc)
+    pairs = [(obj, loc.map[id]) for id, obj in core.map.items() if id in loc.map]
+    return lambda: [obj.translatewith(translation, strict=False) for obj, translation in pairs]
+
+
+def _translateall(dataset: Dataset) -> Callable[[], Any]:
+    core = bohdata.read(dataset.core)
+    loc = bohdata.read(dataset.loc)
+    return lambda: core.translateall(loc)
+
+
+def _tojson(dataset: Dataset) -> Callable[[], Any]:
+    objs = list(bohdata.read(dataset.core).objs())
+    dir = _scratch(dataset)
+    return lambda: bohdata.tojson(objs, dir, incremental=False)
+
+
+def _tojson_workers(dataset: Dataset) -> Callable[[], Any]:
+    objs = list(bohdata.read(dataset.core).objs())
+    dir = _scratch(dataset)
+    return lambda: bohdata.tojson(objs, dir, incremental=False, workers=os.cpu_count())
+
+
+def _tojson_unchanged(dataset: Dataset) -> Callable[[], Any]:
+    objs = list(bohdata.read(dataset.core).objs())
+    dir = _scratch(dataset)
+    bohdata.tojson(objs, dir)
+    return lambda: bohdata.tojson(objs, dir)
+
+
+def _tocsv(dataset: Dataset) -> Callable[[], Any]:
+    loc = bohdata.read(dataset.loc)
+    dir = _scratch(dataset)
+    return lambda: bohdata.tocsv(dataset.core, dir, loc)
+
+
+def _diff(dataset: Dataset) -> Callable[[], Any]:
+    old = bohdata.read(dataset.core)
+    new = bohdata.read(dataset.core)
+    return lambda: old.diff(new)
+
+
+def _save(dataset: Dataset) -> Callable[[], Any]:
+    data = bohdata.read(dataset.core)
+    path = os.path.join(_scratch(dataset), 'core.snapshot')
+    return lambda: data.save(path)
+
+
+def _load(dataset: Dataset) -> Callable[[], Any]:
+    path = os.path.join(_scratch(dataset), 'core.snapshot')
+    bohdata.read(dataset.core).save(path)
+    return lambda: bohdata.BohData.load(path)
+
+
+def _textindex(dataset: Dataset) -> Callable[[], Any]:
+    objs = list(bohdata.read(dataset.core).objs())
+    return lambda: bohdata.TextIndex(objs)
+
+
+def _search(dataset: Dataset) -> Callable[[], Any]:
+    index = bohdata.TextIndex(list(bohdata.read(dataset.core).objs()) + list(bohdata.read(dataset.loc).objs()))
+    return lambda: [index.search(query) for query in ['lantern', 'moon nectar', 'scale rose heart']]
+
+
+def _pack(dataset: Dataset) -> Callable[[], Any]:
+    dir = _scratch(dataset)
+    def run() -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            bohdata.pack(dataset.dir, dir)
+    return run
+
+
+CASES: dict[str, Callable[[Dataset], Callable[[], Any]]] = {
+    'check': lambda dataset: lambda: bohdata.check(dataset.core),
+    'validate': lambda dataset: lambda: list(bohdata.validate(dataset.core)),
+    'read': lambda dataset: lambda: bohdata.read(dataset.core),
+    'read.stream': lambda dataset: lambda: bohdata.read(dataset.core, stream=True),
+    'read.loc': lambda dataset: lambda: bohdata.read(dataset.loc),
+    'readlazy': lambda dataset: lambda: bohdata.readlazy(dataset.core),
+    'iterobjs': _iterobjs,
+    'translatewith': _translatewith,
+    'translateall': _translateall,
+    'tojson': _tojson,
+    'tojson.workers': _tojson_workers,
+    'tojson.unchanged': _tojson_unchanged,
+    'tocsv': _tocsv,
+    'pack': _pack,
+    'diff': _diff,
+    'textindex': _textindex,
+    'search': _search,
+    'save': _save,
+    'load': _load,
+}
+"""测试项名称到准备函数的映射表。准备函数不计时，返回被测的无参调用；每次运行前都会重新准备。"""
+
+def measure(dataset: Dataset, setup: Callable[[Dataset], Callable[[], Any]], repeat: int) -> dict[str, Any]:
+    """测量单个测试项。
+
+    Args:
+        dataset (Dataset): 合成数据。
+        setup (Callable): 准备函数。
+        repeat (int): 计时运行的次数。
+
+    Returns:
+        dict[str, Any]: 各次耗时（``times``）、最小值（``best``）、中位数（``median``）与峰值内存字节数（``peak``）。
+    """
+    times = []
+    for _ in range(repeat):
+        func = setup(dataset)
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    func = setup(dataset)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'times': times, 'best': min(times), 'median': statistics.median(times), 'peak': peak}
+
+
+def run(objs_per_root: int=200, repeat: int=3, seed: int=0, only: list[str]|None=None) -> dict[str, Any]:
+    """生成合成数据并运行测试项。
+
+    Args:
+        objs_per_root (int, optional): 每个根分类的对象数。默认为``200``。
+        repeat (int, optional): 每项计时运行的次数。默认为``3``。
+        seed (int, optional): 随机数种子。默认为``0``。
+        only (list[str], optional): 只运行这些测试项。默认为``None``，即全部。
+
+    Returns:
+        dict[str, Any]: 可写入结果文件的运行结果。
+    """
+    names = list(CASES) if only is None else only
+    with tempfile.TemporaryDirectory() as dir:
+        stats = gen_dataset(dir, objs_per_root, seed=seed)
+        dataset = Dataset(dir, os.path.join(dir, 'core'), os.path.join(dir, 'loc_zh-hans'), os.path.join(dir, 'scratch'))
+        results = {}
+        for name in names:
+            results[name] = measure(dataset, CASES[name], repeat)
+            print(f'{name:<18} {results[name]["best"]:8.3f} 秒 峰值 {results[name]["peak"] / 2 ** 20:8.1f} MiB', file=sys.stderr)
+
+    return {
+        'format': FORMAT,
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': _commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'objs_per_root': objs_per_root,
+            'repeat': repeat,
+            'seed': seed,
+            **stats,
+        },
+        'results': results,
+    }
+
+
+def compare(old: dict[str, Any], new: dict[str, Any], threshold: float=0.1) -> list[str]:
+    """比较两次运行的结果，打印对比表。
+
+    Args:
+        old (dict[str, Any]): 基准结果。
+        new (dict[str, Any]): 新结果。
+        threshold (float, optional): 耗时或峰值内存增加超过此比例时视为退化。默认为``0.1``。
+
+    Returns:
+        list[str]: 退化的测试项名称。
+    """
+    for key in ['objs_per_root', 'seed']:
+        if old['meta'].get(key) != new['meta'].get(key):
+            print(f'警告：两次运行的 {key} 不同（{old["meta"].get(key)} 与 {new["meta"].get(key)}），结果不可直接比较。')
+
+    regressions = []
+    for name in [name for name in old['results'] if name in new['results']]:
+        before, after = old['results'][name], new['results'][name]
+        time_ratio = after['best'] / before['best'] if before['best'] else float('inf')
+        peak_ratio = after['peak'] / before['peak'] if before['peak'] else float('inf')
+        regressed = time_ratio > 1 + threshold or peak_ratio > 1 + threshold
+        if regressed:
+            regressions.append(name)
+        print(f'{name:<19} {before["best"]:11.3f}s {after["best"]:11.3f}s {time_ratio:8.2f}x '
+              f'{before["peak"] / 2 ** 20:9.1f}MiB {after["peak"] / 2 ** 20:9.1f}MiB {peak_ratio:8.2f}x{" *" if regressed else ""}')
+    for name in sorted(old['results'].keys() ^ new['results'].keys()):
+        print(f'{name:<19} 只存在于{"旧" if name in old["results"] else "新"}结果中')
+    return regressions
+
+
+def _commit() -> str|None:
+    """当前的 git 提交，无法取得时为``None``。"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='bohdata 基准测试套件')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='运行测试并输出结果文件')
+    run_parser.add_argument('--objs', type=int, default=200, help='每个根分类的对象数')
+    run_parser.add_argument('--repeat', type=int, default=3, help='每项计时运行的次数')
+    run_parser.add_argument('--seed', type=int, default=0, help='随机数种子')
+    run_parser.add_argument('--only', nargs='+', choices=list(CASES), help='只运行这些测试项')
+    run_parser.add_argument('--output', default='-', help='结果文件路径，默认为标准输出')
+
+    compare_parser = commands.add_parser('compare', help='比较两个结果文件')
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help='视为退化的增加比例')
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        content = json.dumps(run(args.objs, args.repeat, args.seed, args.only), indent='\t', ensure_ascii=False)
+        if args.output == '-':
+            print(content)
+        else:
+            with open(args.output, 'w', encoding='utf-8') as file:
+                file.write(content)
+    else:
+        with open(args.old, 'r', encoding='utf-8') as file:
+            old = json.load(file)
+        with open(args.new, 'r', encoding='utf-8') as file:
+            new = json.load(file)
+        if compare(old, new, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
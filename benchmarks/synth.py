@@ -0,0 +1,193 @@
+#-*-coding:utf-8-*-
+"""合成游戏数据生成模块。
+
+    此模块用于生成结构类似《司辰之书》``core/``、``loc_*/``目录与``paratranz.cn``翻译条目的合成数据，供基准测试使用。
+"""
+import os
+import json
+import random
+from typing import Any
+
+from bohdata.bohobj import TEXT_KEYS, VALID_ROOTS
+
+def gen_object(index: int, rng: random.Random) -> dict:
+    """生成一个合成的游戏对象。"""
+    return {
+        'id': f'synth.obj.{index}',
+        'label': f'Synthetic Object {index}',
+        'desc': ' '.join(rng.choice(['lantern', 'forge', 'edge', 'winter', 'heart', 'grail', 'moth', 'knock']) for _ in range(12)),
+        'aspects': {f'aspect.{rng.randrange(40)}': rng.randrange(1, 6) for _ in range(rng.randrange(1, 5))},
+        'xtriggers': {f'aspect.{rng.randrange(40)}': f'synth.obj.{rng.randrange(index + 1)}'},
+    }
+
+
+def gen_tree(dir: str, files: int, objs_per_file: int=5, root: str='elements', seed: int=0) -> None:
+    """在``dir``下生成合成游戏文件目录。
+
+    Args:
+        dir (str): 输出目录。
+        files (int): 文件数。
+        objs_per_file (int, optional): 每个文件中的对象数。默认为``5``。
+        root (str, optional): 游戏对象的根分类。默认为``'elements'``。
+        seed (int, optional): 随机数种子。默认为``0``。
+    """
+    rng = random.Random(seed)
+    index = 0
+    for file_index in range(files):
+        subdir = os.path.join(dir, root, f'group{file_index % 16}')
+        os.makedirs(subdir, exist_ok=True)
+        objs = []
+        for _ in range(objs_per_file):
+            objs.append(gen_object(index, rng))
+            index = index + 1
+
+        with open(os.path.join(subdir, f'synth_{file_index}.json'), 'w', encoding='utf-8') as file:
+            file.write(json.dumps({root: objs}, indent='\t', ensure_ascii=False))
+
+
+_WORDS = ['lantern', 'forge', 'edge', 'winter', 'heart', 'grail', 'moth', 'knock', 'sky', 'moon', 'nectar', 'scale', 'rose']
+
+def _text(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(_WORDS) for _ in range(words)).capitalize()
+
+
+def _slots(rng: random.Random, count: int) -> list[dict]:
+    return [{'id': f'slot.{rng.choice(_WORDS)}.{i}', 'label': _text(rng, 2), 'description': _text(rng, 10),
+             'required': {rng.choice(_WORDS): 1}} for i in range(count)]
+
+
+def gen_root_object(root: str, index: int, rng: random.Random) -> dict:
+    """生成一个给定根分类的合成游戏对象。每 7 个对象中有一个使用大小写混合的 ID。
+
+    Args:
+        root (str): 根分类，须为``VALID_ROOTS``之一。
+        index (int): 对象序号，决定对象 ID。
+        rng (random.Random): 随机数生成器。
+
+    Returns:
+        dict: 原始游戏对象。
+    """
+    id = f'synth.{root}.{index}'
+    if index % 7 == 0:
+        id = f'Synth.{root.capitalize()}.Obj_{index}'
+    ref = f'synth.elements.{rng.randrange(index + 1)}'
+    aspects = {f'aspect.{rng.randrange(40)}': rng.randrange(1, 6) for _ in range(rng.randrange(1, 5))}
+
+    if root == 'elements':
+        obj = {'id': id, 'label': _text(rng, 3), 'desc': _text(rng, 24), 'aspects': aspects,
+               'xtriggers': {f'aspect.{rng.randrange(40)}': ref}, 'decayto': ref}
+        if rng.random() < 0.3:
+            obj['slots'] = _slots(rng, rng.randrange(1, 4))
+        if rng.random() < 0.2:
+            obj['xexts'] = {f'{rng.choice(_WORDS)}.{i}': _text(rng, 16) for i in range(rng.randrange(1, 3))}
+    elif root == 'recipes':
+        obj = {'id': id, 'label': _text(rng, 3), 'startdescription': _text(rng, 20), 'desc': _text(rng, 30),
+               'reqs': aspects, 'effects': {ref: 1}, 'linked': [{'id': f'synth.recipes.{rng.randrange(index + 1)}'}],
+               'warmup': rng.randrange(10, 120)}
+        if rng.random() < 0.5:
+            obj['slots'] = _slots(rng, rng.randrange(1, 4))
+        if rng.random() < 0.1:
+            obj['preslots'] = _slots(rng, 1)
+    elif root == 'decks':
+        obj = {'id': id, 'label': _text(rng, 2), 'desc': _text(rng, 12), 'spec': [ref for _ in range(rng.randrange(1, 8))],
+               'defaultcard': ref, 'resetonexhaustion': rng.random() < 0.5}
+    elif root == 'verbs':
+        obj = {'id': id, 'label': _text(rng, 2), 'desc': _text(rng, 16), 'spontaneous': rng.random() < 0.2,
+               'slot': _slots(rng, 1)[0]}
+    elif root == 'endings':
+        obj = {'id': id, 'label': _text(rng, 3), 'desc': _text(rng, 60), 'image': f'ending.{index}', 'flavour': 'melancholy'}
+    elif root == 'legacies':
+        obj = {'id': id, 'label': _text(rng, 2), 'description': _text(rng, 30), 'startdescription': _text(rng, 30),
+               'family': _text(rng, 1), 'effects': {ref: 1}}
+    elif root == 'cultures':
+        obj = {'id': id, 'label': _text(rng, 1), 'endonym': _text(rng, 1), 'exonym': _text(rng, 1), 'fontscript': 'latin'}
+    elif root == 'achievements':
+        obj = {'id': id, 'label': _text(rng, 3), 'desc': _text(rng, 10), 'descriptionunlocked': _text(rng, 12),
+               'category': 'synth', 'iconunlocked': f'ach.{index}'}
+    elif root == 'settings':
+        obj = {'id': id, 'label': _text(rng, 2), 'tabid': 'synth', 'datatype': 'float', 'defaultvalue': rng.random()}
+    else:   # dicta
+        obj = {'id': id, 'label': _text(rng, 2), 'defaultworldrecipe': f'synth.recipes.{rng.randrange(index + 1)}'}
+    return obj
+
+
+def gen_translation(obj: dict) -> dict:
+    """生成原始游戏对象对应的合成翻译文件对象，只保留文本属性。"""
+    def translate(value: Any, key: str) -> Any:
+        if isinstance(value, dict):
+            return {subkey: subvalue if subkey == 'id' else translate(subvalue, subkey) for subkey, subvalue in value.items()
+                    if key == 'xexts' or subkey in TEXT_KEYS}
+        if isinstance(value, list):
+            return [translate(item, key) for item in value]
+        if isinstance(value, str):
+            return f'〔译〕{value}'
+        return value
+
+    return translate(obj, '')
+
+
+def gen_entries(translation: dict, meta: dict) -> list[dict]:
+    """生成翻译文件对象对应的``paratranz.cn``翻译条目。"""
+    entries = []
+    stack = [(translation, meta, translation['id'])]
+    while stack:
+        value, original, prefix = stack.pop()
+        items = value.items() if isinstance(value, dict) else enumerate(value)
+        for key, subvalue in items:
+            if key == 'id':
+                continue
+            suboriginal = original[key]
+            if isinstance(subvalue, (dict, list)):
+                stack.append((subvalue, suboriginal, f'{prefix}||{key}'))
+            elif isinstance(subvalue, str):
+                entries.append({'key': f'{prefix}||{key}', 'original': suboriginal, 'translation': subvalue})
+    return entries
+
+
+def gen_dataset(dir: str, objs_per_root: int=200, objs_per_file: int=20, duplicates: float=0.02, lang: str='zh-hans',
+                seed: int=0) -> dict[str, int]:
+    """在``dir``下生成合成的游戏数据，包含``core``、``loc_<lang>``与``raw``三个目录。
+
+    ``core``覆盖所有``VALID_ROOTS``，``loc_<lang>``为对应的翻译文件，``raw``为``pack``所用的``paratranz.cn``翻译条目。
+    三个目录的文件一一对应，``raw``中的文件名为``<游戏文件名>.csv``。
+    约``duplicates``比例的对象会在之后的文件中重复出现，其中一半内容相同，另一半内容不同（即``repeats``）。
+
+    Args:
+        dir (str): 输出目录。
+        objs_per_root (int, optional): 每个根分类的对象数（不含重复对象）。默认为``200``。
+        objs_per_file (int, optional): 每个文件中的对象数。默认为``20``。
+        duplicates (float, optional): 重复对象的比例。默认为``0.02``。
+        lang (str, optional): 翻译文件目录的语言后缀。默认为``'zh-hans'``。
+        seed (int, optional): 随机数种子。默认为``0``。
+
+    Returns:
+        dict[str, int]: 生成的文件数（``files``）、对象数（``objects``）与翻译条目数（``entries``）。
+    """
+    rng = random.Random(seed)
+    stats = {'files': 0, 'objects': 0, 'entries': 0}
+    for root in sorted(VALID_ROOTS):
+        objs = [gen_root_object(root, index, rng) for index in range(objs_per_root)]
+        for obj in rng.sample(objs, int(len(objs) * duplicates)):
+            copy = json.loads(json.dumps(obj))
+            if rng.random() < 0.5:
+                copy['label'] = f'{copy["label"]} (variant)'
+            objs.append(copy)
+
+        for file_index in range(0, len(objs), objs_per_file):
+            chunk = objs[file_index:file_index + objs_per_file]
+            translations = [gen_translation(obj) for obj in chunk]
+            entries = [entry for obj, translation in zip(chunk, translations) for entry in gen_entries(translation, obj)]
+            relpath = os.path.join(root, f'group{file_index // objs_per_file % 8}', f'synth_{root}_{file_index // objs_per_file}.json')
+            _dump(os.path.join(dir, 'core', relpath), {root: chunk})
+            _dump(os.path.join(dir, f'loc_{lang}', relpath), {root: translations})
+            _dump(os.path.join(dir, 'raw', f'{relpath}.csv'), entries)
+            stats['files'] = stats['files'] + 1
+            stats['objects'] = stats['objects'] + len(chunk)
+            stats['entries'] = stats['entries'] + len(entries)
+    return stats
+
+
+def _dump(path: str, content: Any) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(json.dumps(content, indent='\t', ensure_ascii=False))
@@ -1,6 +1,19 @@
 #-*-coding:utf-8-*-
-from bohdata.file import check, read, pack
+from bohdata.file import check, validate, read, readfiles, iterobjs, sniff, tocsv, pack, JSONError
 from bohdata.bohobj import istext, getid, BohObj, BohObjType
-from bohdata.bohdata import BohData
+from bohdata.bohdata import BohData, TranslationReport
+from bohdata.diff import DataDiff, Change
+from bohdata.cache import ParseCache
+from bohdata.snapshot import Snapshot
+from bohdata.overlay import BohOverlay
+from bohdata.export import tojson, ExportReport
+from bohdata.labels import tolabels, labelrows
+from bohdata.index import PathIndex
+from bohdata.graph import RefGraph
+from bohdata.search import TextIndex, SearchHit
+from bohdata.paratranz import buildtree
+from bohdata.lazy import readlazy, LazyBohData, LazyEntry
+from bohdata.watch import Watcher, WatchEvent
+from bohdata.profiling import profile, Profile
 
-__all__ = ['check', 'read', 'pack', 'istext', 'getid', 'BohObj', 'BohObjType', 'BohData']
\ No newline at end of file
+__all__ = ['check', 'validate', 'JSONError', 'read', 'readfiles', 'iterobjs', 'sniff', 'tocsv', 'pack', 'istext', 'getid', 'BohObj', 'BohObjType', 'BohData', 'TranslationReport', 'DataDiff', 'Change', 'ParseCache', 'Snapshot', 'BohOverlay', 'tojson', 'ExportReport', 'tolabels', 'labelrows', 'PathIndex', 'RefGraph', 'TextIndex', 'SearchHit', 'buildtree', 'readlazy', 'LazyBohData', 'LazyEntry', 'Watcher', 'WatchEvent', 'profile', 'Profile']
\ No newline at end of file
@@ -6,10 +6,52 @@
 
 import os
 import re
+import csv
 import copy
+import itertools
+import collections
+from typing import Any, Iterable, Iterator, NamedTuple
 
+from bohdata import profiling
 from bohdata.bohobj import BohObj
 from bohdata.bohobj import BohObjType
+from bohdata.index import PathIndex
+from bohdata.graph import RefGraph
+from bohdata.search import TextIndex
+from bohdata.labels import tolabels
+from bohdata.export import tojson, ExportReport
+from bohdata.diff import diff, DataDiff
+from bohdata import snapshot
+
+PASS_KEYS = frozenset({
+    'AlternativeDefaultWorldSpherePaths', 'DefaultCardBack', 'DefaultGameSpeed', 'DefaultWorldSpherePath',
+    'GameOverScene', 'ID', 'LoadingScene', 'LogoScene', 'ManifestationType',
+    'MaxSuitabilityPulseFrequency', 'MenuScene', 'NewGameScene', 'NoteElementId', 'PlayfieldScene',
+    'QuoteScene', 'StoredManifestation', 'StoredPhyicalManifestation', 'SuitabilityPulseSpeed',
+    'WorldSphereType', 'achievements', 'actionid', 'ambittable', 'audio', 'audiooneshot', 'category',
+    'craftable', 'datatype', 'decayto', 'defaultcard', 'defaultvalue', 'effects', 'ending', 'flavour',
+    'fontscript', 'frompath', 'fx', 'fxreqs', 'hint', 'hints', 'icon', 'iconUnlocked', 'id', 'image',
+    'inherits', 'isHidden', 'ishidden', 'lalt', 'linked', 'manifestationtype', 'mutations', 'reqs', 'run',
+    'sort', 'spec', 'tabid', 'topath', 'ui', 'unique', 'uniquenessgroup', 'valuelabels',
+    'valuenotifications', 'verbicon', 'warmup', 'xtriggers'})
+"""``tocsv``应跳过的不含需翻译文本的键。"""
+
+class TranslationReport(NamedTuple):
+    """``BohData.translateall``的翻译结果报告。
+
+    Attributes:
+        translated (int): 已翻译的对象数。
+        untranslated (list[str]): 没有对应翻译文件对象的对象 ID。
+        extra (list[str]): 没有对应原始对象的翻译文件对象 ID。
+        missing (list[str]): 原始对象中缺少翻译的列表成员路径。
+        unmatched (list[str]): 翻译文件对象中无法对应到原始对象的属性与列表成员（如字符串成员）的路径。
+    """
+    translated: int
+    untranslated: list[str]
+    extra: list[str]
+    missing: list[str]
+    unmatched: list[str]
+
 
 class InvalidFileName(Exception):
     """无效文件名。在尝试设置 Windows 下无效的文件名时抛出。
@@ -32,6 +74,10 @@ class BohData(dict):
             - keys (str): 重复的 ID。
             - values (list[dict[str, Any]]]): 重复对象的列表，每个成员都是游戏对象。
         roots (set[str]): 所含游戏对象的所有根分类。
+        rootmaps (dict[str, dict[str, list[BohObj]]]): 各根分类的 ID 映射表，其中：
+            - keys (str): 根分类。
+            - values (dict[str, list[BohObj]]): 该根分类中 ID 到对象的映射表，ID 重复时列表中有多个对象。
+            按根分类查找对象为 O(1)；某一根分类的对象数与遍历可直接使用``self[root]``。
         file (str): 来源文件（如有）。默认为一内部分配的默认名``Unnamed<file_index>.json``。
     
     Raise:
@@ -64,125 +110,395 @@ class BohData(dict):
         self._file = value
 
     def __init__(self, obj: dict, objtype: BohObjType=BohObjType.UNKNOWN):
-        """初始化函数，使用传入的一个游戏文件 json 对象初始化。亦可使用空字典``{}``。"""
+        """初始化函数，使用传入的一个游戏文件 json 对象初始化。亦可使用空字典``{}``。
+
+        游戏文件通常只有一个根分类；含有多个根分类时，按顺序加载所有根分类。
+        """
         super().__init__(obj)
 
-        if self == {}:
-            self.map = {}
-            self.repeats = {}
-            self.roots = set()
-            self._file = None
-            return
+        self.map = {}
+        self.repeats = {}
+        self.roots = set()
+        self.rootmaps = {}
+        self._index = None
+        self._graph = None
+        self._textindex = None
+        self._file = None
+
+        for root, origin_objs in list(self.items()):
+            self._load(root, origin_objs, objtype)
+
+    @classmethod
+    def fromobjs(cls, root: str, origin_objs: Iterable[dict], objtype: BohObjType=BohObjType.UNKNOWN) -> 'BohData':
+        """使用根分类与原始游戏对象创建，结果与``BohData({root: origin_objs})``相同。
+
+        Args:
+            root (str): 根分类。
+            origin_objs (Iterable[dict]): 原始游戏对象，可以是逐个产出对象的迭代器。
+            objtype (BohObjType, optional): 游戏对象类型。默认为``BohObjType.UNKNOWN``，即自动判断。
+
+        Returns:
+            BohData: 游戏数据。
+        """
+        data = cls({}, objtype)
+        data._load(root, origin_objs, objtype)
+        return data
 
-        # 转化原始游戏对象
-        root, origin_objs = list(self.items())[0]   # 一个游戏文件只可能拥有一个根分类
+    def _load(self, root: str, origin_objs: Iterable[dict], objtype: BohObjType) -> None:
+        """转化原始游戏对象，并创建索引。"""
         new_objs = []
-        for origin_obj in origin_objs:
-            new_obj = BohObj(origin_obj, objtype)
-            new_obj.root = root
-            new_objs.append(new_obj)
+        with profiling.phase('bohobj.init'):
+            for origin_obj in origin_objs:
+                new_obj = BohObj(origin_obj, objtype)
+                new_obj.root = root
+                new_objs.append(new_obj)
         self[root] = new_objs
+        if profiling.enabled():
+            profiling.count('objects', len(new_objs))
+            for objtype, count in collections.Counter(obj.type for obj in new_objs).items():
+                profiling.count(f'objects.{objtype.name.lower()}', count)
 
         # 设置根分类
-        self.roots = {root}
+        self.roots.add(root)
 
-        # 创建映射表
-        self._map()
+        with profiling.phase('bohdata.map'):
+            # 创建根分类的 ID 映射表与映射表
+            rootmap = self.rootmaps.setdefault(root, {})
+            for obj in new_objs:
+                rootmap.setdefault(obj.id, []).append(obj)
+                self._map_append(obj)
 
     def __add__(self, other: 'BohData') -> 'BohData':
-        res = copy.deepcopy(self)
-        objs = list(other.map.values())
-        for obj in objs:
-            res.append(obj)
+        with profiling.phase('bohdata.deepcopy'):
+            res = copy.deepcopy(self)
+        res.merge(other)
         return res
 
+    def __iadd__(self, other: 'BohData') -> 'BohData':
+        self.merge(other)
+        return self
+
     def append(self, obj: BohObj) -> None:
         """添加``BohObj``对象。
 
         Args:
             obj (BohObj): 将添加的对象。
         """
-        if obj.root == 'unknown':
-            self._map_append(obj)
-            return
-        
-        if obj.root not in self.keys():
-            self[obj.root] = [obj]
-        elif obj not in self[obj.root]:
-            self[obj.root].append(obj)
+        if obj.root != 'unknown':
+            # 只需与同根分类、同 ID 的对象比较，相等的对象 ID 必然相同
+            members = self.rootmaps.setdefault(obj.root, {}).setdefault(obj.id, [])
+            if obj.root not in self:
+                self[obj.root] = [obj]
+                members.append(obj)
+            elif not any(obj.same(member) for member in members):
+                self[obj.root].append(obj)
+                members.append(obj)
+            self.roots.add(obj.root)
 
-        self.roots.add(obj.root)
-        self._map_append(obj)
+        # 索引与 objs 保持一致：替换了内容相同的对象时不重复加入，替换对象的根分类不同时丢弃按根分类记录的索引
+        replaced = self._map_append(obj)
+        if replaced is None:
+            if self._index is not None:
+                self._index.add(obj)
+            if self._graph is not None:
+                self._graph.add(obj)
+            if self._textindex is not None:
+                self._textindex.add(obj)
+        elif replaced.root != obj.root:
+            self._index = None
+            self._textindex = None
 
-    def tocsv(self, dir: str='./') -> None:
-        """输出用于``paratranz.cn``的``.csv``文件。
+    def find(self, id: str, root: str|None=None) -> list[BohObj]:
+        """按 ID 查找对象，不区分大小写。
 
         Args:
-            dir (str, optional): 输出路径。默认为``'./'``。
+            id (str): 对象 ID。
+            root (str, optional): 只查找该根分类中的对象。默认为``None``，即在映射表中查找（包括 ID 重复的对象）。
+
+        Returns:
+            list[BohObj]: 找到的对象，未找到时为空列表。
+        """
+        id = id.lower()
+        if root is not None:
+            return list(self.rootmaps.get(root, {}).get(id, ()))
+        if id in self.map:
+            return [self.map[id]]
+        return list(self.repeats.get(id, ()))
+
+    def remove(self, ids: Iterable[str]) -> list[BohObj]:
+        """移除给定 ID 的所有对象，不区分大小写，包括各根分类列表、映射表与 ID 重复对象中的对象。
+
+        移除后为空的根分类会被删除。已创建的属性路径索引、引用图与全文索引会被丢弃，下次调用``index``、``graph``与``textindex``时重新创建。
+
+        Args:
+            ids (Iterable[str]): 对象 ID。
+
+        Returns:
+            list[BohObj]: 被移除的对象，每个对象只出现一次。
         """
-        passkeys = ['AlternativeDefaultWorldSpherePaths', 'DefaultCardBack', 'DefaultGameSpeed', 'DefaultWorldSpherePath',
-                    'GameOverScene', 'ID', 'LoadingScene', 'LogoScene', 'ManifestationType',
-                    'MaxSuitabilityPulseFrequency', 'MenuScene', 'NewGameScene', 'NoteElementId', 'PlayfieldScene',
-                    'QuoteScene', 'StoredManifestation', 'StoredPhyicalManifestation', 'SuitabilityPulseSpeed',
-                    'WorldSphereType', 'achievements', 'actionid', 'ambittable', 'audio', 'audiooneshot', 'category',
-                    'craftable', 'datatype', 'decayto', 'defaultcard', 'defaultvalue', 'effects', 'ending', 'flavour',
-                    'fontscript', 'frompath', 'fx', 'fxreqs', 'hint', 'hints', 'icon', 'iconUnlocked', 'id', 'image',
-                    'inherits', 'isHidden', 'ishidden', 'lalt', 'linked', 'manifestationtype', 'mutations', 'reqs', 'run',
-                    'sort', 'spec', 'tabid', 'topath', 'ui', 'unique', 'uniquenessgroup', 'valuelabels',
-                    'valuenotifications', 'verbicon', 'warmup', 'xtriggers']    # 应跳过的不含需翻译文本的键
-        # TODO: 完成这些
-        # if isinstance(meta, dict):
-        #     for key, value in meta.items():
-        #         if key in passkeys:
-        #             continue
-        # 
-        #         if zh is None:
-        #             zhValue = None
-        #         else:
-        #             zhValue = zh.get(key)
-        # 
-        #         if isinstance(value, str):
-        #             line = prefix + '||' + key + ',"' + value.replace('\n', '\\n') + '","' + (zhValue or '').replace('\n', '\\n') + '"'
-        #             res.append(line)
-        #         elif isinstance(value, dict) or isinstance(value, list):
-        #             # 值为字典或列表，递归调用
-        #             res = res + getCSVLines(value, zhValue, prefix + '||' + key)
-        # elif isinstance(meta, list):
-        #     # 列表
-        #     for index, value in enumerate(meta):
-        #         # 获取本地化数据值
-        #         if zh == None:
-        #             zhValue = None
-        #         else:
-        #             try:
-        #                 zhValue = zh[index]
-        #             except IndexError:
-        #                 zhValue = None
-        # 
-        #         if isinstance(value, str):
-        #             # 值为字符串（需翻译文本）
-        #             line = prefix + '||' + str(index) + ',"' + value.replace('\n', '\\n') + '","' + (zhValue or '').replace('\n', '\\n') + '"'
-        #             res.append(line)
-        #         elif isinstance(value, dict) or isinstance(value, list):
-        #             # 值为字典或列表，递归调用
-        #             res = res + getCSVLines(value, zhValue, prefix + '||' + str(index))
-        # path = os.path.join(dir, self.file[:-4] + 'csv')
-
-    def _map(self):
-        """创建对象映射表。"""
+        ids = {id.lower() for id in ids}
+        removed = []
+        for id in ids:
+            if id in self.map:
+                removed.append(self.map.pop(id))
+            removed.extend(self.repeats.pop(id, ()))
+
+        for root in list(self.rootmaps):
+            rootmap = self.rootmaps[root]
+            members = [obj for id in ids for obj in rootmap.pop(id, ())]
+            if not members:
+                continue
+            removed.extend(obj for obj in members if not any(obj is other for other in removed))
+            self[root][:] = [obj for obj in self[root] if obj.id not in ids]
+            if not self[root]:
+                del self[root]
+                del self.rootmaps[root]
+                self.roots.discard(root)
+
+        self._index = None
+        self._graph = None
+        self._textindex = None
+        return removed
+
+    def rebuild(self) -> None:
+        """按所有根分类的对象列表重新创建映射表、ID 重复对象与各根分类的 ID 映射表。
+
+        直接修改``self[root]``中的列表后应调用此方法。根分类未知的对象只存在于映射表中，会被保留；
+        已创建的属性路径索引、引用图与全文索引会被丢弃，下次调用``index``、``graph``与``textindex``时重新创建。
+        """
+        unknown = [obj for obj in self.objs() if obj.root == 'unknown']
         self.map = {}
         self.repeats = {}
-        
-        objs = list(self.items())[0][1]
-        for obj in objs:
+        self.rootmaps = {}
+        self.roots = set(self.keys())
+        self._index = None
+        self._graph = None
+        self._textindex = None
+        for root, objs in self.items():
+            rootmap = self.rootmaps[root] = {}
+            for obj in objs:
+                rootmap.setdefault(obj.id, []).append(obj)
+                self._map_append(obj)
+        for obj in unknown:
             self._map_append(obj)
-    
-    def _map_append(self, obj: BohObj) -> None:
-        """在映射表中添加对象。"""
-        if obj.id in self.repeats.keys():
+
+    def index(self) -> PathIndex:
+        """获取所有游戏对象（包括 ID 重复的对象）的属性路径索引。
+
+        索引在首次调用时创建，之后添加对象时同步更新。
+
+        Returns:
+            PathIndex: 属性路径索引。
+        """
+        if self._index is None:
+            self._index = PathIndex(self.objs())
+        return self._index
+
+    def graph(self) -> RefGraph:
+        """获取所有游戏对象（包括 ID 重复的对象）的 ID 引用图。
+
+        引用图在首次调用时创建，之后添加对象时同步更新。
+
+        Returns:
+            RefGraph: ID 引用图。
+        """
+        if self._graph is None:
+            self._graph = RefGraph(self.objs())
+        return self._graph
+
+    def textindex(self) -> TextIndex:
+        """获取所有游戏对象（包括 ID 重复的对象）的全文索引。
+
+        索引在首次调用时创建，之后添加对象时同步更新。同时搜索译文时，可将翻译数据的对象加入索引，
+        或以``TextIndex(itertools.chain(data.objs(), translation.objs()))``另行创建。
+
+        Returns:
+            TextIndex: 全文索引。
+        """
+        if self._textindex is None:
+            self._textindex = TextIndex(self.objs())
+        return self._textindex
+
+    def objs(self) -> Iterator[BohObj]:
+        """遍历映射表中的所有游戏对象，包括 ID 重复的对象。
+
+        Yields:
+            BohObj: 游戏对象。
+        """
+        yield from self.map.values()
+        for repeats in self.repeats.values():
+            yield from repeats
+
+    def merge(self, other: 'BohData') -> None:
+        """将另一``BohData``对象的游戏对象原地合并到自身，不复制自身数据。
+
+        与``self + other``结果相同，但不会深复制已有数据，适用于逐个文件累积加载。
+
+        Args:
+            other (BohData): 将合并的游戏数据。
+        """
+        with profiling.phase('bohdata.merge'):
+            for obj in list(other.map.values()):
+                self.append(obj)
+        profiling.count('merged', len(other.map))
+
+    def translateall(self, translation: 'BohData') -> TranslationReport:
+        """使用翻译数据批量翻译自身所有游戏对象（包括 ID 重复的对象）。
+
+        按 ID 一次性对应原始对象与翻译文件对象，结构不一致之处不会抛出异常，而是记录在返回值中。
+
+        Args:
+            translation (BohData): 翻译数据。
+
+        Returns:
+            TranslationReport: 翻译结果报告。
+        """
+        translated = 0
+        untranslated = []
+        missing = []
+        unmatched = []
+        objs = itertools.chain(self.map.items(), ((id, obj) for id, repeats in self.repeats.items() for obj in repeats))
+        translations = translation.map
+        with profiling.phase('bohdata.translateall'):
+            for id, obj in objs:
+                translation_obj = translations.get(id)
+                if translation_obj is None:
+                    untranslated.append(id)
+                    continue
+
+                obj_missing, obj_unmatched = obj.translatewith(translation_obj, strict=False)
+                missing.extend(obj_missing)
+                unmatched.extend(obj_unmatched)
+                translated = translated + 1
+        profiling.count('translated', translated)
+
+        extra = [id for id in translation.map.keys() if id not in self.map and id not in self.repeats]
+        return TranslationReport(translated, untranslated, extra, missing, unmatched)
+
+    def save(self, path: str) -> None:
+        """将游戏数据保存为快照文件（见``bohdata.snapshot``），之后可通过``load``快速加载。
+
+        Args:
+            path (str): 快照文件路径。
+        """
+        with profiling.phase('bohdata.save', path):
+            snapshot.save(self, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'BohData':
+        """从``save``保存的快照文件加载游戏数据，不解析 JSON，也不重新判断对象类型。
+
+        Args:
+            path (str): 快照文件路径。
+
+        Returns:
+            BohData: 游戏数据，与保存时的内容相同。
+
+        Raises:
+            InvalidSnapshot: 文件不是当前版本的快照文件或已损坏。
+        """
+        with profiling.phase('bohdata.load', path):
+            return snapshot.load(path, cls)
+
+    def diff(self, other: 'BohData') -> DataDiff:
+        """与另一版本的游戏数据比较，自身为旧版本（见``bohdata.diff.diff``）。
+
+        Args:
+            other (BohData): 新版本的游戏数据。
+
+        Returns:
+            DataDiff: 新增、删除与修改的对象，以及修改之处的属性路径。
+        """
+        with profiling.phase('bohdata.diff'):
+            return diff(self, other)
+
+    def tolabels(self, path: str, format: str='lua') -> None:
+        """将映射表中对象的名称表按 ID 排序逐行写入文件，不含 ID 重复的对象与没有名称的对象。
+
+        Args:
+            path (str): 输出文件路径。
+            format (str, optional): 名称表格式：``'lua'``、``'json'``或``'tsv'``（见``bohdata.labels.tolabels``）。默认为``'lua'``。
+
+        Raises:
+            InvalidLabelsFormat: ``format``不是受支持的格式。
+        """
+        with profiling.phase('bohdata.tolabels', path):
+            tolabels(self.map.values(), path, format)
+
+    def tojson(self, dir: str='./', forwiki: bool=False, incremental: bool=True, workers: int|None=None,
+               archive: str|None=None, prune: bool=True) -> ExportReport:
+        """将所有对象（见``objs``）批量导出为``.json``文件（见``bohdata.export.tojson``）。
+
+        Args:
+            dir (str, optional): 输出路径。默认为``'./'``。
+            forwiki (bool, optional): 是否为``boh.huijiwiki.com``所用文件。默认为``False``。
+            incremental (bool, optional): 是否增量导出。默认为``True``。
+            workers (int, optional): 并发序列化与写入的进程数与线程数。默认为``None``，即逐个导出。
+            archive (str, optional): 写入``dir``下的单个压缩包，如``'output.zip'``。默认为``None``。
+            prune (bool, optional): 是否删除清单中记录而本次未导出的文件。默认为``True``。
+
+        Returns:
+            ExportReport: 导出结果统计。
+
+        Raises:
+            InvalidArchive: ``archive``的后缀名不受支持。
+        """
+        return tojson(self.objs(), dir, forwiki, incremental, workers, archive, prune)
+
+    def tocsv(self, dir: str='./', translation: 'BohData|None'=None) -> None:
+        """输出用于``paratranz.cn``的``.csv``文件。
+
+        文件名为``<file>.csv``，与``pack``所需的``raw``目录文件名一致。每行为``键,原文,译文``，
+        其中键为以``||``连接的对象 ID 与属性路径，逐行写入，不在内存中构建整个文件。
+
+        Args:
+            dir (str, optional): 输出路径。默认为``'./'``。
+            translation (BohData, optional): 已有的翻译数据，用于填写译文列。默认为``None``。
+        """
+        os.makedirs(dir, exist_ok=True)
+        with open(os.path.join(dir, f'{self.file}.csv'), 'w', encoding='utf-8', newline='') as file:
+            csv.writer(file).writerows(self.csvrows(translation))
+
+    def csvrows(self, translation: 'BohData|None'=None) -> Iterator[list[str]]:
+        """逐行产出``tocsv``所写入的行。
+
+        Args:
+            translation (BohData, optional): 已有的翻译数据，用于填写译文列。默认为``None``。
+
+        Yields:
+            list[str]: ``[键, 原文, 译文]``。
+        """
+        def getcsvrows(meta: dict|list, zh: Any, prefix: str) -> Iterator[list[str]]:
+            """产出``meta``中所有需翻译文本的行，``zh``为对应位置的翻译数据。"""
+            if isinstance(meta, dict):
+                items = ((key, value, zh.get(key) if isinstance(zh, dict) else None)
+                         for key, value in meta.items() if key not in PASS_KEYS)
+            else:   # list
+                items = ((index, value, zh[index] if isinstance(zh, list) and index < len(zh) else None)
+                         for index, value in enumerate(meta))
+
+            for key, value, zh_value in items:
+                if isinstance(value, str):
+                    # 值为字符串（需翻译文本）
+                    zh_text = zh_value if isinstance(zh_value, str) else ''
+                    yield [f'{prefix}||{key}', value.replace('\n', '\\n'), zh_text.replace('\n', '\\n')]
+                elif isinstance(value, dict) or isinstance(value, list):
+                    yield from getcsvrows(value, zh_value, f'{prefix}||{key}')
+
+        for objs in self.values():
+            for obj in objs:
+                zh = translation.map.get(obj.id) if translation is not None else None
+                yield from getcsvrows(obj, zh, obj.origin_id)
+
+    def _map_append(self, obj: BohObj) -> BohObj|None:
+        """在映射表中添加对象，返回被替换的内容相同的对象，没有替换时返回``None``。"""
+        if obj.id in self.repeats:
             self.repeats[obj.id].append(obj)
-        elif obj.id in self.map.keys() and obj != self.map[obj.id]:
+        elif obj.id in self.map and obj.fingerprint != self.map[obj.id].fingerprint:  # 只比较内容，不比较根分类
             self.repeats[obj.id] = [self.map[obj.id], obj]
             del self.map[obj.id]
         else:
-            self.map[obj.id] = obj
\ No newline at end of file
+            replaced = self.map.get(obj.id)
+            self.map[obj.id] = obj
+            return replaced
+        return None
\ No newline at end of file
@@ -4,9 +4,11 @@
     此模块包含了一个类，用于表示游戏对象。另有一枚举类表明对象类型。
 """
 from enum import Enum
+from typing import Any
 
 import os
 import json
+import hashlib
 
 class InvalidOriginObject(Exception):
     """无效的原始对象。传入的初始化对象不是游戏对象时抛出。
@@ -44,9 +46,38 @@ class BohObjType(Enum):
     """已翻译的游戏对象。"""
 
 
+TEXT_KEYS = frozenset({'AlphaLabelOverride', 'Desc', 'Label', 'StartDescription', 'comments', 'desc', 'description', 'descriptionunlocked', 'family', 'id', 'label', 'preface', 'preslots', 'slot', 'slots', 'startdescription', 'startlabel', 'xexts'})
+"""翻译文件对象中可能出现的键。"""
+
+TEXT_OBJ = frozenset({
+    'address.oriflammes', 'block.numa', 'hint.workstation', 'houseoflight.menu.food', 'houseoflight.menu.furtherstories',
+    'houseoflight.menu.institute', 'houseoflight.menu.intro', 'houseoflight.menu.manuscripts', 'houseoflight.menu.salons',
+    'houseoflight.menu.writingcase', 'musiccollection.autumn', 'musiccollection.contemplative', 'musiccollection.numa',
+    'musiccollection.spring', 'musiccollection.summer', 'musiccollection.winter', 'musictrack.aknowledgeinthelookofthings',
+    'musictrack.amber', 'musictrack.apostcardfrombrancrug', 'musictrack.arosewitch', 'musictrack.beacondance',
+    'musictrack.bellyoftheearth', 'musictrack.caputlupinium', 'musictrack.comeaway', 'musictrack.crookystreasures',
+    'musictrack.fireinthelibrary', 'musictrack.hawthorn', 'musictrack.istandatthedoor', 'musictrack.newgrowth',
+    'musictrack.onebarehour', 'musictrack.ouroboros', 'musictrack.peaceinthedeep', 'musictrack.rainbringsthedawn',
+    'musictrack.risingwindsturningstars', 'musictrack.seaholly', 'musictrack.settleoldsoldier', 'musictrack.stolenreflections',
+    'musictrack.sunrisecomesearly', 'musictrack.sunsetcomesearly', 'musictrack.sunssplendour', 'musictrack.thegoldenson',
+    'musictrack.thelaughingthrush', 'musictrack.themagicbetweenthetrees', 'musictrack.thememorywhichdoesnotdie',
+    'musictrack.theninthpart', 'musictrack.theroadtobrancrug', 'musictrack.thetwelfthstroke', 'musictrack.thevelvetsnamelessname',
+    'musictrack.thewatersedge', 'musictrack.wildwoodingreen', 'next.numa', 'pspherespec.b1', 'pspherespec.b2', 'pspherespec.b3',
+    'pspherespec.b4', 'pspherespec.b5', 'pspherespec.b6', 'pspherespec.b7', 'pspherespec.belongings', 'pspherespec.comfort',
+    'pspherespec.l1', 'pspherespec.l10', 'pspherespec.l11', 'pspherespec.l12', 'pspherespec.l13', 'pspherespec.l2', 'pspherespec.l3',
+    'pspherespec.l4', 'pspherespec.l5', 'pspherespec.l6', 'pspherespec.l7', 'pspherespec.l8', 'pspherespec.l9',
+    'pspherespec.outsidepile', 'pspherespec.outsidepile.beach', 'pspherespec.things', 'pspherespec.wall art', 'status.rhonwen.open',
+    'towards.numa'})
+"""只含文本属性，但属于原始游戏对象的对象 ID。"""
+
+UNNAMED = '（无名称）'
+"""没有``label``属性的对象的名称。"""
+
+VALID_ROOTS = frozenset({'dicta', 'cultures', 'achievements', 'decks', 'elements', 'recipes', 'endings', 'settings', 'legacies', 'verbs'})
+"""游戏中存在的根分类。"""
+
 def istext(obj: dict|list) -> bool:
     """检查一个字典或列表是否全为文本和 ID，用于判断对象是否为翻译文件对象。"""
-    TEXT_KEYS = {'AlphaLabelOverride', 'Desc', 'Label', 'StartDescription', 'comments', 'desc', 'description', 'descriptionunlocked', 'family', 'id', 'label', 'preface', 'preslots', 'slot', 'slots', 'startdescription', 'startlabel', 'xexts'}
     if isinstance(obj, dict):
         for key, value in obj.items():
             # 跳过 xexts
@@ -79,6 +110,59 @@ def getid(obj: dict) -> str:
     return (obj.get('id') or obj.get('ID')).lower()
 
 
+def _canonical(value: Any) -> Any:
+    """将值中``==``视为相等的数字统一为同一形式：布尔值与整数值的浮点数转为整数。"""
+    if isinstance(value, dict):
+        return {key: _canonical(subvalue) for key, subvalue in value.items()}
+    if isinstance(value, list):
+        return [_canonical(item) for item in value]
+    if isinstance(value, bool) or isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _merge(meta: dict|list, translation: dict|list, path: str, missing: list[str]|None, unmatched: list[str]|None) -> None:
+    """将 translation 合并到 meta。
+
+    ``missing``与``unmatched``为``None``时，在两者结构不一致处抛出``KeyError``，否则记录路径并跳过。
+    """
+    def mismatch(record: list[str]|None, subpath: str) -> None:
+        if record is None:
+            raise KeyError(subpath)
+        record.append(subpath)
+
+    if isinstance(meta, dict):
+        for key, value in translation.items():
+            if not isinstance(value, (dict, list)):     # 字符串等非容器值直接赋值
+                meta[key] = value
+            elif isinstance(meta.get(key), dict if isinstance(value, dict) else list):
+                _merge(meta[key], value, f'{path}||{key}', missing, unmatched)
+            else:
+                mismatch(unmatched, f'{path}||{key}')
+        return
+
+    # list：按 ID 对应成员，每个列表只建立一次索引，无法按 ID 对应的成员（如字符串）记录为不一致
+    index = {}
+    for position, item in enumerate(translation):
+        if isinstance(item, dict) and (item.get('id') or item.get('ID')):
+            index[getid(item)] = item
+        else:
+            mismatch(unmatched, f'{path}||{position}')
+    matched = set()
+    for item in meta:
+        if not isinstance(item, dict) or not (item.get('id') or item.get('ID')):
+            continue
+        id = getid(item)
+        if id in index:
+            matched.add(id)
+            _merge(item, index[id], f'{path}||{id}', missing, unmatched)
+        else:
+            mismatch(missing, f'{path}||{id}')
+
+    if unmatched is not None:
+        unmatched.extend(f'{path}||{id}' for id in index.keys() - matched)
+
+
 class BohObj(dict):
     """表示游戏对象的类。
 
@@ -96,6 +180,8 @@ class BohObj(dict):
         InvalidOriginObject: 传入无效的对象原始数据。
         InvalidRoot: 尝试为对象的``root``属性赋予游戏中不存在的根类型。
     """
+    __slots__ = ('id', 'origin_id', 'label', 'type', '_root', '_fingerprint')
+
     @property
     def root(self) -> str:
         if self._root is None:
@@ -104,7 +190,6 @@ class BohObj(dict):
     
     @root.setter
     def root(self, value: str):
-        VALID_ROOTS = {'dicta', 'cultures', 'achievements', 'decks', 'elements', 'recipes', 'endings', 'settings', 'legacies', 'verbs'}
         if value not in VALID_ROOTS:
             raise InvalidRoot(f"错误的根分类：{value}")
         self._root = value
@@ -129,25 +214,7 @@ class BohObj(dict):
             self.type = objtype
         else:
             # 自动分类
-            TEXT_OBJ = ['address.oriflammes', 'block.numa', 'hint.workstation', 'houseoflight.menu.food', 'houseoflight.menu.furtherstories',
-                        'houseoflight.menu.institute', 'houseoflight.menu.intro', 'houseoflight.menu.manuscripts', 'houseoflight.menu.salons',
-                        'houseoflight.menu.writingcase', 'musiccollection.autumn', 'musiccollection.contemplative', 'musiccollection.numa',
-                        'musiccollection.spring', 'musiccollection.summer', 'musiccollection.winter', 'musictrack.aknowledgeinthelookofthings',
-                        'musictrack.amber', 'musictrack.apostcardfrombrancrug', 'musictrack.arosewitch', 'musictrack.beacondance',
-                        'musictrack.bellyoftheearth', 'musictrack.caputlupinium', 'musictrack.comeaway', 'musictrack.crookystreasures',
-                        'musictrack.fireinthelibrary', 'musictrack.hawthorn', 'musictrack.istandatthedoor', 'musictrack.newgrowth',
-                        'musictrack.onebarehour', 'musictrack.ouroboros', 'musictrack.peaceinthedeep', 'musictrack.rainbringsthedawn',
-                        'musictrack.risingwindsturningstars', 'musictrack.seaholly', 'musictrack.settleoldsoldier', 'musictrack.stolenreflections',
-                        'musictrack.sunrisecomesearly', 'musictrack.sunsetcomesearly', 'musictrack.sunssplendour', 'musictrack.thegoldenson',
-                        'musictrack.thelaughingthrush', 'musictrack.themagicbetweenthetrees', 'musictrack.thememorywhichdoesnotdie',
-                        'musictrack.theninthpart', 'musictrack.theroadtobrancrug', 'musictrack.thetwelfthstroke', 'musictrack.thevelvetsnamelessname',
-                        'musictrack.thewatersedge', 'musictrack.wildwoodingreen', 'next.numa', 'pspherespec.b1', 'pspherespec.b2', 'pspherespec.b3',
-                        'pspherespec.b4', 'pspherespec.b5', 'pspherespec.b6', 'pspherespec.b7', 'pspherespec.belongings', 'pspherespec.comfort',
-                        'pspherespec.l1', 'pspherespec.l10', 'pspherespec.l11', 'pspherespec.l12', 'pspherespec.l13', 'pspherespec.l2', 'pspherespec.l3',
-                        'pspherespec.l4', 'pspherespec.l5', 'pspherespec.l6', 'pspherespec.l7', 'pspherespec.l8', 'pspherespec.l9',
-                        'pspherespec.outsidepile', 'pspherespec.outsidepile.beach', 'pspherespec.things', 'pspherespec.wall art', 'status.rhonwen.open',
-                        'towards.numa']
-            if istext(self) and self.id not in TEXT_OBJ:
+            if self.id not in TEXT_OBJ and istext(self):
                 self.type = BohObjType.TRANSLATION
             else:
                 self.type = BohObjType.META
@@ -155,34 +222,67 @@ class BohObj(dict):
         # Root
         self._root = None
 
+        # 内容指纹，首次使用时计算
+        self._fingerprint = None
+
     def __eq__(self, other) -> bool:
         if not isinstance(other, BohObj):
             return False
         
         return super().__eq__(other) and (self.root == other.root or self.root == 'unknown' or other.root == 'unknown')
 
-    def translatewith(self, translation: 'BohObj') -> None:
+    @property
+    def fingerprint(self) -> bytes:
+        """对象内容的指纹。内容相等（``==``）的对象指纹相同，如``1``、``1.0``与``true``。
+
+        指纹在首次使用时计算并缓存，``translatewith``会使其重新计算。以其他方式修改对象内容后，应调用``touch``。
+        """
+        if self._fingerprint is None:
+            content = json.dumps(self, sort_keys=True, ensure_ascii=False)
+            # 只有含布尔值或整数值的浮点数（写作 1.0 或 1e+16）时才需统一形式，字符串中的误判只会多走一次慢路径
+            if 'true' in content or 'false' in content or '.0' in content or 'e+' in content:
+                content = json.dumps(_canonical(self), sort_keys=True, ensure_ascii=False)
+            self._fingerprint = hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+        return self._fingerprint
+
+    def touch(self) -> None:
+        """声明对象内容已被修改，使指纹重新计算。"""
+        self._fingerprint = None
+
+    def same(self, other: 'BohObj') -> bool:
+        """判断与另一对象是否相等，结果与``==``相同，但通过缓存的指纹比较内容，避免逐层比较字典。
+
+        Args:
+            other (BohObj): 另一对象。
+
+        Returns:
+            bool: 是否相等。
+        """
+        return self.fingerprint == other.fingerprint and (self.root == other.root or self.root == 'unknown' or other.root == 'unknown')
+
+    def translatewith(self, translation: 'BohObj', strict: bool=True) -> tuple[list[str], list[str]]:
         """使用翻译文件对象翻译原始游戏对象。
 
         Args:
             translation (BohObj): 翻译文件对象。
+            strict (bool, optional): 是否在两者结构不一致时抛出``KeyError``。默认为``True``。
+                为``False``时跳过不一致之处，并在返回值中报告。
+
+        Returns:
+            tuple[list[str], list[str]]: ``(missing, unmatched)``，路径以``||``连接，以对象 ID 开头：\n
+                - missing: 原始对象中缺少翻译的列表成员。\n
+                - unmatched: 翻译文件对象中无法对应到原始对象的属性与列表成员（如字符串成员）。
+
+        Raises:
+            KeyError: ``strict``为``True``且两者结构不一致。
         """
-        def merge(meta: dict|list, translation: dict|list) -> None:
-            """将 translation 合并到 meta。"""
-            if isinstance(meta, dict):
-                for key, value in translation.items():
-                    if isinstance(value, str):
-                        meta[key] = value
-                    else:   # dict 或 list
-                        merge(meta[key], value)
-            else:   # list
-                map_ = {getid(item): item for item in translation}   # list 中所有 dict 的 map
-                for item in meta:
-                    merge(item, map_[getid(item)])
-        
-        merge(self, translation)
+        missing = None if strict else []
+        unmatched = None if strict else []
+        _merge(self, translation, self.id, missing, unmatched)
+        self.touch()
         self._setLabel()
         self.type = BohObjType.TRANSLATED
+        return missing or [], unmatched or []
 
     def tojson(self, dir: str='./', forwiki: bool=False) -> None:
         """在给定目录下创建对象的``.json``文件。
@@ -191,9 +291,19 @@ class BohObj(dict):
             dir (str, optional): 输出路径。默认为``'./'``。
             forwiki (bool, optional): 是否为``boh.huijiwiki.com``所用文件。默认为``False``。
         """
-        if not os.path.exists(dir):
-            os.makedirs(dir)
+        os.makedirs(dir, exist_ok=True)
+        with open(os.path.join(dir, self.filename(forwiki)), 'w', encoding='utf-8') as file:
+            file.write(self.dumps())
 
+    def filename(self, forwiki: bool=False) -> str:
+        """获取``tojson``所用的文件名。
+
+        Args:
+            forwiki (bool, optional): 是否为``boh.huijiwiki.com``所用文件。默认为``False``。
+
+        Returns:
+            str: 文件名。
+        """
         fname = self.id
         if forwiki:
             fname = fname.replace('_', ' ')
@@ -205,14 +315,15 @@ class BohObj(dict):
                 else:
                     fname = f'{fname} zh'
             fname = fname[0].upper() + fname[1:]
-        fname = f'{fname}.json'
+        return f'{fname}.json'
 
-        with open(os.path.join(dir, fname), 'w', encoding='utf-8') as file:
-            file.write(json.dumps(self, indent='\t', ensure_ascii=False))
+    def dumps(self) -> str:
+        """获取``tojson``所写入的文本。"""
+        return json.dumps(self, indent='\t', ensure_ascii=False)
 
     def _setLabel(self) -> None:
         """更新自身``label``属性。"""
         if self.get('label') == '' or self.get('Label') == '':
             self.label = ""
         else:
-            self.label = self.get('label') or self.get('Label') or "（无名称）"
\ No newline at end of file
+            self.label = self.get('label') or self.get('Label') or UNNAMED
\ No newline at end of file
@@ -0,0 +1,176 @@
+#-*-coding:utf-8-*-
+"""解析缓存模块。
+
+    此模块包含了一个类，用于将已解析的游戏文件以``pickle``格式缓存到磁盘，避免重复解析未修改的文件。
+"""
+import os
+import pickle
+import hashlib
+
+from bohdata import profiling
+from bohdata.storage import nogc, replacing
+from bohdata.bohobj import BohObjType
+from bohdata.bohdata import BohData
+
+class InvalidCacheCheck(Exception):
+    """无效的缓存校验方式。传入``'stat'``与``'hash'``以外的校验方式时抛出。
+
+    Args:
+        message (str): 可读的报错文本。
+    """
+    def __init__(self, message):
+        super().__init__(message)
+
+
+class ParseCache:
+    """磁盘解析缓存。
+
+    每个源文件对应缓存目录下的一个条目，条目中记录了源文件的校验信息。读取时若校验信息不一致，则视为未命中。
+    源目录亦可作为一个条目缓存合并后的数据，其校验信息由目录下所有``.json``文件的校验信息组成。
+    ``read``只在目录中所有文件均命中缓存时写入目录的数据，否则只写入校验信息，
+    因此修改文件后的第一次读取不会加载或写入整个目录的数据。
+
+    Attributes:
+        dir (str): 缓存目录。
+        maxsize (int | None): 缓存目录的最大字节数，超出时删除最久未使用的条目。``None``表示不限制。
+        check (str): 校验方式：\n
+            - ``'stat'``: 比较文件的修改时间与大小（默认）。\n
+            - ``'hash'``: 比较文件内容的 SHA-1 值。
+
+    Raises:
+        InvalidCacheCheck: 传入无效的校验方式。
+    """
+    VERSION = 9
+    """缓存格式版本，格式变化时应增加，使旧条目失效。"""
+
+    def __init__(self, dir: str, maxsize: int|None=None, check: str='stat'):
+        if check not in {'stat', 'hash'}:
+            raise InvalidCacheCheck(f"无效的缓存校验方式：{check}")
+
+        self.dir = dir
+        self.maxsize = maxsize
+        self.check = check
+        os.makedirs(dir, exist_ok=True)
+
+    def get(self, target: str, objtype: BohObjType=BohObjType.UNKNOWN, stamp: tuple|None=None) -> BohData|None:
+        """获取文件的缓存数据。
+
+        条目中的校验信息与数据分别存储，校验信息不一致时不会读取数据。
+
+        Args:
+            target (str): 源文件或目录路径。
+            objtype (BohObjType, optional): 读取时使用的游戏对象类型。默认为``BohObjType.UNKNOWN``。
+            stamp (tuple, optional): 已由``stamp``计算的校验信息。默认为``None``，即重新计算。
+
+        Returns:
+            BohData | None: 缓存的游戏数据，未命中时为``None``。
+        """
+        path = self._entry(target, objtype)
+        if stamp is None:
+            stamp = self.stamp(target)
+        try:
+            with profiling.phase('cache.get', target), nogc(), open(path, 'rb') as file:
+                if pickle.load(file) != stamp:
+                    data = None
+                else:
+                    data = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+            data = None
+
+        if data is None:
+            profiling.count('cache.miss')
+            return None
+
+        profiling.count('cache.hit')
+
+        if self.maxsize is not None:
+            os.utime(path)  # 记录使用时间，供 prune 使用
+        return data
+
+    def put(self, target: str, data: BohData|None, objtype: BohObjType=BohObjType.UNKNOWN, stamp: tuple|None=None) -> None:
+        """写入文件的缓存数据。
+
+        Args:
+            target (str): 源文件或目录路径。
+            data (BohData | None): 源文件或目录的游戏数据。为``None``时只记录校验信息，``get``总是未命中，
+                用于目录中仍有文件变化时，不必写入整个目录的数据，``sweep``仍可据此删除已删除文件的条目。
+            objtype (BohObjType, optional): 读取时使用的游戏对象类型。默认为``BohObjType.UNKNOWN``。
+            stamp (tuple, optional): 解析前由``stamp``计算的校验信息。默认为``None``，即重新计算。
+        """
+        path = self._entry(target, objtype)
+        if stamp is None:
+            stamp = self.stamp(target)
+        with profiling.phase('cache.put', target), replacing(path) as temp, open(temp, 'wb') as file:
+            pickle.dump(stamp, file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def sweep(self, target: str, paths: list[str], objtype: BohObjType=BohObjType.UNKNOWN) -> None:
+        """删除目录中已不存在的文件的条目。
+
+        上次写入的目录条目的校验信息中记录了当时目录下的所有文件，不在``paths``中的文件的条目将被删除。
+
+        Args:
+            target (str): 源目录路径。
+            paths (list[str]): 目录下现有的``.json``文件。
+            objtype (BohObjType, optional): 读取时使用的游戏对象类型。默认为``BohObjType.UNKNOWN``。
+        """
+        try:
+            with open(self._entry(target, objtype), 'rb') as file:
+                stamp = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+            return
+
+        current = set(paths)
+        for path, _ in stamp:
+            if path not in current:
+                try:
+                    os.remove(self._entry(path, objtype))
+                except FileNotFoundError:
+                    pass
+
+    def clear(self) -> None:
+        """删除所有缓存条目。"""
+        for entry in os.scandir(self.dir):
+            if entry.name.endswith('.pickle'):
+                os.remove(entry.path)
+
+    def prune(self) -> None:
+        """删除最久未使用的条目，直至缓存目录不超过``maxsize``。"""
+        if self.maxsize is None:
+            return
+
+        entries = [entry for entry in os.scandir(self.dir) if entry.name.endswith('.pickle')]
+        stats = {entry.path: entry.stat() for entry in entries}
+        total = sum(stat.st_size for stat in stats.values())
+        for path in sorted(stats, key=lambda path: stats[path].st_mtime_ns):
+            if total <= self.maxsize:
+                break
+            os.remove(path)
+            total = total - stats[path].st_size
+
+    def _entry(self, target: str, objtype: BohObjType) -> str:
+        """计算缓存条目路径。"""
+        key = f'{ParseCache.VERSION}|{objtype.name}|{os.path.abspath(target)}'
+        return os.path.join(self.dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.pickle')
+
+    def stamp(self, target: str) -> tuple:
+        """计算源文件或目录的校验信息。
+
+        目录的校验信息为目录下各``.json``文件的``(路径, 校验信息)``，按``os.walk``的顺序排列。
+
+        Args:
+            target (str): 源文件或目录路径。
+
+        Returns:
+            tuple: 校验信息。
+        """
+        if os.path.isdir(target):
+            return tuple((os.path.join(root, fname), self.stamp(os.path.join(root, fname)))
+                         for root, _, files in os.walk(target) for fname in files if fname.endswith('.json'))
+
+        if self.check == 'hash':
+            with open(target, 'rb') as file:
+                return ('hash', hashlib.sha1(file.read()).hexdigest())
+
+        stat = os.stat(target)
+        return ('stat', stat.st_mtime_ns, stat.st_size)
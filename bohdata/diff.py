@@ -0,0 +1,156 @@
+#-*-coding:utf-8-*-
+"""差异比较模块。
+
+    此模块用于比较两个版本的游戏数据，找出新增、删除与修改的对象，以及修改之处的属性路径。
+"""
+from typing import Any, NamedTuple
+
+from bohdata.bohobj import BohObj, TEXT_KEYS
+
+class Change(NamedTuple):
+    """对象中一处属性的变化。
+
+    Attributes:
+        kind (str): ``'added'``、``'removed'``或``'changed'``。
+        path (str): 以``||``连接的属性路径，以对象 ID 开头，列表成员以下标表示，如``'id||slots||0||label'``。
+        old (Any): 旧值，新增时为``None``。
+        new (Any): 新值，删除时为``None``。
+    """
+    kind: str
+    path: str
+    old: Any
+    new: Any
+
+
+class DataDiff(NamedTuple):
+    """``BohData.diff``的比较结果。对象按 ID 对应，只比较内容，不比较根分类。
+
+    新版本中需要更新的对象为``added``与``changed``中的对象，可用于增量导出或更新翻译；``removed``中的对象应被删除。
+
+    Attributes:
+        added (list[str]): 只存在于新版本中的对象 ID。
+        removed (list[str]): 只存在于旧版本中的对象 ID。
+        changed (dict[str, list[Change]]): 内容变化的对象 ID 到其属性变化的映射表。
+        unchanged (int): 内容未变化的对象 ID 数。
+    """
+    added: list[str]
+    removed: list[str]
+    changed: dict[str, list[Change]]
+    unchanged: int
+
+    def text(self) -> dict[str, list[Change]]:
+        """获取``changed``中需翻译文本的变化，即属性路径中最后一个键属于``TEXT_KEYS``（``id``除外）或位于``xexts``中的变化。
+
+        Returns:
+            dict[str, list[Change]]: 对象 ID 到其文本变化的映射表，不含没有文本变化的对象。
+        """
+        res = {}
+        for id, changes in self.changed.items():
+            text = [change for change in changes if _istext(change.path)]
+            if text:
+                res[id] = text
+        return res
+
+
+def diff(old: 'BohData', new: 'BohData') -> DataDiff:
+    """比较两个版本的游戏数据。
+
+    ID 相同的对象先比较内容指纹（见``BohObj.fingerprint``），指纹相同的对象直接跳过，只对内容不同的对象逐层比较属性。
+    ID 重复的对象（``repeats``）中内容相同者互相抵消，其余按顺序逐对比较，多出的对象记录为整个对象的新增或删除。
+
+    Args:
+        old (BohData): 旧版本的游戏数据。
+        new (BohData): 新版本的游戏数据。
+
+    Returns:
+        DataDiff: 比较结果。
+    """
+    before = _group(old)
+    after = _group(new)
+    added = [id for id in after if id not in before]
+    removed = [id for id in before if id not in after]
+    changed = {}
+    unchanged = 0
+    for id, old_objs in before.items():
+        new_objs = after.get(id)
+        if new_objs is None:
+            continue
+
+        if len(old_objs) == 1 and len(new_objs) == 1:
+            if old_objs[0].fingerprint == new_objs[0].fingerprint:
+                unchanged = unchanged + 1
+                continue
+            changes = []
+            _diff(old_objs[0], new_objs[0], id, changes)
+        else:
+            changes = _diffrepeats(id, old_objs, new_objs)
+
+        if changes:
+            changed[id] = changes
+        else:
+            unchanged = unchanged + 1
+    return DataDiff(added, removed, changed, unchanged)
+
+
+def _group(data: 'BohData') -> dict[str, list[BohObj]]:
+    """ID 到该 ID 所有对象的映射表。"""
+    res = {id: [obj] for id, obj in data.map.items()}
+    res.update(data.repeats)
+    return res
+
+
+def _diffrepeats(id: str, old_objs: list[BohObj], new_objs: list[BohObj]) -> list[Change]:
+    """比较 ID 相同的多个对象。"""
+    remaining = list(new_objs)
+    unmatched = []
+    for obj in old_objs:
+        match = next((index for index, other in enumerate(remaining) if other.fingerprint == obj.fingerprint), None)
+        if match is None:
+            unmatched.append(obj)
+        else:
+            del remaining[match]
+
+    changes = []
+    for old_obj, new_obj in zip(unmatched, remaining):
+        _diff(old_obj, new_obj, id, changes)
+    for obj in unmatched[len(remaining):]:
+        changes.append(Change('removed', id, obj, None))
+    for obj in remaining[len(unmatched):]:
+        changes.append(Change('added', id, None, obj))
+    return changes
+
+
+def _diff(old: Any, new: Any, path: str, changes: list[Change]) -> None:
+    """逐层比较``old``与``new``，将变化加入``changes``。"""
+    if old == new:
+        return
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, value in old.items():
+            if key not in new:
+                changes.append(Change('removed', f'{path}||{key}', value, None))
+            else:
+                _diff(value, new[key], f'{path}||{key}', changes)
+        for key, value in new.items():
+            if key not in old:
+                changes.append(Change('added', f'{path}||{key}', None, value))
+    elif isinstance(old, list) and isinstance(new, list):
+        for index in range(min(len(old), len(new))):
+            _diff(old[index], new[index], f'{path}||{index}', changes)
+        for index in range(len(new), len(old)):
+            changes.append(Change('removed', f'{path}||{index}', old[index], None))
+        for index in range(len(old), len(new)):
+            changes.append(Change('added', f'{path}||{index}', None, new[index]))
+    else:
+        changes.append(Change('changed', path, old, new))
+
+
+def _istext(path: str) -> bool:
+    """属性路径是否指向需翻译的文本。与``search.textfields``相同，``xexts``中的键均为文本。"""
+    segments = path.split('||')[1:]
+    if 'xexts' in segments:
+        return True
+    for segment in reversed(segments):
+        if not segment.isdigit():
+            return segment in TEXT_KEYS and segment != 'id'
+    return False
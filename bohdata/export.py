@@ -0,0 +1,223 @@
+#-*-coding:utf-8-*-
+"""批量导出模块。
+
+    此模块用于将大量游戏对象导出为``.json``文件，并可借助清单文件增量导出，或写入单个压缩包。
+"""
+import io
+import os
+import json
+import time
+import hashlib
+import tarfile
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, Iterator, NamedTuple
+
+from bohdata import profiling
+from bohdata.storage import replacing
+from bohdata.bohobj import BohObj
+
+MANIFEST = '.bohdata-manifest.json'
+"""输出目录下清单文件的文件名。清单记录了每个输出文件内容的 SHA-1 值。"""
+
+CHUNKSIZE = 64
+"""并发导出时每个任务序列化的对象数。"""
+
+ARCHIVE_MODES = {'.zip': None, '.tar': 'w', '.tar.gz': 'w:gz', '.tgz': 'w:gz', '.tar.bz2': 'w:bz2', '.tar.xz': 'w:xz'}
+"""支持的压缩包后缀名到``tarfile``写入模式的映射表，``.zip``使用``zipfile``。"""
+
+class ExportReport(NamedTuple):
+    """``tojson``的导出结果统计。
+
+    Attributes:
+        added (int): 新增的文件数。
+        changed (int): 内容变化而重新写入的文件数。
+        removed (int): 对象已不存在而删除的文件数。
+        unchanged (int): 内容未变化而跳过的文件数。
+    """
+    added: int
+    changed: int
+    removed: int
+    unchanged: int
+
+
+class InvalidArchive(Exception):
+    """无效的压缩包文件名。后缀名不属于``ARCHIVE_MODES``时抛出。
+
+    Args:
+        message (str): 可读的报错文本。
+    """
+    def __init__(self, message):
+        super().__init__(message)
+
+
+def tojson(objs: Iterable[BohObj], dir: str='./', forwiki: bool=False, incremental: bool=True, workers: int|None=None,
+           archive: str|None=None, prune: bool=True, remove: Iterable[BohObj]=()) -> ExportReport:
+    """将游戏对象批量导出为``.json``文件，文件名与``BohObj.tojson``相同。
+
+    增量导出时，内容未变化的文件不会被重新写入，上次导出过而本次不存在的文件会被删除。
+    除``remove``中的对象的文件外，只有清单中记录的文件会被删除，输出目录中的其他文件不受影响。
+
+    ``workers``大于 1 时，对象每``CHUNKSIZE``个一组在进程池中序列化，同时由线程池写入文件，
+    进行中的序列化与写入任务各不超过``2 * workers``个。输出与逐个导出完全相同。
+    进程池的子进程在 Windows 与 macOS 上会重新导入调用方的主模块，脚本中应在``if __name__ == '__main__':``之下调用。
+
+    Args:
+        objs (Iterable[BohObj]): 将导出的游戏对象。文件名相同时，后者覆盖前者。
+        dir (str, optional): 输出路径。默认为``'./'``。
+        forwiki (bool, optional): 是否为``boh.huijiwiki.com``所用文件。默认为``False``。
+        incremental (bool, optional): 是否增量导出。默认为``True``。为``False``时将重新写入所有文件。
+        workers (int, optional): 进程数与线程数。默认为``None``，即在当前进程中逐个导出。
+        archive (str, optional): 压缩包文件名，如``'output.zip'``，将在``dir``下创建，后缀名须属于``ARCHIVE_MODES``。
+            默认为``None``，即逐个写入文件。写入压缩包时不使用清单，所有文件都计为新增。
+        prune (bool, optional): 是否删除清单中记录而本次未导出的文件。默认为``True``。
+            只导出部分对象（如``Watcher``回调中受影响的对象）时应为``False``，清单中其余文件的记录将被保留。
+        remove (Iterable[BohObj], optional): 应删除其文件的对象，如``WatchEvent.removed``。默认为空。
+            文件与清单中的记录一并删除，本次导出的文件名相同的对象除外。写入压缩包时忽略。
+
+    Returns:
+        ExportReport: 导出结果统计。
+
+    Raises:
+        InvalidArchive: ``archive``的后缀名不受支持。
+    """
+    if archive is not None and _archivemode(archive) is None:
+        raise InvalidArchive(f'不支持的压缩包格式：{archive}')
+    os.makedirs(dir, exist_ok=True)
+
+    # 文件名相同时只保留最后一个对象
+    latest = {}
+    for obj in objs:
+        latest[obj.filename(forwiki)] = obj
+    fnames = list(latest)
+
+    with profiling.phase('export.write', dir):
+        contents = _serialize(list(latest.values()), workers)
+        if archive is not None:
+            report = _toarchive(os.path.join(dir, archive), fnames, contents)
+        else:
+            report = _todir(dir, fnames, contents, incremental, workers, prune, {obj.filename(forwiki) for obj in remove})
+
+    profiling.count('export.added', report.added)
+    profiling.count('export.changed', report.changed)
+    profiling.count('export.removed', report.removed)
+    profiling.count('export.unchanged', report.unchanged)
+    return report
+
+
+def _todir(dir: str, fnames: list[str], contents: Iterator[tuple[str, str]], incremental: bool,
+           workers: int|None, prune: bool, remove: set[str]) -> ExportReport:
+    """将各文件写入目录，并更新清单。"""
+    manifest_path = os.path.join(dir, MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+    existing = set(os.listdir(dir))
+
+    # 写入文件
+    added = changed = unchanged = 0
+    current = {}
+    writer = ThreadPoolExecutor(workers) if workers is not None and workers > 1 else None
+    pending = deque()
+    try:
+        for fname, (content, digest) in zip(fnames, contents):
+            current[fname] = digest
+            if incremental and manifest.get(fname) == digest and fname in existing:
+                unchanged = unchanged + 1
+                continue
+
+            path = os.path.join(dir, fname)
+            if writer is None:
+                _write(path, content)
+            else:
+                if len(pending) >= 2 * workers:
+                    pending.popleft().result()
+                pending.append(writer.submit(_write, path, content))
+            if fname in manifest:
+                changed = changed + 1
+            else:
+                added = added + 1
+        while pending:
+            pending.popleft().result()
+    finally:
+        if writer is not None:
+            writer.shutdown()
+
+    # 删除已不存在的对象的文件
+    removed = 0
+    removing = remove - current.keys()
+    if prune:
+        removing = removing | (manifest.keys() - current.keys())
+    else:
+        current = {fname: digest for fname, digest in {**manifest, **current}.items() if fname not in removing}
+    for fname in removing:
+        if fname in existing:
+            os.remove(os.path.join(dir, fname))
+            removed = removed + 1
+
+    # 先写入临时文件，进程中断时不会留下无法解析的清单
+    with replacing(manifest_path) as temp, open(temp, 'w', encoding='utf-8') as file:
+        file.write(json.dumps(current, ensure_ascii=False))
+
+    return ExportReport(added, changed, removed, unchanged)
+
+
+def _toarchive(path: str, fnames: list[str], contents: Iterator[tuple[str, str]]) -> ExportReport:
+    """将各文件写入压缩包。先写入临时文件，完成后再替换，避免留下不完整的压缩包。"""
+    mode = _archivemode(path)
+    with replacing(path) as temp:
+        if mode == 'zip':
+            with zipfile.ZipFile(temp, 'w', compression=zipfile.ZIP_DEFLATED) as file:
+                for fname, (content, _) in zip(fnames, contents):
+                    file.writestr(fname, content)
+        else:
+            now = time.time()
+            with tarfile.open(temp, mode) as file:
+                for fname, (content, _) in zip(fnames, contents):
+                    data = content.encode('utf-8')
+                    info = tarfile.TarInfo(fname)
+                    info.size = len(data)
+                    info.mtime = now
+                    file.addfile(info, io.BytesIO(data))
+    return ExportReport(len(fnames), 0, 0, 0)
+
+
+def _archivemode(path: str) -> str|None:
+    """压缩包的写入模式，``.zip``为``'zip'``，不受支持时为``None``。"""
+    for suffix, mode in ARCHIVE_MODES.items():
+        if path.endswith(suffix):
+            return mode or 'zip'
+    return None
+
+
+def _serialize(objs: list[BohObj], workers: int|None) -> Iterator[tuple[str, str]]:
+    """按顺序产出各对象的文件内容与其 SHA-1 值。"""
+    if workers is None or workers <= 1 or len(objs) <= CHUNKSIZE:
+        for obj in objs:
+            yield _dump(obj)
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for start in range(0, len(objs), CHUNKSIZE):
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+            pending.append(executor.submit(_dumps, objs[start:start + CHUNKSIZE]))
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _dumps(objs: list[BohObj]) -> list[tuple[str, str]]:
+    return [_dump(obj) for obj in objs]
+
+
+def _dump(obj: BohObj) -> tuple[str, str]:
+    content = obj.dumps()
+    return content, hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def _write(path: str, content: str) -> None:
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(content)
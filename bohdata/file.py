@@ -4,12 +4,38 @@
     此模块用于执行文件操作，包括从``.json``文件中读取游戏数据、检查``.json``文件。
 """
 import os
+import re
 import json
+import codecs
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Callable, Iterator, NamedTuple
 
+from bohdata import profiling
 from bohdata.bohobj import getid
 from bohdata.bohobj import BohObj
 from bohdata.bohobj import BohObjType
 from bohdata.bohdata import BohData
+from bohdata.cache import ParseCache
+from bohdata.paratranz import buildtree
+
+_HEAD = re.compile(r'[ \t\n\r]*\{[ \t\n\r]*("(?:[^"\\]|\\.)*")[ \t\n\r]*:[ \t\n\r]*\[')
+"""游戏文件的开头，即根分类与根数组的起始。"""
+
+_WS = re.compile(r'[ \t\n\r]*')
+"""JSON 中的空白。"""
+
+_COMMA = re.compile(r'[ \t\n\r]*(?:(,)[ \t\n\r]*)?')
+"""根数组中对象之后的空白与分隔符。"""
+
+_NEXT = re.compile(r'[ \t\n\r]*,[ \t\n\r]*("(?:[^"\\]|\\.)*")[ \t\n\r]*:[ \t\n\r]*\[')
+"""根数组之后，下一个根分类与根数组的起始。"""
+
+_END = re.compile(r'[ \t\n\r]*\}[ \t\n\r]*')
+"""根数组之后，游戏文件的结尾。"""
+
+_DECODER = json.JSONDecoder()
+"""用于从给定位置解析单个对象的解码器。"""
 
 class UnexpectedEncoding(Exception):
     """意外的编码格式，读取非``UTF-8`` ``UTF-8 with BOM`` ``UTF-16LE``格式文件时抛出。
@@ -31,199 +57,586 @@ class UnexpectedFileFormat(Exception):
         super().__init__(message)
 
 
-def check(target: str) -> list[str]:
+class JSONError(NamedTuple):
+    """``validate``所报告的文件错误。
+
+    Attributes:
+        path (str): 文件路径。
+        line (int): 错误所在行，从 1 开始。编码错误时为``0``。
+        column (int): 错误所在列，从 1 开始。编码错误时为``0``。
+        message (str): 错误信息。
+    """
+    path: str
+    line: int
+    column: int
+    message: str
+
+
+def check(target: str, workers: int|None=None) -> list[str]:
     """检查游戏``.json``文件。
 
     Args:
         target (str): 文件或目录路径。
+        workers (int, optional): 并行检查所用的进程数。默认为``None``，即逐个文件检查。
 
     Returns:
         list[str]: 包含错误的``.json``文件。
     """
     if os.path.isdir(target):
-        res = []
-        for root, _, files in os.walk(target):
-            for file in files:
-                res = res + check(os.path.join(root, file))
-        
-        return res
+        paths = list(_walk(target, onlyjson=False))
+        return [path for path, ok in zip(paths, _parallel(_checkfile, paths, workers)) if not ok]
+
+    return [] if _checkfile(target) else [target]
 
+
+def _checkfile(target: str) -> bool:
+    """检查单个文件，无错误时返回``True``。非``.json``文件总是返回``True``。"""
     if not target.endswith('.json'):
-        return []
+        return True
 
     try:
         read(target)
-        return []
+        return True
     except json.decoder.JSONDecodeError:
-        return [target]
+        return False
+
+
+def validate(target: str, workers: int|None=None) -> Iterator[JSONError]:
+    """快速检查``.json``文件的编码与 JSON 语法，不创建``BohData``对象。
+
+    Args:
+        target (str): 文件或目录路径。
+        workers (int, optional): 并行检查所用的进程数。默认为``None``，即逐个文件检查。
+
+    Yields:
+        JSONError: 每个存在错误的文件的错误信息，按目录遍历顺序产出。
+    """
+    paths = list(_walk(target)) if os.path.isdir(target) else [target]
+    for error in _parallel(_validatefile, paths, workers):
+        if error is not None:
+            yield error
+
+
+def _validatefile(target: str) -> JSONError|None:
+    """检查单个文件，无错误时返回``None``。"""
+    try:
+        json.loads(_readtext(target))
+    except UnexpectedEncoding as error:
+        return JSONError(target, 0, 0, str(error))
+    except json.decoder.JSONDecodeError as error:
+        return JSONError(target, error.lineno, error.colno, error.msg)
+    return None
 
 
-def read(target: str, objtype: BohObjType=BohObjType.UNKNOWN) -> BohData:
+def read(target: str, objtype: BohObjType=BohObjType.UNKNOWN, workers: int|None=None, cache: ParseCache|str|None=None,
+         stream: bool=False) -> BohData:
     """读取游戏文件并转化为``BohData``对象。
 
     Args:
         target (str): 文件或文件夹路径。
+        objtype (BohObjType, optional): 游戏对象类型。默认为``BohObjType.UNKNOWN``，即自动判断。
+        workers (int, optional): 并行解析所用的进程数。默认为``None``，即逐个文件解析。
+            结果与逐个解析完全相同，合并顺序总是与目录遍历顺序一致。
+        cache (ParseCache | str, optional): 解析缓存或缓存目录。默认为``None``，即不使用缓存。
+            未修改的文件将直接从缓存加载，其余文件解析后写入缓存，已删除的文件的条目会被删除。
+        stream (bool, optional): 是否以流式方式解析文件（见``iterobjs``）。默认为``False``。
+            适用于含有巨大文件的目录，峰值内存取决于最大的单个对象。
 
     Returns:
         BohData: 游戏数据。
     """
-    if os.path.isdir(target):
-        res = BohData({}, objtype)
-        for root, _, files in os.walk(target):
-            for file in files:
-                if file.endswith('.json'):
-                    res = res + read(os.path.join(root, file), objtype)
-        
-        return res
-    
-    # 尝试打开文件
-    encodings = ['utf-8', 'utf-8-sig', 'utf-16-le']  # A·K 常用编码
-    content = ''
-    for encoding in encodings:
+    if isinstance(cache, str):
+        cache = ParseCache(cache)
+
+    stamp = None
+    if cache is not None and os.path.isdir(target):
+        # 目录的校验信息包含各文件的校验信息，只需计算一次
+        stamp = cache.stamp(target)
+        res = cache.get(target, objtype, stamp)
+        if res is not None:
+            return res
+
+    files, parsed = readfiles(target, objtype, workers, cache, stream, stamp)
+    if not os.path.isdir(target):
+        if cache is not None and parsed:
+            cache.prune()
+        return files[target]
+
+    res = BohData({}, objtype)
+    with profiling.phase('read.merge', target):
+        for data in files.values():
+            res.merge(data)
+
+    if cache is not None:
+        # 有文件变化时只记录校验信息，目录的数据在下次所有文件均命中时再写入
+        cache.put(target, None if parsed else res, objtype, stamp)
+        cache.prune()
+
+    return res
+
+
+def readfiles(target: str, objtype: BohObjType=BohObjType.UNKNOWN, workers: int|None=None,
+              cache: ParseCache|str|None=None, stream: bool=False, stamp: tuple|None=None) -> tuple[dict[str, BohData], list[str]]:
+    """逐个读取游戏文件，不合并。
+
+    参数与``read``相同，但不读取或写入目录自身的缓存条目，也不调用``ParseCache.prune``。
+
+    Args:
+        target (str): 文件或文件夹路径。
+        objtype (BohObjType, optional): 游戏对象类型。默认为``BohObjType.UNKNOWN``，即自动判断。
+        workers (int, optional): 并行解析所用的进程数。默认为``None``，即逐个文件解析。
+        cache (ParseCache | str, optional): 解析缓存或缓存目录。默认为``None``，即不使用缓存。
+        stream (bool, optional): 是否以流式方式解析文件。默认为``False``。
+        stamp (tuple, optional): 已计算的文件或目录校验信息（见``ParseCache.stamp``）。默认为``None``，即在解析前计算。
+
+    Returns:
+        tuple[dict[str, BohData], list[str]]: ``(files, parsed)``：\n
+            - files: 按目录遍历顺序排列的文件路径到该文件游戏数据的映射表。\n
+            - parsed: 未命中缓存而重新解析的文件。
+    """
+    if isinstance(cache, str):
+        cache = ParseCache(cache)
+
+    # 校验信息在解析前计算，get 与 put 使用同一份，解析期间文件再次修改时下次读取不会命中旧数据
+    if cache is not None and os.path.isdir(target):
+        if stamp is None:
+            stamp = cache.stamp(target)
+        stamps = dict(stamp)
+        paths = list(stamps)
+        cache.sweep(target, paths, objtype)
+    elif cache is not None:
+        stamps = {target: cache.stamp(target) if stamp is None else stamp}
+        paths = [target]
+    else:
+        paths = list(_walk(target)) if os.path.isdir(target) else [target]
+        stamps = {}
+
+    datas = [None] * len(paths)
+    if cache is not None:
+        datas = [cache.get(path, objtype, stamps.get(path)) for path in paths]
+
+    # 解析未命中缓存的文件
+    misses = [index for index, data in enumerate(datas) if data is None]
+    readfile = _streamfile if stream else _readfile
+    with profiling.phase('read.parse', target):
+        for index, data in zip(misses, _parallel(readfile, [paths[index] for index in misses], workers, objtype)):
+            datas[index] = data
+            if cache is not None:
+                cache.put(paths[index], data, objtype, stamps.get(paths[index]))
+
+    return dict(zip(paths, datas)), [paths[index] for index in misses]
+
+
+def _readfile(target: str, objtype: BohObjType=BohObjType.UNKNOWN) -> BohData:
+    """读取单个游戏文件。"""
+    with profiling.phase('read.file', target):
+        data = BohData(_loads(target, _readtext(target)), objtype)
+        data.file = os.path.basename(target)
+    profiling.count('files')
+    return data
+
+
+def _streamfile(target: str, objtype: BohObjType=BohObjType.UNKNOWN) -> BohData:
+    """以流式方式读取单个游戏文件。"""
+    with profiling.phase('read.file', target):
+        data = BohData({}, objtype)
+        try:
+            for root, objs in _stream(target):
+                if root in data:
+                    # 根分类重复时与 json.loads 相同，只保留最后一个数组
+                    data[root] = []
+                    data.rebuild()
+                data._load(root, objs, objtype)
+        except json.decoder.JSONDecodeError:
+            raise
+        except Exception:
+            # 对象在整个文件解析完成前就已转化，转化失败时完整解析，使结果与报错均与 read 相同：
+            # 文件可能同时含有 JSON 语法错误，或出错的根数组被之后的同名根分类覆盖
+            data = BohData(_loads(target, _readtext(target)), objtype)
+        data.file = os.path.basename(target)
+    profiling.count('files')
+    return data
+
+
+def _readtext(target: str) -> str:
+    """以 A·K 常用编码读取文件文本，编码由文件开头判断，只解码一次，并移除 BOM 字符。"""
+    with profiling.phase('read.io', target):
+        with open(target, 'rb') as file:
+            content = file.read()
+    profiling.count('bytes', len(content), target)
+
+    with profiling.phase('read.decode', target):
+        encoding, bom = sniff(content[:4])
+        profiling.count(f'encoding.{encoding}{"-bom" if bom else ""}')
         try:
-            with open(target, 'r', encoding=encoding) as file:
-                content = file.read()
-                break
+            text = content[bom:].decode(encoding)
         except UnicodeDecodeError:
-            continue
+            text = ''
 
-    if content == '':
+    if text == '':
         # 打开文件失败
         raise UnexpectedEncoding(f'"{target}" is not encoded in UTF-8, UTF-8 with BOM, or UTF-16LE.')
 
-    # 移除 BOM 字符
-    if content.startswith('\ufeff'):
-        content = content[1:]
+    return text
+
 
-    # 加载文件
+def sniff(head: bytes) -> tuple[str, int]:
+    """根据文件开头的字节判断 A·K 常用编码（``UTF-8`` ``UTF-8 with BOM`` ``UTF-16LE``）。
+
+    Args:
+        head (bytes): 文件开头的至少 2 个字节。
+
+    Returns:
+        tuple[str, int]: ``(编码, BOM 字节数)``。
+    """
+    if head.startswith(b'\xef\xbb\xbf'):
+        return 'utf-8', 3
+    if head.startswith(b'\xff\xfe'):
+        return 'utf-16-le', 2
+    if len(head) >= 2 and head[0] != 0 and head[1] == 0:   # 无 BOM 的 UTF-16LE，ASCII 字符的高位字节为 0
+        return 'utf-16-le', 0
+    return 'utf-8', 0
+
+
+def iterobjs(target: str, chunksize: int=1 << 16) -> Iterator[tuple[str, dict]]:
+    """逐个产出游戏文件根数组中的原始游戏对象，不将整个文件读入内存。
+
+    文件按块读取并增量解码，内存占用取决于最大的单个对象，而非文件大小。含有多个根分类时，按顺序产出所有根分类的对象。
+    不是``{"<根分类>": [...], ...}``格式的文件将被完整读取后解析。
+
+    Args:
+        target (str): 文件路径。
+        chunksize (int, optional): 每次读取的字节数。默认为``65536``。
+
+    Yields:
+        tuple[str, dict]: ``(根分类, 原始游戏对象)``。
+
+    Raises:
+        UnexpectedEncoding: 文件编码不是 A·K 常用编码。
+        json.decoder.JSONDecodeError: 文件含有 JSON 语法错误。
+    """
+    for root, objs in _stream(target, chunksize):
+        for obj in objs:
+            yield root, obj
+
+
+def _stream(target: str, chunksize: int=1 << 16) -> Iterator[tuple[str, Iterator[dict]]]:
+    """按文件中的顺序产出``(根分类, 逐个产出该根分类原始游戏对象的迭代器)``。
+
+    迭代器与文件共享读取位置，取得下一个根分类时，上一个迭代器中未取得的对象将被跳过。
+    """
+    with open(target, 'rb') as file:
+        head = file.read(4)
+        encoding, bom = sniff(head)
+        decoder = codecs.getincrementaldecoder(encoding)()
+        eof = False
+
+        def more(buffer: str, size: int) -> str:
+            """读取``size``字节（``-1``为全部）并追加到``buffer``，读至文件末尾时设置``eof``。"""
+            nonlocal eof
+            chunk = file.read(size)
+            eof = size < 0 or len(chunk) < size
+            try:
+                return buffer + decoder.decode(chunk, final=eof)
+            except UnicodeDecodeError as error:
+                raise UnexpectedEncoding(f'"{target}" is not encoded in UTF-8, UTF-8 with BOM, or UTF-16LE.') from error
+
+        buffer = decoder.decode(head[bom:])
+        match = _HEAD.match(buffer)
+        while match is None and not eof:
+            buffer = more(buffer, chunksize)
+            match = _HEAD.match(buffer)
+
+        if match is None:
+            # 非常规格式，完整读取
+            if buffer == '':
+                raise UnexpectedEncoding(f'"{target}" is not encoded in UTF-8, UTF-8 with BOM, or UTF-16LE.')
+            for root, objs in _loads(target, buffer).items():
+                yield root, iter(objs)
+            return
+
+        def fallback() -> dict:
+            """完整解析文件。文件含有语法错误时，报错中的位置与``read``相同。"""
+            return _loads(target, _readtext(target))
+
+        pos = match.end()
+
+        def objs() -> Iterator[dict]:
+            """逐个产出当前根数组中的对象，直至根数组结束。"""
+            nonlocal buffer, pos
+            size = chunksize
+            delimited = True    # 下一个值可以是对象，即位于'['或','之后
+            closable = True     # 下一个值可以是']'，即位于'['或对象之后
+            while True:
+                if delimited:
+                    pos = _WS.match(buffer, pos).end()
+                else:
+                    match = _COMMA.match(buffer, pos)
+                    pos = match.end()
+                    if match.group(1) is not None:
+                        delimited, closable = True, False
+                if pos == len(buffer):
+                    if eof:
+                        fallback()
+                        raise _locate(target, json.decoder.JSONDecodeError('Expecting value', buffer, pos))
+                    buffer = more('', chunksize)
+                    pos = 0
+                    continue
+                if buffer[pos] == ']' and closable:
+                    pos = pos + 1
+                    return
+                if not delimited:
+                    fallback()
+                    raise _locate(target, json.decoder.JSONDecodeError("Expecting ',' delimiter", buffer, pos))
+
+                try:
+                    obj, end = _DECODER.raw_decode(buffer, pos)
+                    if end == len(buffer) and not eof and not isinstance(obj, (dict, list)):
+                        raise json.decoder.JSONDecodeError('Incomplete value', buffer, pos)  # 标量可能被截断
+                except json.decoder.JSONDecodeError as error:
+                    if eof:
+                        fallback()
+                        raise _locate(target, error) from error
+                    # 对象不完整，读取更多内容后重试；每次加倍读取量，使重试的总开销为线性
+                    buffer = more(buffer[pos:], size)
+                    size = size * 2
+                    pos = 0
+                    continue
+
+                size = chunksize
+                yield obj
+                pos = end
+                delimited, closable = False, True
+
+        count = 0   # 已产出的根分类数
+        while match is not None:
+            current = objs()
+            yield json.loads(match.group(1)), current
+            count = count + 1
+            for _ in current:
+                pass
+
+            # 根数组之后是下一个根分类，或是对象的结尾
+            size = chunksize
+            match = _NEXT.match(buffer, pos)
+            while match is None and not eof:
+                buffer = more(buffer[pos:], size)
+                size = size * 2
+                pos = 0
+                match = _NEXT.match(buffer)
+            if match is not None:
+                pos = match.end()
+            elif _END.fullmatch(buffer, pos) is None:
+                # 含有其他内容，如值不是数组的根分类：与 read 相同，按完整解析的结果产出其余根分类
+                for root, objs in list(fallback().items())[count:]:
+                    yield root, iter(objs)
+
+
+def _loads(target: str, content: str) -> dict:
+    """解析 JSON 文本，出错时在报错中指出文件。"""
     try:
-        data = BohData(json.loads(content), objtype)
-        data.file = os.path.basename(target)
+        with profiling.phase('read.json', target):
+            return json.loads(content)
     except json.decoder.JSONDecodeError as error:
-        raise json.decoder.JSONDecodeError(
-            f'{error.msg}\n加载"{target}"时出错。\n提示：检查 A·K 的 .json 文件，其可能含有错误。\n位置', 
-            error.doc, 
-            error.pos
-        ) from error
+        raise _locate(target, error) from error
+
+
+def _locate(target: str, error: json.decoder.JSONDecodeError) -> json.decoder.JSONDecodeError:
+    """在 JSON 报错中指出文件。"""
+    return json.decoder.JSONDecodeError(
+        f'{error.msg}\n加载"{target}"时出错。\n提示：检查 A·K 的 .json 文件，其可能含有错误。\n位置', 
+        error.doc, 
+        error.pos
+    )
 
-    return data
 
+def _walk(target: str, onlyjson: bool=True) -> Iterator[str]:
+    """按``os.walk``的顺序遍历目录下的文件路径。"""
+    for root, _, files in os.walk(target):
+        for file in files:
+            if not onlyjson or file.endswith('.json'):
+                yield os.path.join(root, file)
 
-def pack(dir: str) -> None:
+
+def _parallel(func: Callable, paths: list[str], workers: int|None, *args) -> Iterator:
+    """对每个路径调用``func``，按``paths``的顺序产出结果。``workers``大于 1 时使用进程池。"""
+    if workers is None or workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield func(path, *args)
+        return
+
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(func, paths, *[repeat(arg) for arg in args], chunksize=chunksize)
+
+
+def tocsv(target: str, dir: str='./', translation: BohData|None=None) -> None:
+    """将游戏文件目录逐个文件输出为用于``paratranz.cn``的``.csv``文件，保持目录结构。
+
+    每次只加载一个游戏文件，内存占用不随目录大小增长。
+
+    Args:
+        target (str): 游戏文件目录，如``core/``。
+        dir (str, optional): 输出路径。默认为``'./'``。
+        translation (BohData, optional): 已有的翻译数据，用于填写译文列。默认为``None``。
+    """
+    for path in _walk(target):
+        outputdir = os.path.join(dir, os.path.relpath(os.path.dirname(path), target))
+        data = read(path, BohObjType.META)
+        with profiling.phase('tocsv.file', path):
+            data.tocsv(outputdir, translation)
+
+
+def pack(dir: str, output: str='./output/', workers: int|None=None) -> None:
     """打包``paratranz.cn``数据。
 
+    ``core``目录只解析一次，各翻译文件所对应的游戏原文件直接取自这次解析的结果。
+    翻译文件的处理结果按目录遍历顺序输出与写入，与逐个处理相同。
+
     Args:
         dir (str): 文件目录，应有以下结构：\n
             dir\n
             ├── core\n
             └── raw\n
+        output (str, optional): 输出路径。默认为``'./output/'``。
+        workers (int, optional): 并行解析``core``目录与处理翻译文件所用的进程数。默认为``None``，即逐个文件处理。
+            各子进程在启动时接收一次``core``的 ID 索引（``_packindex``），之后每个翻译文件只传递路径。
+            进程池的子进程在 Windows 与 macOS 上会重新导入调用方的主模块，脚本中应在``if __name__ == '__main__':``之下调用。
     """
-    def islist(obj: dict) -> bool:
-        """检测字典是否为可以转化为列表。（键为从``'0'``开始的连续数字字符串）"""
-        # 检查是否都为数字
-        if not all(key.isdigit() for key in obj.keys()):
-            return False
-
-        keys = sorted(obj, key=int) # 排序
-        return all(str(i) == keys[i] for i in range(len(keys)))
-    
-    def tolist(obj: dict) -> list|dict:
-        """转化可以转化为列表的字典和其子字典。"""
-        # 处理子字典
-        for key, value in obj.items():
-            if isinstance(value, dict):
-                obj[key] = tolist(value)
-
-        if not islist(obj):
-            return obj
-
-        res = []
-        key = '0'
-        while obj.get(key) is not None:
-            res.append(obj[key])
-            key = str(int(key) + 1)
-
-        return res
-    
-    def prase(output: dict, key: str, translation: str) -> None:
-        """将``translation``解析到``output``。"""
-        if '||' not in key:
-            # 解析到最后一个迭代
-            output[key] = translation
-            return
-        
-        current_key = key.split('||')[0]    # 本层迭代需要操作的键
-        if output.get(current_key) is None:
-            output[current_key] = {}
+    # 读取游戏原文件，并保留各文件的对象 ID
+    coredir = os.path.join(dir, 'core/')
+    corepaths = list(_walk(coredir))
+    alldata = BohData({})
+    sources = {}
+    with profiling.phase('pack.core', coredir):
+        for path, data in zip(corepaths, _parallel(_readfile, corepaths, workers)):
+            alldata.merge(data)
+            sources[os.path.relpath(path, coredir)] = [getid(obj) for objs in data.values() for obj in objs]
+
+    rawdir = os.path.join(dir, 'raw/')
+    rawpaths = list(_walk(rawdir, onlyjson=False))
+    index = _packindex(alldata, rawdir, sources)
+    if workers is None or workers <= 1 or len(rawpaths) <= 1:
+        for path in rawpaths:
+            _writepacked(output, *_packfile(path, index))
+        return
+
+    chunksize = max(1, len(rawpaths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_packinit, initargs=(index,)) as executor:
+        for result in executor.map(_packworker, rawpaths, chunksize=chunksize):
+            _writepacked(output, *result)
+
+
+class _PackIndex(NamedTuple):
+    """处理翻译文件所需的``core``信息，不含对象内容，以便传递给子进程。
+
+    Attributes:
+        rawdir (str): 翻译文件目录。
+        objs (dict[str, tuple[str, dict[str, list]]]): 映射表中的 ID 到``(根分类, {属性: 含 ID 子对象的列表})``的映射表，
+            属性为``slots``与``preslots``。
+        repeats (set[str]): ID 重复的对象 ID。
+        sources (dict[str, list[str]]): 游戏原文件相对路径到其中对象 ID 的映射表，按文件中的顺序排列。
+    """
+    rawdir: str
+    objs: dict[str, tuple[str, dict[str, list]]]
+    repeats: set[str]
+    sources: dict[str, list[str]]
+
+
+_PACK_ATTRS = ('slots', 'preslots')
+"""存在无序含 ID 子对象的属性。"""
+
+_PACK_INDEX: _PackIndex|None = None
+"""子进程中由``_packinit``设置的``core``信息。"""
+
+def _packindex(alldata: BohData, rawdir: str, sources: dict[str, list[str]]) -> _PackIndex:
+    """创建``_packfile``所用的``core``信息。"""
+    objs = {id: (obj.root, {attr: obj[attr] for attr in _PACK_ATTRS if attr in obj}) for id, obj in alldata.map.items()}
+    return _PackIndex(rawdir, objs, set(alldata.repeats), sources)
+
+
+def _packinit(index: _PackIndex) -> None:
+    """进程池子进程的初始化函数，保存``core``信息。"""
+    global _PACK_INDEX
+    _PACK_INDEX = index
 
-        prase(output[current_key], key.split('||', 1)[1], translation)
 
+def _packworker(path: str) -> tuple[str, str, list[str]]:
+    """在子进程中处理单个翻译文件。"""
+    return _packfile(path, _PACK_INDEX)
+
+
+def _packfile(path: str, index: _PackIndex) -> tuple[str, str, list[str]]:
+    """处理单个翻译文件，返回``(相对路径, 输出内容, 报错信息)``。"""
     def addid(attr: str, obj: dict) -> None:
-        for index, item in enumerate(obj[attr]):
-            item['id'] = alldata.map[getid(obj)][attr][index]['id']
-
-    alldata = read(os.path.join(dir, 'core/'))
-    for root, _, files in os.walk(os.path.join(dir, 'raw/')):
-        for fname in files:
-            # 加载翻译文件
-            path = os.path.join(root, fname)
-            with open(path,'r', encoding='utf-8') as file:
-                entries = json.load(file)
-
-            # 解析翻译文件
-            translations = {}    # 解析后的翻译文件，是 ID-obj map。
-            for entry in entries:
-                prase(translations, entry['key'], entry['translation'])
-
-            # 转化列表
-            translations = tolist(translations)
-
-            # 添加 ID
-            attrs = ['slots', 'preslots']   # 存在无序含 ID 子对象的属性
-            for id, obj in translations.items():
-                obj['id'] = id
-                if alldata.map.get(id) is None: # 无法确定原对象的翻译文件无法根据原对象赋予 ID
-                    continue
+        for position, item in enumerate(obj[attr]):
+            item['id'] = index.objs[getid(obj)][1][attr][position]['id']
+
+    # 加载翻译文件
+    with profiling.phase('pack.load', path):
+        with open(path,'r', encoding='utf-8') as file:
+            entries = json.load(file)
+    profiling.count('pack.entries', len(entries), path)
+
+    # 解析翻译文件
+    with profiling.phase('pack.buildtree', path):
+        translations = buildtree(entries)    # 解析后的翻译文件，是 ID-obj map。
+
+    # 添加 ID
+    for id, obj in translations.items():
+        obj['id'] = id
+        if index.objs.get(id) is None: # 无法确定原对象的翻译文件无法根据原对象赋予 ID
+            continue
 
-                for attr in attrs:
-                    if obj.get(attr) is not None:
-                        addid(attr, obj)
-
-            # 替换有大小写之分的 ID 键
-            replaceids = [id for id in translations.keys() if id.lower()!= id]
-            for id in replaceids:
-                translations[id.lower()] = translations[id]
-                del translations[id]
-
-            # 读取对应游戏原文件
-            relpath = os.path.relpath(path, os.path.join(dir, 'raw/')).replace('.csv', '')
-            source = os.path.join(dir, 'core/', relpath)
-            source_objs = list(read(source).items())[0][1]
-
-            # 创建翻译文件的 BohData 对象
-            outputdata = BohData({})
-            outputdata.file = fname.replace('.csv', '')
-            for obj in source_objs:
-                id = getid(obj)
-                if translations.get(id) is None or alldata.map.get(id) is None:
-                    continue
+        for attr in _PACK_ATTRS:
+            if obj.get(attr) is not None:
+                addid(attr, obj)
+
+    # 替换有大小写之分的 ID 键
+    replaceids = [id for id in translations.keys() if id.lower()!= id]
+    for id in replaceids:
+        translations[id.lower()] = translations[id]
+        del translations[id]
+
+    # 取得对应游戏原文件的对象
+    relpath = os.path.relpath(path, index.rawdir).replace('.csv', '')
+    if relpath not in index.sources:
+        raise FileNotFoundError(f'翻译文件"{path}"对应的游戏原文件不存在：{relpath}')
+
+    # 创建翻译文件的 BohData 对象
+    outputdata = BohData({})
+    outputdata.file = os.path.basename(path).replace('.csv', '')
+    for id in index.sources[relpath]:
+        if translations.get(id) is None or index.objs.get(id) is None:
+            continue
+
+        adding_obj = BohObj(translations[id])
+        adding_obj.root = index.objs[id][0]
+        outputdata.append(adding_obj)
+
+    # 报错
+    messages = []
+    for id, obj in translations.items():
+        if index.objs.get(id) is None:
+            if id in index.repeats:
+                messages.append(f'于"{path}"的对象"{id}"存在 ID 重复的对象。')
+            else:
+                messages.append(f'于"{path}"的对象"{id}"不存在。')
+
+    return relpath, json.dumps(outputdata, ensure_ascii=False), messages
+
+
+def _writepacked(output: str, relpath: str, content: str, messages: list[str]) -> None:
+    """输出``_packfile``的处理结果。"""
+    for message in messages:
+        print(message)
+
+    # 计算输出文件路径
+    outputpath = os.path.join(output, relpath)
+
+    # 写入文件
+    with profiling.phase('pack.write', outputpath):
+        os.makedirs(os.path.dirname(outputpath), exist_ok=True)
+        with open(outputpath, 'w', encoding='utf-8') as file:
+            file.write(content)
 
-                adding_obj = BohObj(translations[id])
-                adding_obj.root = alldata.map[id].root
-                outputdata.append(adding_obj)
-
-            # 报错
-            for id, obj in translations.items():
-                if alldata.map.get(id) is None:
-                    if alldata.repeats.get(id) is not None:
-                        print(f'于"{path}"的对象"{id}"存在 ID 重复的对象。')
-                    else:
-                        print(f'于"{path}"的对象"{id}"不存在。')
-
-            # 计算输出文件路径
-            outputpath = os.path.join('./output/', relpath)
-            
-            # 写入文件
-            os.makedirs(os.path.dirname(outputpath), exist_ok=True)
-            with open(outputpath, 'w', encoding='utf-8') as file:
-                file.write(json.dumps(outputdata, ensure_ascii=False))
\ No newline at end of file
@@ -0,0 +1,165 @@
+#-*-coding:utf-8-*-
+"""引用图模块。
+
+    此模块包含了一个类，用于记录游戏对象之间通过 ID 的相互引用。
+"""
+from typing import Any, Iterable
+
+from bohdata.bohobj import BohObj
+
+REF_KEYS = {
+    'inherits': 'value',    # 继承的对象
+    'decayto': 'value',     # 衰变为的元素
+    'xtriggers': 'both',    # 键为触发的性相，值为转变为的元素或含 ID 的对象
+    'effects': 'key',       # 效果产生的元素
+    'reqs': 'key',          # 需求的性相或元素
+    'linked': 'value',      # 链接的配方
+    'spec': 'value',        # 牌组中的卡牌
+    'defaultcard': 'value', # 牌组的默认卡牌
+    'deckeffects': 'key',   # 抽取的牌组
+}
+"""含有引用的属性，及其引用位于键（``'key'``）、值（``'value'``）或两者（``'both'``）。"""
+
+class RefGraph:
+    """游戏对象的 ID 引用图，以邻接表存储，可双向查询。
+
+    ``REF_KEYS``中的属性在对象的任意层级出现时都会被记录。ID 均为小写，含``[``的表达式会被忽略。
+
+    Attributes:
+        forward (dict[str, dict[str, set[str]]]): 对象 ID 到其引用的 ID，及引用所在属性的映射表。
+        reverse (dict[str, set[str]]): 被引用的 ID 到引用它的对象 ID 的映射表。
+        ids (set[str]): 图中所有对象的 ID。
+    """
+    def __init__(self, objs: Iterable[BohObj]=()):
+        self.forward = {}
+        self.reverse = {}
+        self.ids = set()
+        for obj in objs:
+            self.add(obj)
+
+    def add(self, obj: BohObj) -> None:
+        """将游戏对象的引用加入图中。ID 重复的对象的引用会被合并。
+
+        Args:
+            obj (BohObj): 游戏对象。
+        """
+        self.ids.add(obj.id)
+        targets = self.forward.setdefault(obj.id, {})
+        for field, target in _refs(obj):
+            targets.setdefault(target, set()).add(field)
+            self.reverse.setdefault(target, set()).add(obj.id)
+
+    def refs(self, id: str, field: str|None=None) -> set[str]:
+        """查询对象引用的 ID。
+
+        Args:
+            id (str): 对象 ID。
+            field (str, optional): 只查询该属性中的引用。默认为``None``，即所有属性。
+
+        Returns:
+            set[str]: 被引用的 ID。
+        """
+        targets = self.forward.get(id.lower(), {})
+        return {target for target, fields in targets.items() if field is None or field in fields}
+
+    def referrers(self, id: str) -> set[str]:
+        """查询引用了给定 ID 的对象。
+
+        Args:
+            id (str): 被引用的 ID。
+
+        Returns:
+            set[str]: 对象 ID。
+        """
+        return set(self.reverse.get(id.lower(), ()))
+
+    def closure(self, id: str, field: str|None=None) -> list[str]:
+        """查询对象直接或间接引用的所有 ID，按广度优先顺序排列，不含自身。可处理循环引用。
+
+        Args:
+            id (str): 对象 ID。
+            field (str, optional): 只沿该属性中的引用查询。默认为``None``，即所有属性。
+
+        Returns:
+            list[str]: 被引用的 ID。
+        """
+        id = id.lower()
+        res = []
+        visited = {id}
+        queue = [id]
+        while queue:
+            next_queue = []
+            for current in queue:
+                for target in sorted(self.refs(current, field)):
+                    if target not in visited:
+                        visited.add(target)
+                        res.append(target)
+                        next_queue.append(target)
+            queue = next_queue
+        return res
+
+    def ancestors(self, id: str) -> list[str]:
+        """查询对象的继承链，由近及远。
+
+        Args:
+            id (str): 对象 ID。
+
+        Returns:
+            list[str]: 直接或间接继承的对象 ID。
+        """
+        return self.closure(id, 'inherits')
+
+    def dangling(self) -> dict[str, set[str]]:
+        """查询指向不存在对象的引用。
+
+        Returns:
+            dict[str, set[str]]: 对象 ID 到其引用的不存在的 ID 的映射表。
+        """
+        res = {}
+        for id, targets in self.forward.items():
+            missing = {target for target in targets if target not in self.ids}
+            if missing:
+                res[id] = missing
+        return res
+
+
+def _refs(value: Any) -> Iterable[tuple[str, str]]:
+    """遍历``value``中的所有``(属性, 被引用的 ID)``。"""
+    if isinstance(value, dict):
+        for key, subvalue in value.items():
+            if key in REF_KEYS:
+                yield from _fieldrefs(key, subvalue)
+            else:
+                yield from _refs(subvalue)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _refs(item)
+
+
+def _fieldrefs(field: str, value: Any) -> Iterable[tuple[str, str]]:
+    """遍历引用属性``field``的值``value``中的所有``(属性, 被引用的 ID)``。"""
+    mode = REF_KEYS[field]
+    if isinstance(value, dict) and mode in {'key', 'both'}:
+        for key, subvalue in value.items():
+            yield from _id(field, key)
+            if mode == 'both':
+                yield from _values(field, subvalue)
+    elif mode == 'value':
+        yield from _values(field, value)
+
+
+def _values(field: str, value: Any) -> Iterable[tuple[str, str]]:
+    """遍历值中的 ID：字符串本身、列表成员或含 ID 对象的 ID。"""
+    if isinstance(value, list):
+        for item in value:
+            yield from _values(field, item)
+    elif isinstance(value, dict):
+        yield from _id(field, value.get('id') or value.get('ID'))
+    else:
+        yield from _id(field, value)
+
+
+def _id(field: str, value: Any) -> Iterable[tuple[str, str]]:
+    """若``value``是 ID，产出``(field, 小写 ID)``。"""
+    if isinstance(value, str) and value and '[' not in value:
+        yield field, value.lower()
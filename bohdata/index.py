@@ -0,0 +1,94 @@
+#-*-coding:utf-8-*-
+"""路径索引模块。
+
+    此模块包含了一个类，用于按属性路径与值快速查找游戏对象。
+"""
+from typing import Any, Iterable
+
+from bohdata.bohobj import BohObj
+
+class PathIndex:
+    """游戏对象的属性路径倒排索引。
+
+    路径由字典的键以``.``连接而成，列表不占路径层级。例如：\n
+        - 元素``{'aspects': {'lantern': 2}}``拥有路径``aspects``与``aspects.lantern``，后者的值为``2``。\n
+        - 配方``{'slots': [{'id': 'a', 'required': {'x': 1}}]}``拥有路径``slots.id``（值为``'a'``）与``slots.required.x``。\n
+    列表中的标量值会被分别记录，如``{'spec': ['a', 'b']}``的``spec``路径拥有值``'a'``与``'b'``。
+
+    与 ID 一致，路径与字符串值均不区分大小写。所有查询都只访问索引中的对应条目，不扫描全部对象。
+
+    Attributes:
+        paths (dict[tuple[str, str], set[str]]): ``(根分类, 路径)``到拥有该路径的对象 ID 的映射表。
+        values (dict[tuple[str, str, Any], set[str]]): ``(根分类, 路径, 值)``到对象 ID 的映射表。
+    """
+    def __init__(self, objs: Iterable[BohObj]=()):
+        self.paths = {}
+        self.values = {}
+        for obj in objs:
+            self.add(obj)
+
+    def add(self, obj: BohObj) -> None:
+        """将游戏对象加入索引。
+
+        Args:
+            obj (BohObj): 游戏对象。
+        """
+        self._add(obj.root, obj.id, obj, '')
+
+    def having(self, root: str, path: str) -> set[str]:
+        """查询拥有给定路径的对象。
+
+        Args:
+            root (str): 根分类，如``'elements'``。
+            path (str): 属性路径，如``'aspects.lantern'``。
+
+        Returns:
+            set[str]: 对象 ID。
+        """
+        return set(self.paths.get((root, path.lower()), ()))
+
+    def where(self, root: str, path: str, value: Any) -> set[str]:
+        """查询给定路径的值（或列表中的某一值）等于``value``的对象。
+
+        Args:
+            root (str): 根分类。
+            path (str): 属性路径，如``'decayto'``。
+            value (Any): 值，须为字符串、数字、布尔值或``None``。
+
+        Returns:
+            set[str]: 对象 ID。
+        """
+        if isinstance(value, str):
+            value = value.lower()
+        return set(self.values.get((root, path.lower(), value), ()))
+
+    def mentions(self, root: str, path: str, id: str) -> set[str]:
+        """查询给定路径下以``id``为键或值的对象，不区分大小写。
+
+        如``mentions('recipes', 'reqs', 'lantern')``查询``reqs``中需要``lantern``的配方。
+
+        Args:
+            root (str): 根分类。
+            path (str): 属性路径。
+            id (str): 被提及的 ID。
+
+        Returns:
+            set[str]: 对象 ID。
+        """
+        id = id.lower()
+        return self.having(root, f'{path}.{id}') | self.where(root, path, id)
+
+    def _add(self, root: str, id: str, value: Any, path: str) -> None:
+        """递归记录``value``中的所有路径与值。"""
+        if isinstance(value, dict):
+            for key, subvalue in value.items():
+                subpath = f'{path}.{key.lower()}' if path else key.lower()
+                self.paths.setdefault((root, subpath), set()).add(id)
+                self._add(root, id, subvalue, subpath)
+        elif isinstance(value, list):
+            for item in value:
+                self._add(root, id, item, path)
+        elif path:
+            if isinstance(value, str):
+                value = value.lower()
+            self.values.setdefault((root, path, value), set()).add(id)
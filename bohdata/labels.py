@@ -0,0 +1,87 @@
+#-*-coding:utf-8-*-
+"""名称表导出模块。
+
+    此模块用于将游戏对象的 ID 与名称导出为 Lua 模块、JSON 或 TSV 格式的名称表。
+"""
+import json
+from typing import Callable, Iterable, Iterator
+
+from bohdata.bohobj import BohObj, UNNAMED
+
+class InvalidLabelsFormat(Exception):
+    """无效的名称表格式。传入``LABELS_FORMATS``以外的格式时抛出。
+
+    Args:
+        message (str): 可读的报错文本。
+    """
+    def __init__(self, message):
+        super().__init__(message)
+
+
+_LUA_ESCAPES = str.maketrans({'\\': '\\\\', '\n': '\\n', '\r': '\\r', '\'': '\\\''})
+"""Lua 单引号字符串中需转义的字符。"""
+
+_TSV_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+"""TSV 字段中需转义的字符。"""
+
+def _lua(rows: Iterator[tuple[str, str]]) -> Iterator[str]:
+    yield 'local DATA = {\n'
+    sep = ''
+    for id, label in rows:
+        yield f'{sep}    [\'{id.translate(_LUA_ESCAPES)}\'] = \'{label.translate(_LUA_ESCAPES)}\''
+        sep = ',\n'
+    yield '\n}\n\nreturn DATA'
+
+
+def _json(rows: Iterator[tuple[str, str]]) -> Iterator[str]:
+    yield '{'
+    sep = '\n'
+    for id, label in rows:
+        yield f'{sep}\t{json.dumps(id, ensure_ascii=False)}: {json.dumps(label, ensure_ascii=False)}'
+        sep = ',\n'
+    yield '\n}' if sep != '\n' else '}'
+
+
+def _tsv(rows: Iterator[tuple[str, str]]) -> Iterator[str]:
+    for id, label in rows:
+        yield f'{id.translate(_TSV_ESCAPES)}\t{label.translate(_TSV_ESCAPES)}\n'
+
+
+LABELS_FORMATS: dict[str, Callable[[Iterator[tuple[str, str]]], Iterator[str]]] = {'lua': _lua, 'json': _json, 'tsv': _tsv}
+"""名称表格式到逐段产出文件内容的函数的映射表。"""
+
+def labelrows(objs: Iterable[BohObj]) -> Iterator[tuple[str, str]]:
+    """按 ID 排序产出名称表的行，跳过没有名称（``UNNAMED``）的对象。
+
+    Args:
+        objs (Iterable[BohObj]): 游戏对象。
+
+    Yields:
+        tuple[str, str]: ``(原始 ID, 名称)``。
+    """
+    for obj in sorted(objs, key=lambda obj: obj.id):
+        if obj.label != UNNAMED:
+            yield obj.origin_id, obj.label
+
+
+def tolabels(objs: Iterable[BohObj], path: str, format: str='lua') -> None:
+    """将游戏对象的名称表逐行写入文件，每个字符串只转义一次。
+
+    各格式的内容如下：\n
+        - ``'lua'``：返回``DATA``表的 Lua 模块，如``['id'] = 'label'``，用于``boh.huijiwiki.com``的[[模块:LabelsTable]]。\n
+        - ``'json'``：以原始 ID 为键、名称为值的 JSON 对象。\n
+        - ``'tsv'``：每行为``原始 ID<Tab>名称``，没有表头，``\\``、制表符与换行以反斜杠转义。
+
+    Args:
+        objs (Iterable[BohObj]): 游戏对象，通常为``BohData.map.values()``。
+        path (str): 输出文件路径。
+        format (str, optional): 名称表格式，须为``LABELS_FORMATS``之一。默认为``'lua'``。
+
+    Raises:
+        InvalidLabelsFormat: ``format``不是``LABELS_FORMATS``之一。
+    """
+    if format not in LABELS_FORMATS:
+        raise InvalidLabelsFormat(f'错误的名称表格式：{format}')
+
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        file.writelines(LABELS_FORMATS[format](labelrows(objs)))
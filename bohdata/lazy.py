@@ -0,0 +1,231 @@
+#-*-coding:utf-8-*-
+"""延迟加载模块。
+
+    此模块包含了一个类，用于只在内存中保留游戏对象的 ID、名称等信息，在访问时才从文件中解析对象本体。
+"""
+import os
+import re
+import json
+import mmap
+from collections.abc import Mapping
+from typing import Iterator
+
+from bohdata.bohobj import BohObj
+from bohdata.bohobj import BohObjType
+from bohdata.bohobj import InvalidOriginObject, InvalidRoot
+from bohdata.file import read
+from bohdata.file import sniff
+from bohdata.file import _HEAD, _WS, _NEXT, _END, _DECODER
+
+_AFTER = re.compile(r'[ \t\n\r]*([,\]])[ \t\n\r]*')
+"""根数组中对象之后的分隔符或根数组的结尾。"""
+
+class LazyEntry:
+    """延迟加载的游戏对象条目，记录对象在文件中的字节范围。
+
+    Attributes:
+        id (str): 对象 ID，全小写。
+        origin_id (str): 游戏文件中的原始对象 ID。
+        label (str): 对象名称。
+        type (BohObjType): 对象类型。
+        root (str): 对象的根分类。
+        path (str): 来源文件路径。
+        start (int): 对象在文件中的起始字节。
+        end (int): 对象在文件中的结束字节（不含）。
+    """
+    __slots__ = ('id', 'origin_id', 'label', 'type', 'root', 'path', 'start', 'end', '_fingerprint', '_obj')
+
+    def __init__(self, obj: BohObj, path: str, start: int, end: int, resident: bool=False):
+        self.id = obj.id
+        self.origin_id = obj.origin_id
+        self.label = obj.label
+        self.type = obj.type
+        self.root = obj.root
+        self.path = path
+        self.start = start
+        self.end = end
+        self._fingerprint = None
+        self._obj = obj if resident else None   # 无法按字节定位的对象常驻内存
+
+    def load(self) -> BohObj:
+        """从文件中解析对象本体。
+
+        Returns:
+            BohObj: 游戏对象。
+        """
+        if self._obj is not None:
+            return self._obj
+
+        with open(self.path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            content = buffer[self.start:self.end]
+        obj = BohObj(json.loads(content), self.type)
+        obj.root = self.root
+        return obj
+
+    @property
+    def fingerprint(self) -> bytes:
+        """对象内容的指纹，与``BohObj.fingerprint``相同。"""
+        if self._fingerprint is None:
+            self._fingerprint = self.load().fingerprint
+        return self._fingerprint
+
+
+class LazyBohData(Mapping):
+    """延迟加载的游戏数据，是 ID 到游戏对象的只读映射。
+
+    创建时扫描一次所有文件，只保留各对象的``LazyEntry``；首次通过 ID 访问对象时才解析其本体，之后缓存。
+    ``entries``与``repeats``的内容与``read``所得``BohData``的``map``与``repeats``一一对应。
+    文件含有多个根分类时，按顺序扫描所有根数组。非 UTF-8 编码或格式特殊的文件无法按字节定位对象，将在扫描时直接加载。
+
+    Attributes:
+        entries (dict[str, LazyEntry]): ID 到对象条目的映射表。
+        repeats (dict[str, list[LazyEntry]]): 存储拥有重复 ID 对象条目的变量。
+        roots (set[str]): 所含游戏对象的所有根分类。
+    """
+    def __init__(self, target: str, objtype: BohObjType=BohObjType.UNKNOWN):
+        self.entries = {}
+        self.repeats = {}
+        self.roots = set()
+        self._objtype = objtype
+        self._loaded = {}
+
+        if os.path.isdir(target):
+            paths = [os.path.join(root, fname) for root, _, files in os.walk(target) for fname in files if fname.endswith('.json')]
+        else:
+            paths = [target]
+
+        for path in paths:
+            try:
+                entries = self._scan(path)
+            except (ValueError, InvalidOriginObject, InvalidRoot):
+                # 对象在整个文件解析完成前就已转化，转化失败时直接加载，使结果与报错均与 read 相同
+                entries = self._scanloaded(path)
+            for entry in entries.values():
+                self._append(entry)
+
+    def __getitem__(self, id: str) -> BohObj:
+        if id not in self._loaded:
+            self._loaded[id] = self.entries[id].load()
+        return self._loaded[id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, id: object) -> bool:
+        return id in self.entries
+
+    def unload(self) -> None:
+        """释放所有已解析的对象本体。"""
+        self._loaded = {}
+
+    def _scan(self, path: str) -> dict[str, LazyEntry]:
+        """扫描文件，返回与单个文件的``BohData.map``对应的条目。"""
+        with open(path, 'rb') as file:
+            content = file.read()
+        encoding, bom = sniff(content[:4])
+        if content == b'' or encoding != 'utf-8':
+            return self._scanloaded(path)
+        try:
+            text = content[bom:].decode('utf-8')
+        except UnicodeDecodeError:
+            return self._scanloaded(path)
+        del content
+
+        head = _HEAD.match(text)
+        if head is None:
+            return self._scanloaded(path)
+
+        # 逐个解析各根数组中的对象，并将字符位置换算为字节位置；格式与预期不符时直接加载，由 read 报告错误
+        entries = {}
+        repeats = set()
+        roots = set()
+        ascii = text.isascii()
+        charpos, bytepos = 0, bom
+        while head is not None:
+            root = json.loads(head.group(1))
+            if root in roots:
+                return self._scanloaded(path)   # 根分类重复
+            roots.add(root)
+
+            pos = _WS.match(text, head.end()).end()
+            if text.startswith(']', pos):
+                pos = pos + 1
+            else:
+                while True:
+                    try:
+                        value, end = _DECODER.raw_decode(text, pos)
+                    except json.decoder.JSONDecodeError:
+                        return self._scanloaded(path)
+                    if not isinstance(value, dict):
+                        return self._scanloaded(path)
+                    if ascii:
+                        start, stop = bom + pos, bom + end
+                    else:
+                        bytepos = bytepos + len(text[charpos:pos].encode('utf-8'))
+                        start = bytepos
+                        stop = bytepos = bytepos + len(text[pos:end].encode('utf-8'))
+                        charpos = end
+                    self._scanobj(entries, repeats, value, root, path, start, stop)
+
+                    separator = _AFTER.match(text, end)
+                    if separator is None:
+                        return self._scanloaded(path)
+                    pos = separator.end()
+                    if separator.group(1) == ']':
+                        break
+
+            head = _NEXT.match(text, pos)
+            if head is None and _END.fullmatch(text, pos) is None:
+                return self._scanloaded(path)
+        return entries
+
+    def _scanobj(self, entries: dict[str, LazyEntry], repeats: set[str], value: dict, root: str, path: str, start: int, end: int) -> None:
+        """按单个文件的``BohData._map_append``规则将扫描到的对象加入``entries``。"""
+        obj = BohObj(value, self._objtype)
+        obj.root = root
+        if obj.id in repeats:
+            return
+
+        entry = LazyEntry(obj, path, start, end)
+        if obj.id in entries and entries[obj.id].fingerprint != obj.fingerprint:
+            # 单个文件中内容不同的重复对象不会被合并，与 read 相同
+            repeats.add(obj.id)
+            del entries[obj.id]
+            return
+        entries[obj.id] = entry
+
+    def _scanloaded(self, path: str) -> dict[str, LazyEntry]:
+        """直接加载无法按字节定位的文件。"""
+        entries = {}
+        for id, obj in read(path, self._objtype).map.items():
+            entries[id] = LazyEntry(obj, path, 0, 0, resident=True)
+        return entries
+
+    def _append(self, entry: LazyEntry) -> None:
+        """在映射表中添加条目，与``BohData._map_append``相同。"""
+        self.roots.add(entry.root)
+        if entry.id in self.repeats:
+            self.repeats[entry.id].append(entry)
+        elif entry.id in self.entries and entry.fingerprint != self.entries[entry.id].fingerprint:
+            self.repeats[entry.id] = [self.entries[entry.id], entry]
+            del self.entries[entry.id]
+            self._loaded.pop(entry.id, None)
+        else:
+            self.entries[entry.id] = entry
+            self._loaded.pop(entry.id, None)
+
+
+def readlazy(target: str, objtype: BohObjType=BohObjType.UNKNOWN) -> LazyBohData:
+    """以延迟加载方式读取游戏文件。
+
+    Args:
+        target (str): 文件或文件夹路径。
+        objtype (BohObjType, optional): 游戏对象类型。默认为``BohObjType.UNKNOWN``，即自动判断。
+
+    Returns:
+        LazyBohData: 延迟加载的游戏数据。
+    """
+    return LazyBohData(target, objtype)
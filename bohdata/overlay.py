@@ -0,0 +1,155 @@
+#-*-coding:utf-8-*-
+"""叠加视图模块。
+
+    此模块包含了一个类，用于将本体、DLC 与模组等多层游戏数据叠加为一个只读视图，不复制任何对象。
+"""
+from collections.abc import Mapping
+from typing import Iterator
+
+from bohdata.bohobj import BohObj
+from bohdata.bohdata import BohData
+
+class BohOverlay(Mapping):
+    """多层游戏数据的叠加视图，是 ID 到游戏对象的只读映射，与``collections.ChainMap``类似。
+
+    ``layers[0]``为最上层，覆盖以根分类为单位：上层``elements``中的对象只覆盖下层``elements``中的同 ID 对象，
+    ``find``、``layerof``与``materialize``均遵循此规则。同一层中 ID 重复时返回最后一个。
+    ID 不区分大小写（2024.A.2 起游戏中的 ID 在任何场合均不区分大小写），查找时会先转为小写。
+
+    以``overlay[root, id]``查找时只在该根分类中查找，结果与``materialize``一致。
+    以``overlay[id]``查找时不区分根分类，返回包含该 ID 的最上层中的对象，
+    因此上层``recipes``中的``b``会遮住下层``elements``中的``b``；需要按根分类查找时请使用``overlay[root, id]``或``find``。
+    迭代、``len``与``keys``等均以 ID 为键。
+
+    各层在叠加后仍可修改，修改会直接反映在视图中。
+
+    Args:
+        *layers (BohData): 游戏数据，由上到下排列。
+
+    Attributes:
+        layers (list[BohData]): 由上到下排列的各层游戏数据。
+    """
+    def __init__(self, *layers: BohData):
+        self.layers = list(layers)
+
+    def __getitem__(self, key: str|tuple[str, str]) -> BohObj:
+        if isinstance(key, tuple):
+            root, id = key
+            objs = self.find(id, root)
+            if objs:
+                return objs[-1]
+            raise KeyError(key)
+
+        id = key.lower()
+        for layer in self.layers:
+            if id in layer.map:
+                return layer.map[id]
+            if id in layer.repeats:
+                return layer.repeats[id][-1]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        seen = set()
+        for layer in self.layers:
+            for ids in (layer.map, layer.repeats):
+                for id in ids:
+                    if id not in seen:
+                        seen.add(id)
+                        yield id
+
+    def __len__(self) -> int:
+        return len(set().union(*(layer.map.keys() | layer.repeats.keys() for layer in self.layers)))
+
+    def __contains__(self, key: object) -> bool:
+        if isinstance(key, tuple):
+            return len(key) == 2 and all(isinstance(item, str) for item in key) and bool(self.find(key[1], key[0]))
+        if not isinstance(key, str):
+            return False
+        id = key.lower()
+        return any(id in layer.map or id in layer.repeats for layer in self.layers)
+
+    def new_child(self, layer: BohData) -> 'BohOverlay':
+        """在最上层之上加入一层，返回新的视图，原视图不变。
+
+        Args:
+            layer (BohData): 新的最上层。
+
+        Returns:
+            BohOverlay: 新的叠加视图。
+        """
+        return BohOverlay(layer, *self.layers)
+
+    def layerof(self, id: str, root: str|None=None) -> int|None:
+        """获取提供给定 ID 对象的层的序号，不区分大小写。
+
+        Args:
+            id (str): 对象 ID。
+            root (str, optional): 只查找该根分类中的对象。默认为``None``，即在各层的映射表中查找。
+
+        Returns:
+            int | None: ``layers``中的序号，未找到时为``None``。
+        """
+        for index, layer in enumerate(self.layers):
+            if layer.find(id, root):
+                return index
+        return None
+
+    def find(self, id: str, root: str|None=None) -> list[BohObj]:
+        """按 ID 查找最上层中的对象，不区分大小写。
+
+        Args:
+            id (str): 对象 ID。
+            root (str, optional): 只查找该根分类中的对象。默认为``None``，即在各层的映射表中查找（包括 ID 重复的对象）。
+
+        Returns:
+            list[BohObj]: 最上层中找到的对象（同一层中 ID 重复时有多个），未找到时为空列表。
+        """
+        for layer in self.layers:
+            objs = layer.find(id, root)
+            if objs:
+                return objs
+        return []
+
+    def materialize(self) -> BohData:
+        """将各层合并为一个``BohData``对象。
+
+        由下到上逐层合并：同一根分类中，上层的同 ID 对象替换下层对象在列表中的位置，上层独有的对象加在末尾；
+        根分类未知的对象（只存在于映射表中）按 ID 覆盖。对象不会被复制，结果与各层共享对象。
+
+        Returns:
+            BohData: 合并后的游戏数据。
+        """
+        layers = self.layers[::-1]
+        data = BohData({})
+        for root in dict.fromkeys(root for layer in layers for root in layer):
+            # 各 ID 由最上层提供，放在该 ID 在最下层中首次出现的位置
+            winners = {}
+            for index, layer in enumerate(layers):
+                for id in layer.rootmaps.get(root, ()):
+                    winners[id] = index
+            first = {}
+            objs = []
+            for index, layer in enumerate(layers):
+                for obj in layer.get(root, ()):
+                    if first.setdefault(obj.id, index) != index:
+                        continue
+                    winner = winners[obj.id]
+                    if winner == index:
+                        objs.append(obj)
+                    elif winner is not None:
+                        objs.extend(layers[winner].rootmaps[root][obj.id])
+                        winners[obj.id] = None
+            dict.__setitem__(data, root, objs)
+        data.rebuild()
+
+        unknown = {}
+        for layer in layers:
+            layer_unknown = {}
+            for obj in layer.objs():
+                if obj.root == 'unknown':
+                    layer_unknown.setdefault(obj.id, []).append(obj)
+            unknown.update(layer_unknown)
+        for objs in unknown.values():
+            for obj in objs:
+                data.append(obj)
+        return data
@@ -0,0 +1,113 @@
+#-*-coding:utf-8-*-
+"""``paratranz.cn``数据模块。
+
+    此模块用于将``paratranz.cn``导出的翻译条目还原为游戏对象的结构。
+"""
+from typing import Any, Iterable
+
+_HOLE = object()
+"""列表中尚未填入的位置。"""
+
+def buildtree(entries: Iterable[dict]) -> dict:
+    """将翻译条目还原为 ID 到翻译文件对象的映射表。
+
+    条目的键为以``||``连接的路径，如``'id||slots||0||label'``。每个键只拆分一次，逐层迭代写入，不受递归深度限制；
+    数字路径段直接写入列表。最终结果与逐层拆分后再转化列表的做法相同，包括字典中键的顺序：
+    键为从``'0'``开始的连续数字的层级成为列表（遇到值为``None``的成员时截断），其余层级为字典，键按首次出现的顺序排列。
+
+    Args:
+        entries (Iterable[dict]): 翻译条目，每个条目含有``key``与``translation``。
+
+    Returns:
+        dict: ID 到翻译文件对象的映射表，键为条目中的原始 ID。
+    """
+    tree = {}
+    orders = {}     # 未按下标顺序写入的列表的 id 到``(列表, 各下标的首次写入顺序)``，用于转化为字典时保持键的顺序
+    for entry in entries:
+        segments = entry['key'].split('||')
+        node = tree
+        parent = key = None
+        for depth in range(len(segments) - 1):
+            segment = segments[depth]
+            if not (isinstance(node, dict) and isinstance(child := node.get(segment), (dict, list))):
+                child = _child(node, parent, key, segment, segments[depth + 1], orders)
+            node, parent, key = child, node, segment
+        if isinstance(node, dict):
+            node[segments[-1]] = entry['translation']
+        else:
+            _set(node, parent, key, segments[-1], entry['translation'], orders)
+    _finish(tree, orders)
+    return tree
+
+
+def _index(segment: str) -> int|None:
+    """若路径段是列表下标（不含前导零的数字），返回下标。"""
+    if segment.isdigit() and segment.isascii() and (segment[0] != '0' or segment == '0'):
+        return int(segment)
+    return None
+
+
+def _child(node: dict|list, parent: dict|list|None, key: str|None, segment: str, next: str,
+           orders: dict[int, tuple[list, list[int]]]) -> dict|list:
+    """取得``node``中``segment``对应的子级，不存在时按下一路径段``next``创建列表或字典。"""
+    if isinstance(node, list):
+        index = _index(segment)
+        if index is None:
+            node = _todict(node, parent, key, orders)
+        elif index < len(node) and isinstance(node[index], (dict, list)):
+            return node[index]
+    elif isinstance(child := node.get(segment), (dict, list)):
+        return child
+
+    child = [] if _index(next) is not None else {}
+    _set(node, parent, key, segment, child, orders)
+    return child
+
+
+def _set(node: dict|list, parent: dict|list|None, key: str|None, segment: str, value: Any, orders: dict[int, tuple[list, list[int]]]) -> None:
+    """将``value``写入``node``中的``segment``，列表不足时以空位补齐，并记录未按下标顺序写入的列表的写入顺序。"""
+    if isinstance(node, list):
+        index = _index(segment)
+        if index is not None:
+            size = len(node)
+            if index == size and not orders:
+                node.append(value)
+                return
+            if index >= size:
+                if index > size and id(node) not in orders:
+                    orders[id(node)] = (node, list(range(size)))    # 此前的成员均按下标顺序写入；保留列表，使 id 不被复用
+                if id(node) in orders:
+                    orders[id(node)][1].append(index)
+                node.extend([_HOLE] * (index - size + 1))
+            elif node[index] is _HOLE:
+                orders[id(node)][1].append(index)   # 含有空位的列表必然已被记录
+            node[index] = value
+            return
+        node = _todict(node, parent, key, orders)
+    node[segment] = value
+
+
+def _todict(lst: list, parent: dict|list, key: str, orders: dict[int, tuple[list, list[int]]]) -> dict:
+    """将列表转化为以数字字符串为键的字典，键按首次写入的顺序排列，并在父级中替换。"""
+    res = {str(index): lst[index] for index in orders.pop(id(lst), (lst, range(len(lst))))[1]}
+    if isinstance(parent, list):
+        parent[int(key)] = res
+    else:
+        parent[key] = res
+    return res
+
+
+def _finish(tree: dict, orders: dict[int, tuple[list, list[int]]]) -> None:
+    """遍历整个结构：含有空位的列表转化为字典，其余列表在第一个``None``成员处截断。"""
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        items = node.items() if isinstance(node, dict) else enumerate(node)
+        for key, value in items:
+            if isinstance(value, list):
+                if _HOLE in value:
+                    value = node[key] = {str(index): value[index] for index in orders[id(value)][1]}
+                elif None in value:
+                    del value[value.index(None):]
+            if isinstance(value, (dict, list)):
+                stack.append(value)
@@ -0,0 +1,224 @@
+#-*-coding:utf-8-*-
+"""性能分析模块。
+
+    此模块用于在读取、合并、导出等过程中按阶段记录耗时与计数，默认关闭。可通过以下两种方式开启：\n
+        - 使用上下文管理器``profile()``，只记录``with``语句块内的调用。\n
+        - 设置环境变量``BOHDATA_PROFILE``，记录整个进程，并在退出时输出结果：
+          值为``.json``文件路径时写入 JSON 跟踪文件，否则在标准错误中打印摘要。\n
+    关闭时各记录点只进行一次全局变量判断。``workers``大于 1 时，子进程中的解析不会被记录。
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+import contextlib
+import multiprocessing
+from typing import Any, Iterator
+
+ENV = 'BOHDATA_PROFILE'
+"""开启全进程性能分析的环境变量。"""
+
+class Profile:
+    """一次性能分析的记录。
+
+    阶段可以嵌套，如``read.file``包含``read.io``、``read.decode``、``read.json``、``bohobj.init``与``bohdata.map``，
+    嵌套阶段的耗时同时计入各层，因此各阶段耗时之和可能大于总耗时。
+
+    Attributes:
+        phases (dict[str, list]): 阶段名到``[调用次数, 总耗时（秒）]``的映射表。
+        counters (dict[str, int]): 计数器名到计数的映射表，如``objects``、``cache.hit``。
+        files (dict[str, dict[str, int|float]]): 文件路径到该文件的阶段耗时与计数的映射表。
+        events (list[tuple]): 按结束顺序排列的``(阶段名, 文件路径, 开始时间, 耗时, 线程 ID)``，时间单位为秒。
+    """
+    def __init__(self):
+        self.phases = {}
+        self.counters = {}
+        self.files = {}
+        self.events = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def phase(self, name: str, path: str|None=None) -> '_Phase':
+        """记录一个阶段的耗时。
+
+        Args:
+            name (str): 阶段名。
+            path (str, optional): 阶段所处理的文件。默认为``None``。
+
+        Returns:
+            _Phase: 用于``with``语句的上下文管理器。
+        """
+        return _Phase(self, name, path)
+
+    def count(self, name: str, value: int=1, path: str|None=None) -> None:
+        """增加计数。
+
+        Args:
+            name (str): 计数器名。
+            value (int, optional): 增加的值。默认为``1``。
+            path (str, optional): 同时计入该文件的计数。默认为``None``。
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+            if path is not None:
+                record = self.files.setdefault(path, {})
+                record[name] = record.get(name, 0) + value
+
+    def summary(self, top: int=10) -> str:
+        """获取可读的摘要文本，包括各阶段耗时、计数与最慢的文件。
+
+        Args:
+            top (int, optional): 列出的最慢文件数。默认为``10``。
+
+        Returns:
+            str: 摘要文本。
+        """
+        lines = [f'{"阶段":<24}{"次数":>10}{"总耗时(s)":>14}{"平均(ms)":>12}']
+        for name, (calls, seconds) in sorted(self.phases.items(), key=lambda item: -item[1][1]):
+            lines.append(f'{name:<26}{calls:>10}{seconds:>14.4f}{seconds / calls * 1000:>12.3f}')
+
+        if self.counters:
+            lines.append('')
+            lines.append(f'{"计数":<24}{"值":>10}')
+            for name, value in sorted(self.counters.items()):
+                lines.append(f'{name:<26}{value:>10}')
+
+        timed = [(record['read.file'], path) for path, record in self.files.items() if 'read.file' in record]
+        if timed:
+            lines.append('')
+            lines.append(f'最慢的 {min(top, len(timed))} 个文件：')
+            for seconds, path in sorted(timed, reverse=True)[:top]:
+                lines.append(f'{seconds * 1000:>10.3f} ms  {path}')
+        return '\n'.join(lines)
+
+    def trace(self) -> dict[str, Any]:
+        """获取 Trace Event 格式的跟踪数据，可在``chrome://tracing``或 Perfetto 中查看。
+
+        Returns:
+            dict[str, Any]: 跟踪数据。汇总的阶段耗时、计数与文件记录位于``otherData``中。
+        """
+        pid = os.getpid()
+        events = []
+        for name, path, start, duration, tid in self.events:
+            event = {'name': name, 'cat': 'bohdata', 'ph': 'X', 'ts': start * 1e6, 'dur': duration * 1e6, 'pid': pid, 'tid': tid}
+            if path is not None:
+                event['args'] = {'path': path}
+            events.append(event)
+        return {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': {'phases': self.phases, 'counters': self.counters, 'files': self.files},
+        }
+
+    def dump(self, path: str) -> None:
+        """将跟踪数据写入``.json``文件。
+
+        Args:
+            path (str): 文件路径。
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(json.dumps(self.trace(), ensure_ascii=False))
+
+    def _record(self, name: str, path: str|None, start: float, end: float) -> None:
+        """记录一个已结束的阶段。"""
+        duration = end - start
+        with self._lock:
+            record = self.phases.setdefault(name, [0, 0.0])
+            record[0] = record[0] + 1
+            record[1] = record[1] + duration
+            if path is not None:
+                file = self.files.setdefault(path, {})
+                file[name] = file.get(name, 0.0) + duration
+            self.events.append((name, path, start - self._origin, duration, threading.get_ident()))
+
+
+class _Phase:
+    """``Profile.phase``所返回的上下文管理器。"""
+    __slots__ = ('_profile', '_name', '_path', '_start')
+
+    def __init__(self, profile: Profile, name: str, path: str|None):
+        self._profile = profile
+        self._name = name
+        self._path = path
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self._profile._record(self._name, self._path, self._start, time.perf_counter())
+
+
+_NULL = contextlib.nullcontext()
+"""关闭时``phase``所返回的空上下文管理器。"""
+
+_active: Profile|None = None
+"""正在进行的性能分析，关闭时为``None``。"""
+
+@contextlib.contextmanager
+def profile(path: str|None=None) -> Iterator[Profile]:
+    """在``with``语句块内开启性能分析。
+
+    嵌套使用时，内层语句块只记录到内层的``Profile``中。例如：\n
+        with bohdata.profile() as prof:
+            bohdata.read('core/')
+        print(prof.summary())
+
+    Args:
+        path (str, optional): 退出语句块时写入 JSON 跟踪文件的路径。默认为``None``，即不写入。
+
+    Yields:
+        Profile: 记录结果。
+    """
+    global _active
+    previous = _active
+    current = _active = Profile()
+    try:
+        yield current
+    finally:
+        _active = previous
+        if path is not None:
+            current.dump(path)
+
+
+def phase(name: str, path: str|None=None) -> contextlib.AbstractContextManager:
+    """在性能分析开启时记录一个阶段的耗时，关闭时返回空的上下文管理器。
+
+    Args:
+        name (str): 阶段名。
+        path (str, optional): 阶段所处理的文件。默认为``None``。
+    """
+    if _active is None:
+        return _NULL
+    return _active.phase(name, path)
+
+
+def count(name: str, value: int=1, path: str|None=None) -> None:
+    """在性能分析开启时增加计数。
+
+    Args:
+        name (str): 计数器名。
+        value (int, optional): 增加的值。默认为``1``。
+        path (str, optional): 同时计入该文件的计数。默认为``None``。
+    """
+    if _active is not None:
+        _active.count(name, value, path)
+
+
+def enabled() -> bool:
+    """性能分析是否开启。"""
+    return _active is not None
+
+
+def _report(profile: Profile, target: str) -> None:
+    """进程退出时输出环境变量开启的性能分析结果。"""
+    if target.endswith('.json'):
+        profile.dump(target)
+    else:
+        print(profile.summary(), file=sys.stderr)
+
+
+if os.environ.get(ENV) and multiprocessing.parent_process() is None:
+    _active = Profile()
+    atexit.register(_report, _active, os.environ[ENV])
@@ -0,0 +1,272 @@
+#-*-coding:utf-8-*-
+"""全文搜索模块。
+
+    此模块包含了一个类，用于按文本内容搜索游戏对象，支持英文与中日韩文本。
+"""
+import re
+import math
+import pickle
+import unicodedata
+from array import array
+from typing import Iterable, Iterator, NamedTuple
+
+from bohdata.bohobj import BohObj, TEXT_KEYS
+from bohdata.storage import nogc, replacing
+
+_CJK = '\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af'
+"""按字切分的字符范围：日文假名、中日韩统一表意文字及其扩展 A 区、兼容表意文字与谚文音节。"""
+
+_TOKEN = re.compile(f'([{_CJK}]+)|[^\\W_{_CJK}]+')
+"""词元：连续的中日韩字符，或连续的其他字母与数字。"""
+
+_MARKUP = re.compile(r'<[^<>]*>')
+"""文本中的 HTML 标签，如``<i>``、``<sprite name=...>``。"""
+
+_TEXT_KEYS = TEXT_KEYS - {'id', 'xexts'}
+"""值为需翻译文本的键。``id``不计入，``xexts``中的文本另行判断。"""
+
+K1 = 1.2
+"""BM25 的词频饱和参数。"""
+
+B = 0.75
+"""BM25 的文本长度归一化参数。"""
+
+class InvalidTextIndex(Exception):
+    """无效的索引文件。文件不是当前版本的``TextIndex``时抛出。
+
+    Args:
+        message (str): 可读的报错文本。
+    """
+    def __init__(self, message):
+        super().__init__(message)
+
+
+class SearchHit(NamedTuple):
+    """``TextIndex.search``的一条结果。
+
+    Attributes:
+        root (str): 对象的根分类。
+        id (str): 对象 ID。
+        score (float): 相关度，越大越相关。
+        paths (list[str]): 匹配的文本的属性路径，以对象原始 ID 开头、以``||``连接，如``'id||slots||0||label'``，按相关度排序。
+    """
+    root: str
+    id: str
+    score: float
+    paths: list[str]
+
+
+def tokenize(text: str) -> Iterator[str]:
+    """将文本切分为词元。
+
+    文本先经 NFKC 规范化（全角字母与数字转为半角）并转为小写，移除 HTML 标签。
+    英文等以空格分词的文字按字母与数字切分为单词；中日韩文本产出每个字（一元）与每两个相邻的字（二元）。
+
+    Args:
+        text (str): 文本。
+
+    Yields:
+        str: 词元。
+    """
+    text = _MARKUP.sub(' ', unicodedata.normalize('NFKC', text).lower())
+    for match in _TOKEN.finditer(text):
+        run = match.group(1)
+        if run is None:
+            yield match.group()
+            continue
+        yield from run
+        for index in range(len(run) - 1):
+            yield run[index:index + 2]
+
+
+def _queryterms(query: str) -> list[str]:
+    """将查询切分为检索词。中日韩文本只使用二元词元，单个字使用一元词元。"""
+    query = _MARKUP.sub(' ', unicodedata.normalize('NFKC', query).lower())
+    terms = []
+    for match in _TOKEN.finditer(query):
+        run = match.group(1)
+        if run is None:
+            terms.append(match.group())
+        elif len(run) == 1:
+            terms.append(run)
+        else:
+            terms.extend(run[index:index + 2] for index in range(len(run) - 1))
+    return list(dict.fromkeys(terms))
+
+
+def textfields(obj: BohObj) -> Iterator[tuple[str, str]]:
+    """按顺序遍历对象中需翻译的文本，即最近的键属于``TEXT_KEYS``（``id``除外）或位于``xexts``中的字符串。
+
+    Args:
+        obj (BohObj): 游戏对象或翻译文件对象。
+
+    Yields:
+        tuple[str, str]: ``(属性路径, 文本)``，属性路径以对象原始 ID 开头、以``||``连接。
+    """
+    # (值, 属性路径, 是否为文本, 是否位于 xexts 中)
+    stack = [(obj, obj.origin_id, False, False)]
+    while stack:
+        value, path, text, xexts = stack.pop()
+        if isinstance(value, str):
+            if text and value:
+                yield path, value
+        elif isinstance(value, dict):
+            for key, subvalue in reversed(value.items()):
+                subxexts = xexts or key == 'xexts'
+                stack.append((subvalue, f'{path}||{key}', subxexts or key in _TEXT_KEYS, subxexts))
+        elif isinstance(value, list):
+            for index in range(len(value) - 1, -1, -1):
+                stack.append((value[index], f'{path}||{index}', text, xexts))
+
+
+class TextIndex:
+    """游戏文本的全文倒排索引。
+
+    对象中的每一处文本（见``textfields``）是一篇文档，按``tokenize``切分为词元后记录在倒排表中。
+    搜索时以 BM25 计算每处文本的相关度，再按对象合计。可同时加入原始游戏对象与翻译文件对象，以中英文搜索同一对象。
+
+    Attributes:
+        docs (list[tuple[str, str, str]]): 文档序号到``(根分类, 对象 ID, 属性路径)``的映射表。
+        lengths (array): 各文档的词元数。
+        postings (dict[str, array]): 词元到倒排表的映射表，倒排表依次为``文档序号, 词频``，按文档序号升序排列。
+    """
+    VERSION = 1
+    """索引文件格式版本，格式或切分规则变化时应增加，使旧文件失效。"""
+
+    def __init__(self, objs: Iterable[BohObj]=()):
+        self.docs = []
+        self.lengths = array('I')
+        self.postings = {}
+        self._total = 0
+        self._norms = None
+        for obj in objs:
+            self.add(obj)
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def add(self, obj: BohObj) -> None:
+        """将游戏对象的文本加入索引。
+
+        Args:
+            obj (BohObj): 游戏对象或翻译文件对象。
+        """
+        postings = self.postings
+        self._norms = None
+        for path, text in textfields(obj):
+            doc = len(self.docs)
+            counts = {}
+            for token in tokenize(text):
+                counts[token] = counts.get(token, 0) + 1
+            if not counts:
+                continue
+
+            self.docs.append((obj.root, obj.id, path))
+            length = sum(counts.values())
+            self.lengths.append(length)
+            self._total = self._total + length
+            for token, count in counts.items():
+                posting = postings.get(token)
+                if posting is None:
+                    posting = postings[token] = array('I')
+                posting.append(doc)
+                posting.append(count)
+
+    def search(self, query: str, limit: int|None=20, root: str|None=None, matchall: bool=False) -> list[SearchHit]:
+        """搜索文本，按相关度排序返回对象。
+
+        查询按与索引相同的规则切分为检索词，中日韩文本使用相邻两字组成的检索词，单个字则直接检索。
+        默认只需匹配任一检索词，匹配的检索词越多、越少见，相关度越高。
+
+        Args:
+            query (str): 查询文本，如``'lantern edge'``或``'司辰'``。
+            limit (int, optional): 最多返回的对象数。默认为``20``。为``None``时返回全部。
+            root (str, optional): 只返回该根分类中的对象。默认为``None``。
+            matchall (bool, optional): 是否要求对象的文本（可分布在不同属性中）包含所有检索词。默认为``False``。
+
+        Returns:
+            list[SearchHit]: 搜索结果，相关度相同时按根分类与 ID 排序。
+        """
+        terms = _queryterms(query)
+        if not terms or not self.docs:
+            return []
+
+        if self._norms is None:
+            average = self._total / len(self.docs)
+            self._norms = [K1 * (1 - B + B * length / average) for length in self.lengths]
+        norms = self._norms
+        docs = self.docs
+        count = len(docs)
+        scores = {}
+        masks = {}  # 文档到所匹配检索词的位掩码
+        for bit, term in enumerate(terms):
+            posting = self.postings.get(term)
+            if posting is None:
+                if matchall:
+                    return []
+                continue
+            freq = len(posting) // 2
+            idf = math.log(1 + (count - freq + 0.5) / (freq + 0.5))
+            for doc, tf in zip(posting[0::2], posting[1::2]):
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (K1 + 1) / (tf + norms[doc])
+                if matchall:
+                    masks[doc] = masks.get(doc, 0) | 1 << bit
+
+        # 按对象合计，同一属性路径（如 ID 重复的相同对象）只取最高分
+        objs = {}
+        objmasks = {}
+        for doc, score in scores.items():
+            objroot, id, path = docs[doc]
+            if root is not None and objroot != root:
+                continue
+            fields = objs.setdefault((objroot, id), {})
+            if score > fields.get(path, 0.0):
+                fields[path] = score
+            if matchall:
+                objmasks[objroot, id] = objmasks.get((objroot, id), 0) | masks[doc]
+        if matchall:
+            full = (1 << len(terms)) - 1
+            objs = {key: fields for key, fields in objs.items() if objmasks[key] == full}
+
+        hits = []
+        for (objroot, id), fields in objs.items():
+            paths = sorted(fields, key=lambda path: -fields[path])
+            hits.append(SearchHit(objroot, id, sum(fields.values()), paths))
+        hits.sort(key=lambda hit: (-hit.score, hit.root, hit.id))
+        return hits if limit is None else hits[:limit]
+
+    def save(self, path: str) -> None:
+        """将索引写入文件。先写入临时文件，完成后再替换。
+
+        Args:
+            path (str): 文件路径。
+        """
+        with replacing(path) as temp, open(temp, 'wb') as file:
+            pickle.dump((TextIndex.VERSION, self.docs, self.lengths, self.postings, self._total), file,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> 'TextIndex':
+        """从文件加载索引。
+
+        Args:
+            path (str): ``save``所写入的文件路径。
+
+        Returns:
+            TextIndex: 索引。
+
+        Raises:
+            InvalidTextIndex: 文件不是当前版本的索引文件。
+        """
+        try:
+            with nogc(), open(path, 'rb') as file:
+                state = pickle.load(file)
+        except (EOFError, pickle.UnpicklingError, ValueError) as error:
+            raise InvalidTextIndex(f'"{path}"不是有效的索引文件。') from error
+
+        if not isinstance(state, tuple) or len(state) != 5 or state[0] != TextIndex.VERSION:
+            raise InvalidTextIndex(f'"{path}"不是版本 {TextIndex.VERSION} 的索引文件。')
+        index = cls()
+        _, index.docs, index.lengths, index.postings, index._total = state
+        return index
+
@@ -0,0 +1,370 @@
+#-*-coding:utf-8-*-
+"""快照模块。
+
+    此模块用于将``BohData``保存为紧凑的二进制快照，加载时无需解析 JSON，也无需重新判断对象类型。
+
+    快照文件由文件头、区段表与以下区段组成，各区段按 8 字节对齐，数字均为小端序。
+    ``marshal``格式在不同 Python 版本间可能不同，文件头中记录了写入时的``marshal.version``，不一致时拒绝加载：\n
+        - 字符串表：所有 ID、原始 ID、名称与根分类去重后的列表，以``marshal``格式存储。\n
+        - 对象记录：按列存储的 ID、原始 ID、名称、根分类（字符串序号）与对象类型，以及 16 字节的内容指纹。\n
+        - 对象本体：每``BLOCK``个对象组成一块，以``marshal``格式存储，及各块的偏移表，可按序号随机访问。
+          同一块中相同的键只存储一次。\n
+        - 结构：各根分类的对象列表、``map``与``repeats``，均以对象序号表示。
+"""
+import sys
+import mmap
+import struct
+import marshal
+from array import array
+from collections.abc import Mapping
+from typing import Iterator
+
+from bohdata.bohobj import BohObj
+from bohdata.bohobj import BohObjType
+from bohdata.storage import nogc, replacing
+
+MAGIC = b'BOHSNAP\x00'
+"""快照文件的开头。"""
+
+VERSION = 3
+"""快照格式版本，格式变化时递增。"""
+
+BLOCK = 64
+"""每块对象本体的对象数。"""
+
+_HEADER = struct.Struct('<8sIII')   # 开头、版本、marshal 版本、区段数
+_SECTION = struct.Struct('<QQ')     # 偏移、长度
+_SECTIONS = ('strings', 'records', 'fingerprints', 'bodies.index', 'bodies', 'roots', 'map', 'repeats', 'meta')
+_COLUMNS = 5    # ID、原始 ID、名称、根分类、类型
+_NONE = 0xFFFFFFFF
+"""表示``None``的字符串序号。"""
+
+_TYPES = {objtype.value: objtype for objtype in BohObjType}
+
+_ERRORS = (ValueError, EOFError, TypeError, IndexError, KeyError, struct.error)
+"""解析损坏的快照文件时可能出现的异常，``marshal``解析失败时抛出前三者。"""
+
+class InvalidSnapshot(Exception):
+    """无效的快照文件。文件开头、版本或``marshal``版本不符，或文件为空、已损坏时抛出。
+
+    Args:
+        message (str): 可读的报错文本。
+    """
+    def __init__(self, message):
+        super().__init__(message)
+
+
+def save(data: 'BohData', path: str) -> None:
+    """将游戏数据保存为快照文件。
+
+    Args:
+        data (BohData): 游戏数据。
+        path (str): 快照文件路径。
+    """
+    # 收集对象：先按根分类的列表顺序，再补充只存在于映射表中的对象（如根分类未知的对象）
+    objs = []
+    indexes = {}
+    def add(obj: BohObj) -> int:
+        if id(obj) not in indexes:
+            indexes[id(obj)] = len(objs)
+            objs.append(obj)
+        return indexes[id(obj)]
+
+    strings = {}
+    def intern(value: str|None) -> int:
+        if value is None:
+            return _NONE
+        return strings.setdefault(value, len(strings))
+
+    roots = array('I')
+    for root, root_objs in data.items():
+        roots.extend([intern(root), len(root_objs)])
+        roots.extend(add(obj) for obj in root_objs)
+    map = array('I', (add(obj) for obj in data.map.values()))
+    repeats = array('I')
+    for repeat_objs in data.repeats.values():
+        repeats.append(len(repeat_objs))
+        repeats.extend(add(obj) for obj in repeat_objs)
+
+    columns = [array('I') for _ in range(_COLUMNS)]
+    fingerprints = bytearray()
+    bodies_index = array('Q', [0])
+    bodies = bytearray()
+    for obj in objs:
+        columns[0].append(intern(obj.id))
+        columns[1].append(intern(obj.origin_id))
+        columns[2].append(intern(obj.label))
+        columns[3].append(intern(obj._root))
+        columns[4].append(obj.type.value)
+        fingerprints.extend(obj.fingerprint)
+    for start in range(0, len(objs), BLOCK):
+        bodies.extend(marshal.dumps([dict(obj) for obj in objs[start:start + BLOCK]]))
+        bodies_index.append(len(bodies))
+
+    meta = array('I', [intern(data._file)])
+    meta.extend(intern(root) for root in sorted(data.roots))
+
+    records = array('I')
+    for column in columns:
+        records.extend(column)
+
+    sections = [marshal.dumps(list(strings)), records, fingerprints, bodies_index, bodies, roots, map, repeats, meta]
+    sections = [_tobytes(section) for section in sections]
+
+    # 写入文件，先写入临时文件，避免读取到不完整的快照
+    with replacing(path) as temp, open(temp, 'wb') as file:
+        offset = _align(_HEADER.size + _SECTION.size * len(sections))
+        table = []
+        for section in sections:
+            table.append((offset, len(section)))
+            offset = _align(offset + len(section))
+
+        file.write(_HEADER.pack(MAGIC, VERSION, marshal.version, len(sections)))
+        for entry in table:
+            file.write(_SECTION.pack(*entry))
+        for (offset, _), section in zip(table, sections):
+            file.write(b'\x00' * (offset - file.tell()))
+            file.write(section)
+
+
+def load(path: str, cls: type) -> 'BohData':
+    """从快照文件加载游戏数据。
+
+    Args:
+        path (str): 快照文件路径。
+        cls (type): ``BohData``或其子类。
+
+    Returns:
+        BohData: 游戏数据，与保存时的内容相同。
+
+    Raises:
+        InvalidSnapshot: 文件不是当前版本的快照文件或已损坏。
+    """
+    with nogc():
+        try:
+            return _load(path, cls)
+        except _ERRORS as error:
+            raise InvalidSnapshot(f'"{path}"已损坏。') from error
+
+
+def _load(path: str, cls: type) -> 'BohData':
+    with Snapshot(path) as snapshot:
+        # 逐列取得对象属性，再逐个创建对象，避免逐个对象查找字符串表
+        strings = snapshot._strings
+        ids, origin_ids, labels = ([strings[index] for index in column] for column in snapshot._columns[:3])
+        roots = [None if index == _NONE else strings[index] for index in snapshot._columns[3]]
+        types = [_TYPES[value] for value in snapshot._columns[4]]
+        fingerprints = snapshot._fingerprints
+        objs = []
+        new = BohObj.__new__
+        index = 0
+        for block in range(len(snapshot._bodies_index) - 1):
+            for body in snapshot._block(block):
+                obj = new(BohObj)
+                dict.update(obj, body)
+                obj.id = ids[index]
+                obj.origin_id = origin_ids[index]
+                obj.label = labels[index]
+                obj._root = roots[index]
+                obj.type = types[index]
+                obj._fingerprint = fingerprints[index * 16:index * 16 + 16]
+                objs.append(obj)
+                index = index + 1
+
+        data = cls({})
+        for root, indexes in snapshot._roots:
+            root_objs = [objs[index] for index in indexes]
+            dict.__setitem__(data, root, root_objs)
+            rootmap = data.rootmaps[root] = {}
+            for obj in root_objs:
+                rootmap.setdefault(obj.id, []).append(obj)
+        data.map = {objs[index].id: objs[index] for index in snapshot._map.values()}
+        data.repeats = {id: [objs[index] for index in indexes] for id, indexes in snapshot._repeats.items()}
+        data.roots = set(snapshot.roots)
+        data._file = snapshot.file
+    return data
+
+
+class Snapshot(Mapping):
+    """以内存映射方式打开的快照文件，是 ID 到游戏对象的只读映射，对应``BohData.map``。
+
+    打开时只读取字符串表与对象记录，对象本体在访问时才按偏移表解析，每次访问都会返回新的对象。
+    应在使用后调用``close``，或使用``with``语句。
+
+    Attributes:
+        path (str): 快照文件路径。
+        count (int): 快照中的对象数（包括 ID 重复的对象）。
+        roots (list[str]): ``BohData.roots``。
+        file (str | None): ``BohData.file``，未设置时为``None``。
+
+    Raises:
+        InvalidSnapshot: 文件不是当前版本的快照文件或已损坏。访问对象时发现对象本体损坏亦会抛出。
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as file:
+            try:
+                self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as error:     # 空文件无法映射
+                raise InvalidSnapshot(f'"{path}"不是版本 {VERSION} 的快照文件。') from error
+
+        self._view = memoryview(self._buffer)
+        sections = {}
+        try:
+            self._read(sections)
+        except BaseException as error:
+            # 释放所有区段后才能关闭内存映射
+            for section in sections.values():
+                section.release()
+            self._view.release()
+            self._buffer.close()
+            if isinstance(error, _ERRORS):
+                raise InvalidSnapshot(f'"{path}"已损坏。') from error
+            raise
+        for name, section in sections.items():
+            if name != 'bodies':
+                section.release()
+
+    def _read(self, sections: dict[str, memoryview]) -> None:
+        """读取文件头、区段表、字符串表、对象记录与结构，``sections``中为各区段的视图。"""
+        magic, version, marshal_version, count = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise InvalidSnapshot(f'"{self.path}"不是版本 {VERSION} 的快照文件。')
+        if marshal_version != marshal.version:
+            raise InvalidSnapshot(f'"{self.path}"由 marshal 版本 {marshal_version} 写入，当前为 {marshal.version}。')
+        if count != len(_SECTIONS):
+            raise InvalidSnapshot(f'"{self.path}"已损坏。')
+
+        for index, name in enumerate(_SECTIONS):
+            offset, length = _SECTION.unpack_from(self._buffer, _HEADER.size + _SECTION.size * index)
+            if offset + length > len(self._buffer):     # 文件被截断
+                raise InvalidSnapshot(f'"{self.path}"已损坏。')
+            sections[name] = self._view[offset:offset + length]
+
+        # 字符串表
+        self._strings = marshal.loads(sections['strings'])
+
+        # 对象记录
+        records = _array('I', sections['records'])
+        self.count = len(records) // _COLUMNS
+        self._columns = [records[self.count * column:self.count * (column + 1)] for column in range(_COLUMNS)]
+        self._fingerprints = bytes(sections['fingerprints'])
+        self._bodies_index = _array('Q', sections['bodies.index'])
+        self._bodies = sections['bodies']
+        self._cached = (None, None)    # 最近解析的块
+
+        # 结构
+        self._roots = []
+        roots = _array('I', sections['roots'])
+        pos = 0
+        while pos < len(roots):
+            size = roots[pos + 1]
+            self._roots.append((self._strings[roots[pos]], roots[pos + 2:pos + 2 + size]))
+            pos = pos + 2 + size
+        ids = self._columns[0]
+        self._map = {self._strings[ids[index]]: index for index in _array('I', sections['map'])}
+        self._repeats = {}
+        repeats = _array('I', sections['repeats'])
+        pos = 0
+        while pos < len(repeats):
+            indexes = repeats[pos + 1:pos + 1 + repeats[pos]]
+            self._repeats[self._strings[ids[indexes[0]]]] = indexes
+            pos = pos + 1 + repeats[pos]
+
+        meta = _array('I', sections['meta'])
+        self.file = None if meta[0] == _NONE else self._strings[meta[0]]
+        self.roots = [self._strings[index] for index in meta[1:]]
+
+    def __getitem__(self, id: str) -> BohObj:
+        return self.obj(self._map[id])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._map)
+
+    def __len__(self) -> int:
+        return len(self._map)
+
+    def __contains__(self, id: object) -> bool:
+        return id in self._map
+
+    def __enter__(self) -> 'Snapshot':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def repeats(self, id: str) -> list[BohObj]:
+        """获取 ID 重复的对象，对应``BohData.repeats``。
+
+        Args:
+            id (str): 对象 ID。
+
+        Returns:
+            list[BohObj]: ID 重复的对象，ID 不重复时为空列表。
+        """
+        return [self.obj(index) for index in self._repeats.get(id, ())]
+
+    def obj(self, index: int) -> BohObj:
+        """解析给定序号的对象。
+
+        Args:
+            index (int): 对象序号，小于``count``。
+
+        Returns:
+            BohObj: 游戏对象。
+        """
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        block = index // BLOCK
+        if self._cached[0] != block:
+            self._cached = (block, self._block(block))
+        return self._build(index, self._cached[1][index % BLOCK])
+
+    def _block(self, block: int) -> list[dict]:
+        """解析一块对象本体。"""
+        try:
+            return marshal.loads(self._bodies[self._bodies_index[block]:self._bodies_index[block + 1]])
+        except _ERRORS as error:
+            raise InvalidSnapshot(f'"{self.path}"已损坏。') from error
+
+    def _build(self, index: int, body: dict) -> BohObj:
+        """以对象本体与对象记录创建对象。"""
+        strings = self._strings
+        obj = BohObj.__new__(BohObj)
+        dict.update(obj, body)
+        obj.id = strings[self._columns[0][index]]
+        obj.origin_id = strings[self._columns[1][index]]
+        obj.label = strings[self._columns[2][index]]
+        root = self._columns[3][index]
+        obj._root = None if root == _NONE else strings[root]
+        obj.type = _TYPES[self._columns[4][index]]
+        obj._fingerprint = self._fingerprints[index * 16:index * 16 + 16]
+        return obj
+
+    def close(self) -> None:
+        """关闭快照文件。"""
+        self._bodies.release()
+        self._view.release()
+        self._buffer.close()
+
+
+def _tobytes(section: array|bytearray) -> bytes:
+    """以小端序取得区段内容。"""
+    if isinstance(section, array) and sys.byteorder == 'big':
+        section = array(section.typecode, section)
+        section.byteswap()
+    return bytes(section)
+
+
+def _array(typecode: str, content: memoryview) -> array:
+    """以小端序读取数字区段。"""
+    res = array(typecode)
+    res.frombytes(content)
+    if sys.byteorder == 'big':
+        res.byteswap()
+    return res
+
+
+def _align(offset: int) -> int:
+    """向上对齐到 8 字节。"""
+    return (offset + 7) & ~7
@@ -0,0 +1,49 @@
+#-*-coding:utf-8-*-
+"""存储模块。
+
+    此模块包含了解析缓存、全文索引、快照与导出压缩包共用的文件读写工具。
+"""
+import gc
+import os
+import contextlib
+from typing import Iterator
+
+@contextlib.contextmanager
+def nogc() -> Iterator[None]:
+    """在``with``语句块内暂停循环垃圾回收，退出时恢复原状态。
+
+    反序列化或创建大量容器对象时，循环垃圾回收会反复扫描新对象，耗时可达数倍。
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+@contextlib.contextmanager
+def replacing(path: str) -> Iterator[str]:
+    """产出临时文件路径，``with``语句块正常结束后以临时文件替换``path``，避免读取到不完整的文件。
+
+    语句块内抛出异常时删除临时文件，``path``保持不变。
+
+    例如：\n
+        with replacing(path) as temp, open(temp, 'wb') as file:
+            file.write(content)
+
+    Args:
+        path (str): 目标文件路径。
+
+    Yields:
+        str: 临时文件路径，与``path``位于同一目录。
+    """
+    temp = f'{path}.{os.getpid()}.tmp'
+    try:
+        yield temp
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temp)
+        raise
+    os.replace(temp, path)
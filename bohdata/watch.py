@@ -0,0 +1,168 @@
+#-*-coding:utf-8-*-
+"""监视模块。
+
+    此模块包含了一个类，用于在内存中保留游戏数据，并轮询目录中``.json``文件的变化，只重新解析变化的文件并原地更新数据。
+"""
+import os
+import threading
+from typing import Callable, NamedTuple
+
+from bohdata import profiling
+from bohdata.bohobj import BohObj
+from bohdata.bohobj import BohObjType
+from bohdata.bohobj import InvalidOriginObject, InvalidRoot
+from bohdata.bohdata import BohData
+from bohdata.cache import ParseCache
+from bohdata.file import UnexpectedEncoding
+from bohdata.file import readfiles
+
+class WatchEvent(NamedTuple):
+    """``Watcher.poll``检测到的一次变化。
+
+    Attributes:
+        added (list[str]): 新增的文件。
+        changed (list[str]): 内容变化的文件。
+        deleted (list[str]): 删除的文件。
+        ids (list[str]): 受影响的对象 ID，即变化前后这些文件中所有对象的 ID。
+        objs (list[BohObj]): 受影响 ID 现有的对象（见``BohData.find``），下游只需重新导出这些对象。
+        removed (list[BohObj]): 已不存在的 ID 原有的对象，下游应删除其导出结果。
+        errors (dict[str, Exception]): 无法解析的文件到异常的映射表。这些文件保留上次成功解析的数据，再次变化时重新解析。
+    """
+    added: list[str]
+    changed: list[str]
+    deleted: list[str]
+    ids: list[str]
+    objs: list[BohObj]
+    removed: list[BohObj]
+    errors: dict[str, Exception]
+
+
+class Watcher:
+    """在内存中保留目录的游戏数据，并轮询文件变化。
+
+    创建时读取一次目录，``data``与``read``所得的``BohData``相同。之后每次调用``poll``时，以文件的修改时间与大小判断变化，
+    只重新解析新增与修改的文件，再对受影响的 ID 原地更新``data``的根分类列表、``map``、``repeats``与``roots``，
+    最后以``WatchEvent``依次调用回调函数。更新后的内容与重新读取相同，但受影响对象在根分类列表中会移至末尾。
+
+    例如：\n
+        watcher = bohdata.Watcher('./core/')
+        watcher.subscribe(lambda event: bohdata.tojson(event.objs, './output/', prune=False))
+        watcher.run(interval=1.0)
+
+    Args:
+        target (str): 文件或文件夹路径。
+        objtype (BohObjType, optional): 游戏对象类型。默认为``BohObjType.UNKNOWN``，即自动判断。
+        workers (int, optional): 首次读取时并行解析所用的进程数。默认为``None``，即逐个文件解析。
+        cache (ParseCache | str, optional): 解析缓存或缓存目录。默认为``None``，即不使用缓存。
+
+    Attributes:
+        target (str): 监视的路径。
+        data (BohData): 游戏数据，每次``poll``后原地更新。
+        callbacks (list[Callable[[WatchEvent], None]]): 检测到变化时依次调用的回调函数。
+    """
+    def __init__(self, target: str, objtype: BohObjType=BohObjType.UNKNOWN, workers: int|None=None,
+                 cache: ParseCache|str|None=None):
+        if isinstance(cache, str):
+            cache = ParseCache(cache)
+
+        self.target = target
+        self.callbacks = []
+        self._objtype = objtype
+        self._cache = cache
+        self._stamps = self._scan()
+
+        self._files, parsed = readfiles(target, objtype, workers, cache)
+        if cache is not None and parsed:
+            cache.prune()
+
+        self.data = BohData({}, objtype)
+        with profiling.phase('read.merge', target):
+            for data in self._files.values():
+                self.data.merge(data)
+
+    def subscribe(self, callback: Callable[[WatchEvent], None]) -> None:
+        """添加回调函数，检测到变化时以``WatchEvent``调用。
+
+        Args:
+            callback (Callable[[WatchEvent], None]): 回调函数。
+        """
+        self.callbacks.append(callback)
+
+    def poll(self) -> WatchEvent|None:
+        """检查一次文件变化，更新``data``并调用回调函数。
+
+        Returns:
+            WatchEvent | None: 检测到的变化，没有变化时为``None``。
+        """
+        with profiling.phase('watch.poll', self.target):
+            stamps = self._scan()
+            added = [path for path in stamps if path not in self._stamps]
+            changed = [path for path in stamps if path in self._stamps and stamps[path] != self._stamps[path]]
+            deleted = [path for path in self._stamps if path not in stamps]
+            self._stamps = stamps
+            if not added and not changed and not deleted:
+                return None
+
+            # 重新解析变化的文件，无法解析时保留原有数据
+            ids = {}
+            errors = {}
+            for path in deleted:
+                data = self._files.pop(path, None)
+                if data is not None:
+                    ids.update(dict.fromkeys(data.map))
+            for path in added + changed:
+                try:
+                    data = readfiles(path, self._objtype, cache=self._cache)[0][path]
+                except (OSError, ValueError, UnexpectedEncoding, InvalidOriginObject, InvalidRoot) as error:
+                    errors[path] = error
+                    continue
+                if path in self._files:
+                    ids.update(dict.fromkeys(self._files[path].map))
+                ids.update(dict.fromkeys(data.map))
+                self._files[path] = data
+            profiling.count('watch.files', len(added) + len(changed) + len(deleted))
+
+            # 按目录遍历顺序重新合并受影响 ID 的对象
+            self._files = {path: self._files[path] for path in stamps if path in self._files}
+            old = self.data.remove(ids)
+            for data in self._files.values():
+                for id in ids:
+                    if id in data.map:
+                        self.data.append(data.map[id])
+
+            objs = [obj for id in ids for obj in self.data.find(id)]
+            removed = [obj for obj in old if obj.id not in self.data.map and obj.id not in self.data.repeats]
+            event = WatchEvent(added, changed, deleted, list(ids), objs, removed, errors)
+
+        for callback in self.callbacks:
+            callback(event)
+        return event
+
+    def run(self, interval: float=1.0, stop: threading.Event|None=None) -> None:
+        """持续轮询，直至``stop``被设置。回调函数中的异常会终止轮询。
+
+        Args:
+            interval (float, optional): 轮询间隔秒数。默认为``1.0``。
+            stop (threading.Event, optional): 停止信号，可在其他线程中设置。默认为``None``，即一直运行。
+        """
+        if stop is None:
+            stop = threading.Event()
+        while not stop.is_set():
+            self.poll()
+            stop.wait(interval)
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        """按目录遍历顺序获取各文件的修改时间与大小。"""
+        if os.path.isdir(self.target):
+            paths = [os.path.join(root, fname) for root, _, files in os.walk(self.target)
+                     for fname in files if fname.endswith('.json')]
+        else:
+            paths = [self.target]
+        stamps = {}
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            stamps[path] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
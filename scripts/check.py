@@ -1,10 +1,10 @@
 # 检查目录下存在错误的 JSON 文件
 import bohdata
 
-files = bohdata.check('./')
-if files == []:
+errors = list(bohdata.validate('./'))
+if errors == []:
 	print('未检查到错误。')
 else:
 	print('在以下文件中检测到错误：')
-	for file in files:
-		print(file)
\ No newline at end of file
+	for error in errors:
+		print(f'{error.path}:{error.line}:{error.column}: {error.message}')
@@ -1,13 +1,16 @@
 # 获取 Wiki 使用的数据页面文件
-import bohdata
+import os
+import itertools
 
-alldata = bohdata.read('./core/', objtype=bohdata.BohObjType.META)
-translationdata = bohdata.read('./loc_zh-hans/', objtype=bohdata.BohObjType.TRANSLATION)
+import bohdata
 
-for _, obj in alldata.map.items():
-	obj.tojson('./output/', forwiki=True)
+# 多进程序列化时，子进程会以 spawn 方式（Windows 与 macOS 的默认方式）重新导入此脚本，故须置于 __main__ 之下
+if __name__ == '__main__':
+    alldata = bohdata.read('./core/', objtype=bohdata.BohObjType.META, cache='./.bohcache/')
+    translationdata = bohdata.read('./loc_zh-hans/', objtype=bohdata.BohObjType.TRANSLATION, cache='./.bohcache/')
 
-for _, obj in translationdata.map.items():
-	obj.tojson('./output/', forwiki=True)
+    # 增量导出：仅写入内容变化的文件，并删除已不存在的对象的文件；多进程序列化，同时写入文件
+    report = bohdata.tojson(itertools.chain(alldata.map.values(), translationdata.map.values()), './output/', forwiki=True,
+                            workers=os.cpu_count())
 
-print('文件已生成。')
\ No newline at end of file
+    print(f'文件已生成。新增 {report.added} 个，修改 {report.changed} 个，删除 {report.removed} 个，未变化 {report.unchanged} 个。')
@@ -1,24 +1,13 @@
 # 输出用于[[模块:LabelsTable]]的 Lua 文件
 import bohdata
 
-alldata = bohdata.read('./core/', objtype=bohdata.BohObjType.META)
-translationdata = bohdata.read('./loc_zh-hans/', objtype=bohdata.BohObjType.TRANSLATION)
+alldata = bohdata.read('./core/', objtype=bohdata.BohObjType.META, cache='./.bohcache/')
+translationdata = bohdata.read('./loc_zh-hans/', objtype=bohdata.BohObjType.TRANSLATION, cache='./.bohcache/')
 
-for id, obj in alldata.map.items():
-    if translationdata.map.get(id):
-        obj.translatewith(translationdata.map[id])
+report = alldata.translateall(translationdata)
+for path in report.missing + report.unmatched:
+    print(f'翻译结构不一致：{path}')
 
-content = 'local DATA = {\n'
-for id, obj in sorted(alldata.map.items()):
-    if obj.label == '（无名称）':
-        continue
-
-    label = obj.label.replace('\n', '\\n').replace('\'', '\\\'')
-    content = content + f'    [\'{obj.origin_id.replace('\'', '\\\'')}\'] = \'{label}\',\n'
-
-content = content[:-2] +'\n}\n\nreturn DATA'
-
-with open('./LabelsTabel.lua', 'w', encoding='utf-8') as file:
-    file.write(content)
+alldata.tolabels('./LabelsTabel.lua')
 
 print('文件已生成。')
\ No newline at end of file
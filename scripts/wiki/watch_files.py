@@ -0,0 +1,30 @@
+# 监视数据目录，文件变化时只重新生成受影响对象的 Wiki 数据页面文件
+import time
+
+import bohdata
+
+watchers = [
+    bohdata.Watcher('./core/', objtype=bohdata.BohObjType.META, cache='./.bohcache/'),
+    bohdata.Watcher('./loc_zh-hans/', objtype=bohdata.BohObjType.TRANSLATION, cache='./.bohcache/'),
+]
+
+def export(event: bohdata.WatchEvent) -> None:
+    for path, error in event.errors.items():
+        print(f'无法解析：{path}\n{error}')
+
+    # 只写入受影响的对象，清单中其余文件的记录保留；已不存在的对象的文件与记录一并删除
+    report = bohdata.tojson(event.objs, './output/', forwiki=True, prune=False, remove=event.removed)
+    print(f'{len(event.added) + len(event.changed) + len(event.deleted)} 个文件变化。'
+          f'新增 {report.added} 个，修改 {report.changed} 个，删除 {report.removed} 个，未变化 {report.unchanged} 个。')
+
+for watcher in watchers:
+    watcher.subscribe(export)
+
+print('正在监视，按 Ctrl+C 退出。')
+try:
+    while True:
+        for watcher in watchers:
+            watcher.poll()
+        time.sleep(1)
+except KeyboardInterrupt:
+    pass
@@ -3,7 +3,7 @@ from setuptools import setup, find_packages
 setup(
     name='bohdata',
     version='0.1',
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     description='处理《司辰之书》游戏数据的 python 工具。',
     author='SOgz12Z3Ce',
     author_email='ursername158481@gmail.com',
@@ -0,0 +1,22 @@
+#-*-coding:utf-8-*-
+"""``BohObj.fingerprint``与``==``一致性的测试。"""
+import bohdata
+from bohdata.bohobj import BohObj
+
+def test_fingerprint_matches_eq():
+    values = [1, 1.0, True, 0, 0.0, -0.0, False, 2.5, '1', 'true', None, [1], [1.0], {'x': 1}, {'x': True}, 1e16, 10 ** 16]
+    for left in values:
+        for right in values:
+            a = BohObj({'id': 'a', 'w': left})
+            b = BohObj({'id': 'a', 'w': right})
+            assert (a.fingerprint == b.fingerprint) == (dict(a) == dict(b)), (left, right)
+
+
+def test_append_equal_numbers():
+    data = bohdata.BohData({'elements': [{'id': 'a', 'w': 1}]})
+    obj = BohObj({'id': 'a', 'w': 1.0})
+    obj.root = 'elements'
+    data.append(obj)
+    assert len(data['elements']) == 1
+    assert data.repeats == {}
+    assert list(data.map) == ['a']
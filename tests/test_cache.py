@@ -0,0 +1,43 @@
+#-*-coding:utf-8-*-
+"""``ParseCache``的测试。"""
+import os
+import json
+
+import bohdata
+import bohdata.file
+
+def write(path: str, label: str, mtime_ns: int) -> None:
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(json.dumps({'elements': [{'id': 'a', 'label': label}]}))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_modified_during_parse(tmp_path, monkeypatch):
+    path = str(tmp_path / 'a.json')
+    cache = str(tmp_path / 'cache')
+    write(path, 'old', 10 ** 18)
+
+    # 模拟解析期间文件再次被保存
+    readfile = bohdata.file._readfile
+    def racing(target, objtype):
+        data = readfile(target, objtype)
+        write(path, 'new', 2 * 10 ** 18)
+        return data
+
+    monkeypatch.setattr(bohdata.file, '_readfile', racing)
+    assert bohdata.read(path, cache=cache).map['a'].label == 'old'
+    monkeypatch.setattr(bohdata.file, '_readfile', readfile)
+    assert bohdata.read(path, cache=cache).map['a'].label == 'new'
+
+
+def test_hit_and_invalidate(tmp_path):
+    dir = tmp_path / 'core'
+    dir.mkdir()
+    path = str(dir / 'a.json')
+    cache = str(tmp_path / 'cache')
+    write(path, 'old', 10 ** 18)
+    for _ in range(3):
+        assert bohdata.read(str(dir), cache=cache).map['a'].label == 'old'
+    write(path, 'new', 2 * 10 ** 18)
+    assert bohdata.read(str(dir), cache=cache).map['a'].label == 'new'
+    assert bohdata.read(path, cache=cache).map['a'].label == 'new'
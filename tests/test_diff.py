@@ -0,0 +1,39 @@
+#-*-coding:utf-8-*-
+"""``BohData.diff``与``DataDiff.text``的测试。"""
+import bohdata
+from bohdata.diff import Change
+
+def data(*objs: dict) -> bohdata.BohData:
+    return bohdata.BohData({'elements': list(objs)})
+
+
+def test_diff():
+    old = data({'id': 'a', 'label': 'A', 'aspects': {'edge': 1}}, {'id': 'b', 'label': 'B'},
+               {'id': 'c', 'slots': [{'id': 's', 'label': 'S'}]})
+    new = data({'id': 'a', 'label': 'A', 'aspects': {'edge': 2}}, {'id': 'd', 'label': 'D'},
+               {'id': 'c', 'slots': [{'id': 's', 'label': 'T'}, {'id': 't'}]})
+    result = old.diff(new)
+    assert result.added == ['d']
+    assert result.removed == ['b']
+    assert result.unchanged == 0
+    assert result.changed == {'a': [Change('changed', 'a||aspects||edge', 1, 2)],
+                              'c': [Change('changed', 'c||slots||0||label', 'S', 'T'),
+                                    Change('added', 'c||slots||1', None, {'id': 't'})]}
+
+
+def test_repeats():
+    old = data({'id': 'a', 'label': 'A'}, {'id': 'a', 'label': 'B'})
+    new = data({'id': 'a', 'label': 'B'}, {'id': 'a', 'label': 'C'}, {'id': 'e'})
+    result = old.diff(new)
+    assert result.changed == {'a': [Change('changed', 'a||label', 'A', 'C')]}
+    assert data({'id': 'a', 'label': 'A'}, {'id': 'a', 'label': 'B'}).diff(old).unchanged == 1
+
+
+def test_text():
+    old = data({'id': 'a', 'label': 'A', 'aspects': {'edge': 1}, 'xexts': {'moth.1': 'x', 'grail': 'g'},
+                'slots': [{'id': 's', 'label': 'S', 'required': {'edge': 1}}]})
+    new = data({'id': 'a', 'label': 'B', 'aspects': {'edge': 2}, 'xexts': {'moth.1': 'y', 'lantern': 'l'},
+                'slots': [{'id': 's', 'label': 'S', 'required': {'edge': 2}}]})
+    text = old.diff(new).text()
+    assert [change.path for change in text['a']] == ['a||label', 'a||xexts||moth.1', 'a||xexts||grail', 'a||xexts||lantern']
+    assert data({'id': 'a', 'aspects': {'edge': 1}}).diff(data({'id': 'a', 'aspects': {'edge': 2}})).text() == {}
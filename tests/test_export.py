@@ -0,0 +1,86 @@
+#-*-coding:utf-8-*-
+"""``tojson``增量导出与清单的测试。"""
+import os
+import json
+import zipfile
+
+import bohdata
+from bohdata.export import MANIFEST, ExportReport
+
+def objs(**labels: str) -> list[bohdata.BohObj]:
+    return list(bohdata.BohData({'elements': [{'id': id, 'label': label} for id, label in labels.items()]}).objs())
+
+
+def manifest(dir: str) -> list[str]:
+    with open(os.path.join(dir, MANIFEST), 'r', encoding='utf-8') as file:
+        return sorted(json.load(file))
+
+
+def test_incremental(tmp_path):
+    dir = str(tmp_path)
+    assert bohdata.tojson(objs(a='A', b='B', c='C'), dir) == ExportReport(3, 0, 0, 0)
+    assert bohdata.tojson(objs(a='A', b='B', c='C'), dir) == ExportReport(0, 0, 0, 3)
+    assert bohdata.tojson(objs(a='A', b='B2', d='D'), dir) == ExportReport(1, 1, 1, 1)
+    assert sorted(os.listdir(dir)) == [MANIFEST, 'a.json', 'b.json', 'd.json']
+    assert manifest(dir) == ['a.json', 'b.json', 'd.json']
+    with open(os.path.join(dir, 'b.json'), 'r', encoding='utf-8') as file:
+        assert json.load(file)['label'] == 'B2'
+
+    # 文件被删除后重新写入，但仍计为修改
+    os.remove(os.path.join(dir, 'a.json'))
+    assert bohdata.tojson(objs(a='A', b='B2', d='D'), dir) == ExportReport(0, 1, 0, 2)
+    assert bohdata.tojson(objs(a='A', b='B2', d='D'), dir, incremental=False) == ExportReport(0, 3, 0, 0)
+
+    # 清单以外的文件不受影响
+    with open(os.path.join(dir, 'other.txt'), 'w', encoding='utf-8') as file:
+        file.write('x')
+    assert bohdata.tojson(objs(a='A'), dir) == ExportReport(0, 0, 2, 1)
+    assert sorted(os.listdir(dir)) == [MANIFEST, 'a.json', 'other.txt']
+
+
+def test_no_prune(tmp_path):
+    dir = str(tmp_path)
+    bohdata.tojson(objs(a='A', b='B', c='C'), dir)
+    assert bohdata.tojson(objs(b='B2', d='D'), dir, prune=False) == ExportReport(1, 1, 0, 0)
+    assert sorted(os.listdir(dir)) == [MANIFEST, 'a.json', 'b.json', 'c.json', 'd.json']
+    assert manifest(dir) == ['a.json', 'b.json', 'c.json', 'd.json']
+    assert bohdata.tojson(objs(a='A', b='B2', c='C', d='D'), dir) == ExportReport(0, 0, 0, 4)
+    assert bohdata.tojson(objs(c='C'), dir, prune=False, remove=objs(a='A', c='C')) == ExportReport(0, 0, 1, 1)
+    assert manifest(dir) == ['b.json', 'c.json', 'd.json']
+
+
+def test_workers_and_archive(tmp_path):
+    many = objs(**{f'obj{index}': f'Label {index}' for index in range(300)})
+    serial, parallel = str(tmp_path / 'serial'), str(tmp_path / 'parallel')
+    assert bohdata.tojson(many, serial) == bohdata.tojson(many, parallel, workers=2) == ExportReport(300, 0, 0, 0)
+    for fname in os.listdir(serial):
+        with open(os.path.join(serial, fname), 'rb') as left, open(os.path.join(parallel, fname), 'rb') as right:
+            assert left.read() == right.read()
+
+    assert bohdata.tojson(many, str(tmp_path), archive='out.zip') == ExportReport(300, 0, 0, 0)
+    with zipfile.ZipFile(str(tmp_path / 'out.zip')) as archive:
+        assert sorted(archive.namelist()) == sorted(fname for fname in os.listdir(serial) if fname != MANIFEST)
+    assert not [fname for fname in os.listdir(tmp_path) if fname.endswith('.tmp')]
+
+
+def test_interrupted_manifest(tmp_path, monkeypatch):
+    dir = str(tmp_path)
+    bohdata.tojson(objs(a='A'), dir)
+
+    class Interrupted(Exception):
+        pass
+
+    class Json:
+        load = staticmethod(json.load)
+        def dumps(*args, **kwargs):
+            raise Interrupted()
+
+    monkeypatch.setattr(bohdata.export, 'json', Json)
+    try:
+        bohdata.tojson(objs(a='A', b='B'), dir)
+    except Interrupted:
+        pass
+    monkeypatch.undo()
+    assert manifest(dir) == ['a.json']
+    assert bohdata.tojson(objs(a='A', b='B'), dir) == ExportReport(1, 0, 0, 1)
+    assert sorted(os.listdir(dir)) == [MANIFEST, 'a.json', 'b.json']
@@ -0,0 +1,52 @@
+#-*-coding:utf-8-*-
+"""``BohData.tolabels``与旧版``get_labels_table.py``中逐行拼接 Lua 模块做法的对比测试。"""
+import os
+
+import bohdata
+from benchmarks.synth import gen_dataset
+
+def legacy(core: bohdata.BohData, loc: bohdata.BohData) -> str:
+    """旧版``get_labels_table.py``的做法，返回文件内容。"""
+    for id, obj in core.map.items():
+        if loc.map.get(id):
+            obj.translatewith(loc.map[id])
+
+    content = 'local DATA = {\n'
+    for id, obj in sorted(core.map.items()):
+        if obj.label == '（无名称）':
+            continue
+
+        label = obj.label.replace('\n', '\\n').replace('\'', '\\\'')
+        origin_id = obj.origin_id.replace('\'', '\\\'')
+        content = content + f'    [\'{origin_id}\'] = \'{label}\',\n'
+
+    return content[:-2] +'\n}\n\nreturn DATA'
+
+
+def test_matches_legacy(tmp_path):
+    dir = str(tmp_path)
+    gen_dataset(dir, 60, objs_per_file=7, duplicates=0.2)
+
+    def read(name: str, objtype: bohdata.BohObjType) -> bohdata.BohData:
+        return bohdata.read(os.path.join(dir, name), objtype=objtype)
+
+    expected = legacy(read('core', bohdata.BohObjType.META), read('loc_zh-hans', bohdata.BohObjType.TRANSLATION))
+    assert expected.count('\n') > 100
+
+    core = read('core', bohdata.BohObjType.META)
+    report = core.translateall(read('loc_zh-hans', bohdata.BohObjType.TRANSLATION))
+    assert not report.missing and not report.unmatched
+    path = str(tmp_path / 'LabelsTabel.lua')
+    core.tolabels(path)
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        assert file.read() == expected
+
+
+def test_escapes_match_legacy(tmp_path):
+    data = {'elements': [{'id': 'it\'s', 'label': 'a\nb\'c'}, {'id': 'b', 'label': '\'\''}, {'id': 'c'},
+                         {'id': 'A', 'label': '大写'}]}
+    expected = legacy(bohdata.BohData(data), bohdata.BohData({}))
+    path = str(tmp_path / 'LabelsTabel.lua')
+    bohdata.BohData(data).tolabels(path)
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        assert file.read() == expected
@@ -0,0 +1,59 @@
+#-*-coding:utf-8-*-
+"""``pack``与旧版逐个翻译文件重新读取游戏原文件的做法的对比测试。"""
+import io
+import json
+import os
+import contextlib
+
+import bohdata
+from benchmarks.bench_pack import legacy
+from benchmarks.synth import gen_dataset
+
+def files(dir: str) -> dict[str, bytes]:
+    """目录中所有文件的相对路径与内容。"""
+    res = {}
+    for root, _, fnames in os.walk(dir):
+        for fname in fnames:
+            path = os.path.join(root, fname)
+            with open(path, 'rb') as file:
+                res[os.path.relpath(path, dir)] = file.read()
+    return res
+
+
+def run(func, output: str) -> str:
+    """执行打包并返回其输出的提示信息。"""
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        func(output)
+    return stdout.getvalue()
+
+
+def test_matches_legacy(tmp_path):
+    dir = str(tmp_path / 'data')
+    gen_dataset(dir, 60, objs_per_file=7, duplicates=0.2)
+    expected_messages = run(lambda output: legacy(dir, output), str(tmp_path / 'legacy'))
+    expected = files(str(tmp_path / 'legacy'))
+    assert expected and expected_messages
+
+    for workers in [None, 2]:
+        output = str(tmp_path / f'pack{workers}')
+        assert run(lambda output: bohdata.pack(dir, output, workers=workers), output) == expected_messages
+        assert files(output) == expected
+
+
+def test_multiple_roots(tmp_path):
+    dir = tmp_path / 'data'
+    (dir / 'core').mkdir(parents=True)
+    (dir / 'raw').mkdir()
+    core = {'elements': [{'id': 'e', 'label': 'Edge'}], 'recipes': [{'id': 'r', 'label': 'Rite', 'startdescription': 'Go'}]}
+    (dir / 'core' / 'mixed.json').write_text(json.dumps(core), encoding='utf-8')
+    entries = [{'key': 'e||label', 'original': 'Edge', 'translation': '刃'},
+               {'key': 'r||label', 'original': 'Rite', 'translation': '仪式'},
+               {'key': 'r||startdescription', 'original': 'Go', 'translation': '开始'}]
+    (dir / 'raw' / 'mixed.json.csv').write_text(json.dumps(entries), encoding='utf-8')
+
+    output = str(tmp_path / 'output')
+    assert run(lambda output: bohdata.pack(str(dir), output), output) == ''
+    with open(os.path.join(output, 'mixed.json'), 'r', encoding='utf-8') as file:
+        assert json.load(file) == {'elements': [{'label': '刃', 'id': 'e'}],
+                                   'recipes': [{'label': '仪式', 'startdescription': '开始', 'id': 'r'}]}
@@ -0,0 +1,44 @@
+#-*-coding:utf-8-*-
+"""``buildtree``与旧版``pack``中逐层递归拆分键做法的对比测试。"""
+import json
+import random
+
+from bohdata.paratranz import buildtree
+from benchmarks.bench_paratranz import legacy, gen_entries
+
+SEGMENTS = ['0', '1', '2', '3', '01', 'x', 'id', 'slots']
+VALUES = ['t', 'u', '', None]
+
+def random_entries(rng: random.Random) -> list[dict]:
+    """生成含有空位、乱序下标、``None``值与非常规数字键的翻译条目。"""
+    entries = []
+    for _ in range(rng.randrange(1, 8)):
+        segments = [rng.choice(['a', 'B'])] + [rng.choice(SEGMENTS) for _ in range(rng.randrange(4))]
+        entries.append({'key': '||'.join(segments), 'translation': rng.choice(VALUES)})
+    return entries
+
+
+def test_matches_legacy_fuzz():
+    rng = random.Random(0)
+    compared = 0
+    for _ in range(20000):
+        entries = random_entries(rng)
+        try:
+            expected = legacy(entries)
+        except (AttributeError, TypeError):
+            continue    # 旧做法无法处理路径穿过文本的条目
+        assert json.dumps(buildtree(entries), ensure_ascii=False) == json.dumps(expected, ensure_ascii=False), entries
+        compared = compared + 1
+    assert compared > 10000
+
+
+def test_matches_legacy_synthetic():
+    entries = gen_entries(4000)
+    assert json.dumps(buildtree(entries), ensure_ascii=False) == json.dumps(legacy(entries), ensure_ascii=False)
+
+
+def test_deep_key():
+    tree = buildtree([{'key': '||'.join(['x'] + ['0'] * 5000), 'translation': '深'}])
+    for _ in range(5000):
+        tree = tree['x'] if isinstance(tree, dict) else tree[0]
+    assert tree == ['深']
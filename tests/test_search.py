@@ -0,0 +1,22 @@
+#-*-coding:utf-8-*-
+"""``BohData.append``后已创建的全文索引与重新创建的索引的对比测试。"""
+import bohdata
+from bohdata.bohobj import BohObj
+
+def append(data: bohdata.BohData, root: str, obj: dict) -> None:
+    obj = BohObj(obj)
+    obj.root = root
+    data.append(obj)
+
+
+def test_append_matches_rebuild():
+    data = bohdata.BohData({'elements': [{'id': 'a', 'label': 'lantern edge'}, {'id': 'b', 'label': 'moth'}]})
+    data.textindex()
+    data.index()
+    for root, obj in [('elements', {'id': 'a', 'label': 'lantern edge'}), ('recipes', {'id': 'b', 'label': 'moth'}),
+                      ('elements', {'id': 'a', 'label': 'lantern moth'}), ('verbs', {'id': 'c', 'label': 'edge'})]:
+        append(data, root, obj)
+        expected = bohdata.TextIndex(data.objs())
+        assert sorted(data.textindex().docs) == sorted(expected.docs)
+        assert data.textindex().search('lantern moth') == expected.search('lantern moth')
+        assert data.index().paths == bohdata.PathIndex(data.objs()).paths
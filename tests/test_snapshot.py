@@ -0,0 +1,61 @@
+#-*-coding:utf-8-*-
+"""快照的保存、加载与损坏文件的测试。"""
+import os
+import json
+import struct
+import marshal
+
+import pytest
+
+import bohdata
+from bohdata.snapshot import InvalidSnapshot, BLOCK
+from benchmarks.synth import gen_tree
+
+def state(data: bohdata.BohData) -> tuple:
+    """游戏数据中可观察的内容。"""
+    def objs(values):
+        return [(obj.id, obj.origin_id, obj.label, obj.root, obj.type, obj.fingerprint, json.dumps(obj)) for obj in values]
+    return ({root: objs(values) for root, values in data.items()}, objs(data.map.values()),
+            {id: objs(values) for id, values in data.repeats.items()}, data.roots, data._file)
+
+
+def test_round_trip(tmp_path):
+    gen_tree(str(tmp_path / 'core'), BLOCK // 2)
+    data = bohdata.read(str(tmp_path / 'core'))
+    data.merge(bohdata.BohData({'elements': [{'id': 'synth.obj.0', 'label': 'other'}],
+                                'recipes': [{'id': 'R', 'label': '仪式', 'w': 1.5}]}))
+    assert data.repeats
+    path = str(tmp_path / 'data.snapshot')
+    data.save(path)
+
+    loaded = bohdata.BohData.load(path)
+    assert state(loaded) == state(data)
+    with bohdata.Snapshot(path) as snapshot:
+        assert list(snapshot) == list(data.map)
+        assert [json.dumps(snapshot[id]) for id in snapshot] == [json.dumps(obj) for obj in data.map.values()]
+        assert [json.dumps(obj) for obj in snapshot.repeats('synth.obj.0')] == \
+               [json.dumps(obj) for obj in data.repeats['synth.obj.0']]
+
+
+def test_invalid(tmp_path):
+    data = bohdata.BohData({'elements': [{'id': 'a', 'label': 'A'}]})
+    path = str(tmp_path / 'data.snapshot')
+    data.save(path)
+    with open(path, 'rb') as file:
+        content = file.read()
+
+    header = struct.Struct('<8sIII')
+    magic, version, _, count = header.unpack_from(content)
+    cases = [b'', content[:10], content[:len(content) // 2], content[:-4],
+             header.pack(magic, version, marshal.version + 1, count) + content[header.size:],
+             header.pack(magic, version - 1, marshal.version, count) + content[header.size:],
+             content[:header.size + 16 * count] + b'\xff' * (len(content) - header.size - 16 * count)]
+    for case in cases:
+        with open(path, 'wb') as file:
+            file.write(case)
+        with pytest.raises(InvalidSnapshot):
+            bohdata.BohData.load(path)
+        with pytest.raises(InvalidSnapshot):
+            with bohdata.Snapshot(path) as snapshot:
+                list(snapshot.values())
+        os.remove(path)
@@ -0,0 +1,104 @@
+#-*-coding:utf-8-*-
+"""``read``、``read(stream=True)``与``readlazy``的对比测试。
+
+    以多根分类、空根数组、重复根分类与重复 ID 的文件为基础随机插入与删除 JSON 符号，
+    再以 1 至 7 字节等不同的块大小流式解析，结果与报错均应与完整解析相同。
+"""
+import os
+import json
+import random
+
+import bohdata
+import bohdata.file
+from benchmarks.synth import gen_dataset
+
+BASES = ['{"elements":[{"id":"a","label":"x"}, {"id":"B"}], "recipes":[{"id":"r"},{"id":"a","label":"y"}]}',
+         '{"elements":[], "verbs":[{"id":"v"}]}',
+         '{ "recipes" : [ {"id":"r"} ] }\n',
+         '{"elements":[{"id":"a"}], "elements":[{"id":"b"}]}',
+         '{"elements":[{"id":"a"}],"decks":[{"id":"d","label":"中文"}],"x":5}',
+         '{"elements":[{"id":"a","label":"é"}, {"id":"a","label":"f"}], "recipes":[{"id":"a"}]}',
+         '{"elements":[{"id":"a","label":"x"}, {"id":"B"}]}',
+         '{"elements":[]}']
+SYMBOLS = ' ,]}[{"x:'
+CHUNKSIZES = [1, 2, 3, 5, 7, 1 << 16]
+
+def mutate(rng: random.Random) -> str:
+    """随机插入或删除至多两个字符。"""
+    text = list(rng.choice(BASES))
+    for _ in range(rng.randrange(3)):
+        index = rng.randrange(len(text) + 1)
+        op = rng.random()
+        if op < 0.4:
+            text.insert(index, rng.choice(SYMBOLS))
+        elif op < 0.8 and index < len(text):
+            del text[index]
+    return ''.join(text)
+
+
+def outcome(func) -> tuple:
+    """调用结果，或报错的类型与位置。"""
+    try:
+        return ('ok', func())
+    except json.decoder.JSONDecodeError as error:
+        return ('error', error.lineno, error.colno)
+    except Exception as error:
+        return ('exception', type(error).__name__)
+
+
+def toplevel(text: str) -> list[tuple[str, list]]:
+    """文件中的所有根分类与根数组，包括重复的根分类。"""
+    calls = []
+    json.loads(text, object_pairs_hook=lambda pairs: calls.append(pairs) or dict(pairs))
+    return calls[-1]
+
+
+def state(data: bohdata.BohData) -> tuple:
+    return list(data.items()), sorted(data.map), sorted(data.repeats)
+
+
+def test_matches_read(tmp_path, monkeypatch):
+    rng = random.Random(2)
+    dir = str(tmp_path)
+    path = os.path.join(dir, 'f.json')
+    compared = 0
+    for _ in range(3000):
+        text = mutate(rng)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text)
+
+        expected = outcome(lambda: state(bohdata.read(path)))
+        monkeypatch.setattr(bohdata.file._stream, '__defaults__', (rng.choice(CHUNKSIZES),))
+        assert outcome(lambda: state(bohdata.read(path, stream=True))) == expected, text
+        if expected[0] == 'ok':
+            compared = compared + 1
+            objs = [(root, obj) for root, objs in toplevel(text) for obj in objs]
+            assert list(bohdata.iterobjs(path, rng.choice(CHUNKSIZES))) == objs, text
+        monkeypatch.undo()
+
+        lazy = outcome(lambda: readlazy(dir))
+        loaded = outcome(lambda: read(dir))
+        if loaded[0] == 'ok':
+            assert lazy == loaded, text
+        else:
+            assert lazy[0] != 'ok', text
+    assert compared > 1000
+
+
+def readlazy(dir: str) -> tuple:
+    data = bohdata.readlazy(dir)
+    return sorted(data.entries), sorted(data.repeats), {id: dict(data[id]) for id in data}
+
+
+def read(dir: str) -> tuple:
+    data = bohdata.read(dir)
+    return sorted(data.map), sorted(data.repeats), {id: dict(obj) for id, obj in data.map.items()}
+
+
+def test_synthetic(tmp_path):
+    dir = str(tmp_path)
+    gen_dataset(dir, 40, objs_per_file=7, duplicates=0.2)
+    core = os.path.join(dir, 'core')
+    expected = state(bohdata.read(core))
+    assert state(bohdata.read(core, stream=True)) == expected
+    assert readlazy(core) == read(core)
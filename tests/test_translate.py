@@ -0,0 +1,32 @@
+#-*-coding:utf-8-*-
+"""``BohData.translateall``的测试：结构不一致之处应记录在报告中，而不是抛出异常。"""
+import bohdata
+
+def translate(meta: dict, translation: dict) -> tuple[dict, bohdata.TranslationReport]:
+    core = bohdata.BohData({'elements': [meta]})
+    report = core.translateall(bohdata.BohData({'elements': [translation]}))
+    return core.map[meta['id']], report
+
+
+def test_scalar_values():
+    obj, report = translate({'id': 'a', 'count': 3, 'flag': False, 'label': 'A'},
+                            {'id': 'a', 'count': 4, 'flag': True, 'label': '甲'})
+    assert dict(obj) == {'id': 'a', 'count': 4, 'flag': True, 'label': '甲'}
+    assert report == bohdata.TranslationReport(1, [], [], [], [])
+
+
+def test_list_of_strings():
+    obj, report = translate({'id': 'a', 'lst': ['x', 'y'], 'slots': [{'id': 's', 'label': 'S'}]},
+                            {'id': 'a', 'lst': ['P', 'Q'], 'slots': [{'id': 's', 'label': '槽'}]})
+    assert dict(obj) == {'id': 'a', 'lst': ['x', 'y'], 'slots': [{'id': 's', 'label': '槽'}]}
+    assert report.unmatched == ['a||lst||0', 'a||lst||1']
+    assert report.missing == []
+
+
+def test_mismatched_structure():
+    obj, report = translate({'id': 'a', 'slots': [{'id': 's'}, {'id': 't'}], 'desc': 'D'},
+                            {'id': 'a', 'slots': [{'id': 's', 'label': '槽'}, {'id': 'u'}], 'desc': {'x': 'y'}})
+    assert obj['slots'][0] == {'id': 's', 'label': '槽'}
+    assert obj['desc'] == 'D'
+    assert report.missing == ['a||slots||t']
+    assert sorted(report.unmatched) == ['a||desc', 'a||slots||u']
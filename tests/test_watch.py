@@ -0,0 +1,89 @@
+#-*-coding:utf-8-*-
+"""``Watcher``的测试：每次``poll``后的数据应与重新读取目录相同。"""
+import os
+import json
+
+import bohdata
+from benchmarks.synth import gen_tree
+
+def state(data: bohdata.BohData) -> tuple:
+    """游戏数据的内容。``Watcher``会将受影响对象移至根分类列表末尾，因此列表不比较顺序。"""
+    return ({root: sorted(json.dumps(obj) for obj in objs) for root, objs in data.items()},
+            {id: json.dumps(obj) for id, obj in data.map.items()},
+            {id: sorted(json.dumps(obj) for obj in objs) for id, objs in data.repeats.items()}, data.roots)
+
+
+def write(path: str, content: str, step: int) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(content)
+    mtime = 10 ** 18 + step * 10 ** 9    # 确保修改时间变化
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_matches_read(tmp_path):
+    dir = str(tmp_path / 'core')
+    gen_tree(dir, 12)
+    paths = sorted(os.path.join(root, fname) for root, _, files in os.walk(dir) for fname in files)
+    for cache in [None, str(tmp_path / 'cache')]:
+        watcher = bohdata.Watcher(dir, cache=cache)
+        events = []
+        watcher.subscribe(events.append)
+        assert state(watcher.data) == state(bohdata.read(dir))
+        assert watcher.poll() is None
+
+    # 修改
+    with open(paths[0], 'r', encoding='utf-8') as file:
+        content = json.load(file)
+    content['elements'][0]['label'] = 'Changed'
+    write(paths[0], json.dumps(content), 1)
+    event = watcher.poll()
+    assert event.changed == [paths[0]] and event.ids
+    assert state(watcher.data) == state(bohdata.read(dir))
+
+    # 新增，含与已有对象 ID 相同的对象
+    added = os.path.join(dir, 'extra', 'added.json')
+    duplicate = dict(content['elements'][1], label='Duplicate')
+    write(added, json.dumps({'elements': [{'id': 'new.obj', 'label': 'New'}, duplicate]}), 2)
+    event = watcher.poll()
+    assert event.added == [added]
+    assert duplicate['id'] in watcher.data.repeats
+    assert state(watcher.data) == state(bohdata.read(dir))
+
+    # 删除
+    os.remove(paths[1])
+    event = watcher.poll()
+    assert event.deleted == [paths[1]] and event.removed
+    assert state(watcher.data) == state(bohdata.read(dir))
+
+    # 无法解析的文件保留上次的数据，修复后重新解析
+    before = state(watcher.data)
+    write(added, '{"elements": [', 3)
+    event = watcher.poll()
+    assert list(event.errors) == [added]
+    assert state(watcher.data) == before
+    write(added, json.dumps({'elements': [{'id': 'new.obj', 'label': 'Fixed'}]}), 4)
+    event = watcher.poll()
+    assert not event.errors
+    assert watcher.data.map['new.obj']['label'] == 'Fixed'
+    assert duplicate['id'] not in watcher.data.repeats
+    assert state(watcher.data) == state(bohdata.read(dir))
+    assert state(bohdata.read(dir, cache=str(tmp_path / 'cache'))) == state(bohdata.read(dir))
+
+
+def test_export_removed(tmp_path):
+    dir = str(tmp_path / 'core')
+    output = str(tmp_path / 'output')
+    write(os.path.join(dir, 'a.json'), json.dumps({'elements': [{'id': 'a'}, {'id': 'b'}]}), 1)
+    write(os.path.join(dir, 'c.json'), json.dumps({'elements': [{'id': 'c'}]}), 1)
+    watcher = bohdata.Watcher(dir)
+    bohdata.tojson(watcher.data.objs(), output)
+    reports = []
+    watcher.subscribe(lambda event: reports.append(bohdata.tojson(event.objs, output, prune=False, remove=event.removed)))
+
+    write(os.path.join(dir, 'a.json'), json.dumps({'elements': [{'id': 'a', 'label': 'A'}]}), 2)
+    watcher.poll()
+    assert reports[-1] == bohdata.ExportReport(0, 1, 1, 0)
+    with open(os.path.join(output, bohdata.export.MANIFEST), 'r', encoding='utf-8') as file:
+        assert sorted(json.load(file)) == ['a.json', 'c.json']
+    assert sorted(os.listdir(output)) == sorted([bohdata.export.MANIFEST, 'a.json', 'c.json'])